@@ -0,0 +1,49 @@
+"""Standalone benchmarks.
+
+Each module is run as ``python -m benchmarks.<name>`` from the project root
+with the usual environment (``SECRET_KEY``, ``POSTGRES_*``). Benchmarks run
+against a throwaway test database and print their results as JSON.
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment
+    )
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def timer(results: dict, key: str):
+    start = time.perf_counter()
+    yield
+    results[key] = round(time.perf_counter() - start, 4)
+
+
+def report(results: dict) -> None:
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
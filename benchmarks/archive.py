@@ -0,0 +1,154 @@
+"""Journey search latency and table size before and after archiving.
+
+    python -m benchmarks.archive --years 3 --journeys-per-day 50
+
+Seeds several years of journeys with tickets, measures journey search
+through the API and the size of the journey/ticket tables and indexes,
+archives everything older than the last 30 days and measures again.
+"""
+
+import argparse
+import statistics
+import time
+from datetime import timedelta
+
+from benchmarks import report, setup, test_database
+
+TICKETS_PER_JOURNEY = 20
+SEARCHES = 50
+
+
+def seed(years: int, journeys_per_day: int):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from railway_station.models import (
+        Journey,
+        Order,
+        Route,
+        Station,
+        Ticket,
+        Train,
+        TrainType
+    )
+
+    source = Station.objects.create(name="Source", latitude=0, longitude=0)
+    destination = Station.objects.create(
+        name="Destination", latitude=1, longitude=1
+    )
+    route = Route.objects.create(
+        source=source, destination=destination, distance=100
+    )
+    train = Train.objects.create(
+        name="Express",
+        cargo_num=4,
+        places_in_cargo=50,
+        train_type=TrainType.objects.create(name="Passenger"),
+    )
+    user = get_user_model().objects.create_user(
+        email="bench@bench.local", password="bench"
+    )
+    now = timezone.now()
+    days = years * 365
+    journeys = Journey.objects.bulk_create(
+        (
+            Journey(
+                route=route,
+                train=train,
+                departure_time=now - timedelta(days=day, minutes=minute),
+                arrival_time=now - timedelta(days=day, minutes=minute - 60),
+            )
+            for day in range(days)
+            for minute in range(journeys_per_day)
+        ),
+        batch_size=5000,
+    )
+    orders = Order.objects.bulk_create(
+        (Order(user=user) for _ in journeys), batch_size=5000
+    )
+    Ticket.objects.bulk_create(
+        (
+            Ticket(journey=journey, order=order, cargo=1, seat=seat)
+            for journey, order in zip(journeys, orders)
+            for seat in range(1, TICKETS_PER_JOURNEY + 1)
+        ),
+        batch_size=10000,
+    )
+    return source, now
+
+
+def table_sizes() -> dict:
+    from django.db import connection
+
+    if connection.vendor != "postgresql":
+        return {}
+    sizes = {}
+    with connection.cursor() as cursor:
+        for table in ("railway_station_journey", "railway_station_ticket"):
+            cursor.execute(
+                "SELECT pg_relation_size(%s), pg_indexes_size(%s)",
+                [table, table],
+            )
+            sizes[f"{table}_bytes"], sizes[f"{table}_index_bytes"] = (
+                cursor.fetchone()
+            )
+    return sizes
+
+
+def search_latency(source, day) -> dict:
+    from django.db import connection
+    from django.test import Client
+    from django.urls import reverse
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+    client = Client()
+    url = reverse("railway_station:journey-list")
+    params = {"source": source.id, "departure_time": day.strftime("%Y-%m-%d")}
+    timings = []
+    for _ in range(SEARCHES):
+        start = time.perf_counter()
+        response = client.get(url, params)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+    timings.sort()
+    return {
+        "search_p50_ms": round(statistics.median(timings) * 1000, 2),
+        "search_p99_ms": round(timings[int(len(timings) * 0.99)] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--journeys-per-day", type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+    from railway_station.archive import archive_journeys
+
+    results = {"years": args.years, "journeys_per_day": args.journeys_per_day}
+    with test_database():
+        source, now = seed(args.years, args.journeys_per_day)
+        results["before"] = search_latency(source, now) | table_sizes()
+
+        start = time.perf_counter()
+        archived = archive_journeys(now - timedelta(days=30), batch_size=500)
+        results["archive_seconds"] = round(time.perf_counter() - start, 2)
+        results["archived"] = archived
+
+        if table_sizes():
+            from django.db import connection
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "VACUUM FULL railway_station_journey, "
+                    "railway_station_ticket"
+                )
+        results["after"] = search_latency(source, now) | table_sizes()
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Encode time and payload size of the binary renderers versus JSON.
+
+    python -m benchmarks.binary_formats --rows 1000
+
+Renders synthetic ``/journeys/`` and ``/routes/`` pages shaped like the
+list serializers' output (no database needed) with every renderer and
+reports the median encode time and the raw and gzipped payload sizes.
+"""
+
+import argparse
+import gzip
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import report, setup
+
+REPEATS = 20
+
+
+def journeys_page(rng: random.Random, rows: int, stations: list) -> dict:
+    trains = [f"Train {n} (Intercity)" for n in range(20)]
+    crews = [f"Crew {n} Member" for n in range(50)]
+    start = datetime(2024, 12, 1, tzinfo=timezone.utc)
+    results = []
+    for pk in range(1, rows + 1):
+        departure = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 30))
+        results.append(
+            {
+                "id": pk,
+                "route": " - ".join(rng.sample(stations, 2)),
+                "train": rng.choice(trains),
+                "departure_time": departure.isoformat().replace("+00:00", "Z"),
+                "arrival_time": (
+                    departure + timedelta(hours=rng.randint(1, 12))
+                )
+                .isoformat()
+                .replace("+00:00", "Z"),
+                "crews": rng.sample(crews, 2),
+                "tickets_available": rng.randint(0, 500),
+            }
+        )
+    return {"count": rows, "next": None, "previous": None, "results": results}
+
+
+def routes_page(rng: random.Random, rows: int, stations: list) -> dict:
+    results = []
+    for pk in range(1, rows + 1):
+        source, destination = rng.sample(stations, 2)
+        results.append(
+            {
+                "id": pk,
+                "source": source,
+                "destination": destination,
+                "distance": rng.randint(10, 1500),
+            }
+        )
+    return {"count": rows, "next": None, "previous": None, "results": results}
+
+
+def measure(renderer, data) -> dict:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        body = renderer.render(data, renderer.media_type, {})
+        timings.append(time.perf_counter() - start)
+    return {
+        "encode_ms": round(statistics.median(timings) * 1e3, 2),
+        "bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework.renderers import JSONRenderer
+
+    from railway_station.renderers import CBORRenderer, MessagePackRenderer
+
+    rng = random.Random(args.seed)
+    stations = [f"Station {n}" for n in range(200)]
+    renderers = {
+        "json": JSONRenderer(),
+        "msgpack": MessagePackRenderer(),
+        "cbor": CBORRenderer(),
+    }
+    results = {"rows": args.rows}
+    for page, data in (
+        ("journeys", journeys_page(rng, args.rows, stations)),
+        ("routes", routes_page(rng, args.rows, stations)),
+    ):
+        results[page] = {
+            name: measure(renderer, data)
+            for name, renderer in renderers.items()
+        }
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Delete time for a station with many dependent tickets.
+
+    python -m benchmarks.bulk_delete --tickets 1000000
+
+Compares Django's deletion collector (``Station.delete()``) with the
+chunked set-based path in ``railway_station.deletion``.
+"""
+
+import argparse
+
+from benchmarks import report, setup, test_database, timer
+
+SEATS_PER_JOURNEY = 1000
+INSERT_BATCH_SIZE = 10000
+
+
+def seed_station(name: str, tickets: int):
+    from datetime import timedelta
+
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from railway_station.models import (
+        Journey,
+        Order,
+        Route,
+        Station,
+        Ticket,
+        Train,
+        TrainType
+    )
+
+    station = Station.objects.create(name=name, latitude=0, longitude=0)
+    other = Station.objects.create(name=f"{name} end", latitude=1, longitude=1)
+    route = Route.objects.create(
+        source=station, destination=other, distance=100
+    )
+    train = Train.objects.create(
+        name=f"{name} train",
+        cargo_num=SEATS_PER_JOURNEY // 50,
+        places_in_cargo=50,
+        train_type=TrainType.objects.get_or_create(name="Benchmark")[0],
+    )
+    user = get_user_model().objects.create_user(
+        email=f"{name.lower()}@bench.local", password="bench"
+    )
+    start = timezone.now()
+    journeys = Journey.objects.bulk_create(
+        Journey(
+            route=route,
+            train=train,
+            departure_time=start + timedelta(hours=i),
+            arrival_time=start + timedelta(hours=i, minutes=30),
+        )
+        for i in range(-(-tickets // SEATS_PER_JOURNEY))
+    )
+    orders = Order.objects.bulk_create(
+        Order(user=user) for _ in journeys
+    )
+
+    batch = []
+    for n in range(tickets):
+        journey_index, seat_index = divmod(n, SEATS_PER_JOURNEY)
+        cargo, seat = divmod(seat_index, 50)
+        batch.append(
+            Ticket(
+                journey=journeys[journey_index],
+                order=orders[journey_index],
+                cargo=cargo + 1,
+                seat=seat + 1,
+            )
+        )
+        if len(batch) == INSERT_BATCH_SIZE:
+            Ticket.objects.bulk_create(batch)
+            batch = []
+    Ticket.objects.bulk_create(batch)
+    return station
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument(
+        "--skip-collector",
+        action="store_true",
+        help="Only measure the bulk path",
+    )
+    args = parser.parse_args()
+
+    setup()
+    from railway_station.deletion import delete_station
+
+    results = {"tickets": args.tickets, "batch_size": args.batch_size}
+    with test_database():
+        station = seed_station("Bulk", args.tickets)
+        with timer(results, "bulk_delete_seconds"):
+            delete_station(station, args.batch_size)
+
+        if not args.skip_collector:
+            station = seed_station("Collector", args.tickets)
+            with timer(results, "collector_delete_seconds"):
+                station.delete()
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Latency, throughput and query counts of the key API endpoints.
+
+    python -m benchmarks.endpoints --journeys 5000 --orders 20000
+
+Seeds a skewed network with the ``seed_scale`` generator, then drives
+journey search, journey retrieve, order create, order list and ticket
+list through the Django test client. Every endpoint reports throughput,
+p50/p99 latency and the number of queries per request, so runs can be
+compared over time.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks import report, setup, test_database
+
+
+def measure(send, calls: list) -> dict:
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings, queries, errors = [], [], 0
+    start = time.perf_counter()
+    for args in calls:
+        # The query log is capped; keep it from filling up over a run.
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as context:
+            request_start = time.perf_counter()
+            response = send(*args)
+            timings.append(time.perf_counter() - request_start)
+        queries.append(len(context))
+        errors += response.status_code >= 400
+    elapsed = time.perf_counter() - start
+    timings.sort()
+    return {
+        "requests": len(calls),
+        "errors": errors,
+        "throughput_rps": round(len(calls) / elapsed, 1),
+        "p50_ms": round(statistics.median(timings) * 1e3, 2),
+        "p99_ms": round(timings[int(len(timings) * 0.99)] * 1e3, 2),
+        "queries_mean": round(statistics.mean(queries), 1),
+        "queries_max": max(queries),
+    }
+
+
+def free_seats(journeys, count: int, rng: random.Random) -> list:
+    """(journey, cargo, seat) triples that are not booked yet."""
+    from railway_station.models import Ticket
+
+    taken = set(
+        Ticket.objects.filter(journey__in=journeys).values_list(
+            "journey_id", "cargo", "seat"
+        )
+    )
+    seats = [
+        (journey.pk, cargo, seat)
+        for journey in journeys
+        for cargo in range(1, journey.train.cargo_num + 1)
+        for seat in range(1, journey.train.places_in_cargo + 1)
+        if (journey.pk, cargo, seat) not in taken
+    ]
+    return rng.sample(seats, min(count, len(seats)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stations", type=int, default=200)
+    parser.add_argument("--routes", type=int, default=1000)
+    parser.add_argument("--trains", type=int, default=100)
+    parser.add_argument("--journeys", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup()
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from railway_station.models import Journey, Order
+    from railway_station.seeding import seed
+
+    rng = random.Random(args.seed)
+    with test_database():
+        results = {
+            "seeded": seed(
+                stations=args.stations,
+                routes=args.routes,
+                trains=args.trains,
+                journeys=args.journeys,
+                users=args.users,
+                orders=args.orders,
+                rng_seed=args.seed,
+            )
+        }
+        client = APIClient()
+        # Sampling orders follows the skew: heavy users come up often.
+        users = [
+            order.user
+            for order in Order.objects.select_related("user").order_by("?")[
+                : args.requests
+            ]
+        ]
+        journeys = list(
+            Journey.objects.select_related("route", "train").order_by("?")[
+                : args.requests
+            ]
+        )
+
+        def get(url, user=None, params=None):
+            client.force_authenticate(user)
+            return client.get(url, params)
+
+        def post(url, user, data):
+            client.force_authenticate(user)
+            return client.post(url, data, format="json")
+
+        results["journey_search"] = measure(
+            get,
+            [
+                (
+                    reverse("railway_station:journey-list"),
+                    None,
+                    {
+                        "source": journey.route.source_id,
+                        "destination": journey.route.destination_id,
+                        "departure_time": f"{journey.departure_time:%Y-%m-%d}",
+                    },
+                )
+                for journey in journeys
+            ],
+        )
+        results["journey_retrieve"] = measure(
+            get,
+            [
+                (reverse("railway_station:journey-detail", args=[journey.pk]),)
+                for journey in journeys
+            ],
+        )
+        results["order_create"] = measure(
+            post,
+            [
+                (
+                    reverse("railway_station:order-list"),
+                    rng.choice(users),
+                    {
+                        "tickets": [
+                            {"journey": journey, "cargo": cargo, "seat": seat}
+                        ]
+                    },
+                )
+                for journey, cargo, seat in free_seats(
+                    journeys, args.requests, rng
+                )
+            ],
+        )
+        results["order_list"] = measure(
+            get,
+            [(reverse("railway_station:order-list"), user) for user in users],
+        )
+        results["ticket_list"] = measure(
+            get,
+            [(reverse("railway_station:ticket-list"), user) for user in users],
+        )
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
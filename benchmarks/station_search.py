@@ -0,0 +1,74 @@
+"""Station name lookup latency of the in-memory index.
+
+    python -m benchmarks.station_search --stations 50000
+
+Builds the index over synthetic station names (no database needed) and
+reports build time and per-lookup latency for prefix, fuzzy and exact
+name resolution.
+"""
+
+import argparse
+import random
+import statistics
+import string
+import time
+
+from benchmarks import report, setup
+
+LOOKUPS = 2000
+
+
+def random_name(rng: random.Random) -> str:
+    words = rng.randint(1, 3)
+    return " ".join(
+        rng.choice(string.ascii_uppercase)
+        + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for _ in range(words)
+    )
+
+
+def latency(lookup, queries) -> dict:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        lookup(query)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "p50_us": round(statistics.median(timings) * 1e6, 1),
+        "p99_us": round(timings[int(len(timings) * 0.99)] * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stations", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup()
+    from railway_station.search import StationIndex
+
+    rng = random.Random(args.seed)
+    names = list({random_name(rng) for _ in range(args.stations)})
+    start = time.perf_counter()
+    index = StationIndex(enumerate(names, start=1))
+    results = {
+        "stations": len(names),
+        "build_seconds": round(time.perf_counter() - start, 3),
+    }
+    samples = rng.sample(names, LOOKUPS)
+    results["prefix"] = latency(
+        lambda query: index.prefix(query, 10),
+        [name[:3] for name in samples],
+    )
+    results["fuzzy"] = latency(
+        lambda query: index.search(query, 10),
+        [name[:-1] + "x" for name in samples],
+    )
+    results["resolve"] = latency(index.resolve, samples)
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
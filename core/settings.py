@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 import os
 from datetime import timedelta
+from decimal import Decimal
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,6 +47,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "railway_station.admission.AdmissionControlMiddleware",
+    "railway_station.traffic.TrafficCaptureMiddleware",
+    "railway_station.profiling.ProfilingMiddleware",
+    "railway_station.metrics.MetricsMiddleware",
+    "railway_station.slow_queries.SlowQueryMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -90,6 +96,23 @@ DATABASES = {
     }
 }
 
+# Seat maps, journey calendars, the station index and the distance matrix
+# version are invalidated through this cache, so every worker has to share
+# it. The local-memory fallback only suits a single process.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -137,8 +160,22 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        "railway_station.renderers.MessagePackRenderer",
+        "railway_station.renderers.CBORRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+        "railway_station.parsers.MessagePackParser",
+        "railway_station.parsers.CBORParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
+    "EXCEPTION_HANDLER": "railway_station.exceptions.exception_handler",
 }
 
 SIMPLE_JWT = {
@@ -147,3 +184,108 @@ SIMPLE_JWT = {
 }
 
 AUTH_USER_MODEL = "user.User"
+
+# Route, journey and ticket invariants are enforced by database constraints.
+# Enable to also run ``full_clean()`` on every ``save()``.
+VALIDATE_MODELS_ON_SAVE = False
+
+# How long responses stored for an ``Idempotency-Key`` header are replayed.
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+# Accept orders with 202 and create them from a DB-backed queue drained by
+# ``manage.py process_order_queue`` instead of inside the request.
+ORDER_QUEUE_ENABLED = False
+# Jobs claimed longer ago than this by a worker that never finished them
+# (e.g. it was killed) are claimed again.
+ORDER_QUEUE_CLAIM_TIMEOUT = timedelta(minutes=5)
+
+# Pub/sub used to push seat changes to journey watchers. The local backend
+# only reaches watchers connected to the same process.
+SEAT_EVENTS_BACKEND = "railway_station.events.LocalSeatEventBackend"
+
+# Pre-built OpenAPI schema written by ``manage.py build_schema``.
+SCHEMA_ARTIFACT_DIR = BASE_DIR / "schema_artifacts"
+SCHEMA_CACHE_MAX_AGE = 3600
+
+# Seat maps are invalidated on ticket writes; the timeout only bounds how
+# long an entry may outlive changes made outside the API.
+SEAT_MAP_CACHE_TIMEOUT = 300
+
+# Journey calendars are invalidated on ticket and journey writes made through
+# the API; bulk changes such as generated timetables show up after the
+# timeout.
+JOURNEY_CALENDAR_CACHE_TIMEOUT = 300
+
+# A DELETE of a station, route or train removes at most this many batches
+# of its journeys and answers 202 while some are left; repeating the request
+# continues the deletion.
+DELETION_BATCHES_PER_REQUEST = 10
+
+# ``manage.py update_analytics`` only rolls up orders older than this, so
+# transactions still in flight when it runs are not skipped for good.
+ANALYTICS_ROLLUP_LAG = timedelta(minutes=1)
+
+# ``/sync/`` only returns changes older than SYNC_LAG, so rows written by
+# transactions still in flight are picked up by the next sync. Tombstones
+# are kept for SYNC_TOMBSTONE_TTL; older sync tokens require a full sync.
+SYNC_LAG = timedelta(seconds=5)
+SYNC_TOMBSTONE_TTL = timedelta(days=30)
+
+# Largest number of sub-requests accepted by ``/api/v1/batch/``.
+BATCH_MAX_REQUESTS = 20
+
+# Metrics served at ``/metrics/`` are kept per process unless the
+# PROMETHEUS_MULTIPROC_DIR environment variable points every worker at a
+# shared, initially empty directory.
+
+# Queries slower than SLOW_QUERY_THRESHOLD seconds are written with their
+# plan to a rotating JSONL file; summarize with ``slow_query_report``.
+SLOW_QUERY_LOG_ENABLED = False
+SLOW_QUERY_THRESHOLD = 0.2
+SLOW_QUERY_LOG_FILE = BASE_DIR / "logs" / "slow_queries.jsonl"
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 5
+
+# Profile requests of staff sending an ``X-Profile`` header or ``?profile``
+# and a PROFILING_SAMPLE_RATE fraction of all requests. The newest
+# PROFILING_MAX_FILES profiles are kept in PROFILING_DIR.
+PROFILING_ENABLED = False
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_DIR = BASE_DIR / "profiles"
+PROFILING_MAX_FILES = 200
+
+# Write a TRAFFIC_CAPTURE_SAMPLE_RATE fraction of requests as anonymized
+# JSONL lines (free text masked, users hashed into buckets) for
+# ``replay_traffic``.
+TRAFFIC_CAPTURE_ENABLED = False
+TRAFFIC_CAPTURE_SAMPLE_RATE = 0.1
+TRAFFIC_CAPTURE_FILE = BASE_DIR / "logs" / "traffic.jsonl"
+TRAFFIC_CAPTURE_MAX_BYTES = 50 * 1024 * 1024
+TRAFFIC_CAPTURE_BACKUPS = 5
+TRAFFIC_CAPTURE_USER_BUCKETS = 16
+
+# All-pairs shortest route distances are kept in DISTANCE_MATRIX_FILE, which
+# every process serving the API must be able to read; rebuild it with
+# ``build_distance_matrix``. Updates are serialized with a lock file next to
+# it and announced to other processes through the shared cache. Fares are
+# FARE_BASE plus FARE_PER_KM for each kilometre of the shortest distance.
+DISTANCE_MATRIX_FILE = BASE_DIR / "data" / "distance_matrix.npz"
+FARE_BASE = Decimal("2.00")
+FARE_PER_KM = Decimal("0.05")
+
+# Admission control: requests are matched against ADMISSION_ROUTES in order
+# and limited by the class of the first match; ``None`` and unmatched paths
+# are never limited. Limits apply per process. While a class with a lower
+# ``priority`` number is queueing, classes with higher numbers are shed.
+ADMISSION_ROUTES = [
+    (r"^/api/v1/station/journeys/\d+/seats/stream/", None),
+    (r"^/api/v1/station/(orders|order_jobs|tickets)/", "orders"),
+    (r"^/api/v1/batch/", "orders"),
+    (r"^/api/v1/station/(journeys|stations/search)/", "search"),
+    (r"^/api/v1/station/", "catalog"),
+]
+ADMISSION_CLASSES = {
+    "orders": {"limit": 16, "queue": 64, "timeout": 5.0, "priority": 0},
+    "catalog": {"limit": 8, "queue": 16, "timeout": 1.0, "priority": 1},
+    "search": {"limit": 8, "queue": 16, "timeout": 0.5, "priority": 2},
+}
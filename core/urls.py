@@ -18,19 +18,30 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import (
-    SpectacularAPIView,
     SpectacularRedocView,
     SpectacularSwaggerView
 )
 
+from railway_station.admission import AdmissionStatsView
+from railway_station.batch import BatchView
+from railway_station.metrics import metrics_view
+from railway_station.schema import StaticSchemaView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics/", metrics_view, name="metrics"),
     path(
         "api/v1/station/",
         include("railway_station.urls", namespace="railway_station"),
     ),
     path("api/v1/account/", include("user.urls", namespace="user")),
-    path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/v1/batch/", BatchView.as_view(), name="batch"),
+    path(
+        "api/v1/admission/",
+        AdmissionStatsView.as_view(),
+        name="admission-stats",
+    ),
+    path("api/v1/schema/", StaticSchemaView.as_view(), name="schema"),
     path(
         "api/v1/doc/swagger/",
         SpectacularSwaggerView.as_view(url_name="schema"),
@@ -1 +1,440 @@
-# Register your models here.
+from functools import reduce
+from operator import or_
+
+from django.contrib import admin
+from django.contrib.auth import get_permission_codename
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from django.utils.text import capfirst
+
+from railway_station.deletion import (
+    delete_journeys,
+    delete_route,
+    delete_station,
+    delete_train
+)
+from railway_station.journey_calendar import invalidate_calendars
+from railway_station.models import (
+    ArchivedJourney,
+    ArchivedOrder,
+    ArchivedTicket,
+    Crew,
+    HourlyOrders,
+    IdempotencyKey,
+    Journey,
+    Order,
+    OrderJob,
+    RollupHighWaterMark,
+    Route,
+    RouteDailySales,
+    Station,
+    Ticket,
+    TimetableRule,
+    Tombstone,
+    Train,
+    TrainType,
+    TrainTypeDailyLoad
+)
+from railway_station.signals import send_seats_changed
+
+# Unfiltered tables at least this large are counted from planner statistics.
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that skips ``COUNT(*)`` over whole large tables.
+
+    PostgreSQL keeps a row estimate per table; it is used when the
+    changelist is neither filtered nor searched and the table is large
+    enough for an exact count to hurt. Filtered lists are counted exactly.
+    """
+
+    def _estimate(self) -> int | None:
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql" or queryset.query.where:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(%s)",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    @cached_property
+    def count(self) -> int:
+        estimate = self._estimate()
+        if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+            return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Filtered lists would otherwise also count the whole table.
+    show_full_result_count = False
+
+
+class SelectRelatedMixin:
+    """Join `list_select_related` for every queryset of the admin.
+
+    ``__str__`` of these models follows foreign keys and is also rendered
+    by autocomplete results and change forms. The changelist ignores
+    `list_select_related` once the queryset has joins of its own, so the
+    same relations are used there too.
+    """
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .select_related(*self.list_select_related)
+        )
+
+
+class IdSearchAdmin(LargeTableAdmin):
+    """Search by exact primary or foreign keys, which are all indexed."""
+
+    search_fields = ("=id",)
+    id_search_fields = ("id",)
+    search_help_text = "Exact id"
+
+    def get_search_results(self, request, queryset, search_term):
+        terms = search_term.split()
+        if not terms:
+            return queryset, False
+        if not all(term.isdigit() for term in terms):
+            return queryset.none(), False
+        return (
+            queryset.filter(
+                reduce(
+                    or_,
+                    (
+                        Q(**{field: int(term)})
+                        for field in self.id_search_fields
+                        for term in terms
+                    ),
+                )
+            ),
+            False,
+        )
+
+
+def _journey_cascade(journeys: QuerySet) -> list[QuerySet]:
+    return [journeys, Ticket.objects.filter(journey__in=journeys)]
+
+
+def _route_cascade(routes: QuerySet) -> list[QuerySet]:
+    return [
+        routes,
+        TimetableRule.objects.filter(route__in=routes),
+        RouteDailySales.objects.filter(route__in=routes),
+        *_journey_cascade(Journey.objects.filter(route__in=routes)),
+    ]
+
+
+class CountedDeletionAdmin(admin.ModelAdmin):
+    """Confirm deletions with row counts per model.
+
+    The stock confirmation page collects and renders every journey and
+    ticket that goes with the selected objects, which does not finish for
+    busy routes and trains. Subclasses list the affected querysets.
+    """
+
+    def get_cascade(self, queryset: QuerySet) -> list[QuerySet]:
+        raise NotImplementedError
+
+    def get_deleted_objects(self, objs, request):
+        queryset = self.model.objects.filter(pk__in=[obj.pk for obj in objs])
+        model_count, perms_needed = {}, set()
+        for related in self.get_cascade(queryset):
+            count = related.count()
+            if not count:
+                continue
+            opts = related.model._meta
+            model_count[opts.verbose_name_plural] = count
+            codename = get_permission_codename("delete", opts)
+            if not request.user.has_perm(f"{opts.app_label}.{codename}"):
+                perms_needed.add(opts.verbose_name)
+        deleted_objects = [
+            f"{capfirst(name)}: {count}" for name, count in model_count.items()
+        ]
+        return deleted_objects, model_count, perms_needed, []
+
+
+@admin.register(TrainType)
+class TrainTypeAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
+
+
+@admin.register(Train)
+class TrainAdmin(SelectRelatedMixin, CountedDeletionAdmin):
+    list_display = ("name", "train_type", "cargo_num", "places_in_cargo")
+    list_select_related = ("train_type",)
+    list_filter = ("train_type",)
+    search_fields = ("name",)
+    autocomplete_fields = ("train_type",)
+
+    def get_cascade(self, queryset):
+        return [
+            queryset,
+            TimetableRule.objects.filter(train__in=queryset),
+            *_journey_cascade(Journey.objects.filter(train__in=queryset)),
+        ]
+
+    def delete_model(self, request, obj):
+        delete_train(obj)
+
+    def delete_queryset(self, request, queryset):
+        for train in queryset:
+            delete_train(train)
+
+
+@admin.register(Crew)
+class CrewAdmin(admin.ModelAdmin):
+    list_display = ("first_name", "last_name")
+    search_fields = ("last_name", "first_name")
+
+
+@admin.register(Station)
+class StationAdmin(CountedDeletionAdmin):
+    list_display = ("name", "latitude", "longitude")
+    # Case-sensitive prefixes can use the name's pattern index.
+    search_fields = ("name__startswith",)
+    search_help_text = "Name prefix, case-sensitive"
+
+    def get_cascade(self, queryset):
+        return [
+            queryset,
+            *_route_cascade(
+                Route.objects.filter(
+                    Q(source__in=queryset) | Q(destination__in=queryset)
+                )
+            ),
+        ]
+
+    def delete_model(self, request, obj):
+        delete_station(obj)
+
+    def delete_queryset(self, request, queryset):
+        for station in queryset:
+            delete_station(station)
+
+
+@admin.register(Route)
+class RouteAdmin(SelectRelatedMixin, CountedDeletionAdmin):
+    list_display = ("id", "source", "destination", "distance")
+    list_select_related = ("source", "destination")
+    search_fields = ("source__name__startswith",)
+    search_help_text = "Source station name prefix, case-sensitive"
+    autocomplete_fields = ("source", "destination")
+
+    def get_cascade(self, queryset):
+        return _route_cascade(queryset)
+
+    def delete_model(self, request, obj):
+        delete_route(obj)
+
+    def delete_queryset(self, request, queryset):
+        for route in queryset:
+            delete_route(route)
+
+
+@admin.register(TimetableRule)
+class TimetableRuleAdmin(admin.ModelAdmin):
+    list_display = (
+        "route",
+        "train",
+        "departure_time",
+        "days_of_week",
+        "valid_from",
+        "valid_until",
+    )
+    list_select_related = (
+        "route__source",
+        "route__destination",
+        "train__train_type",
+    )
+    list_filter = ("valid_until",)
+    autocomplete_fields = ("route", "train", "crews")
+
+
+@admin.register(Journey)
+class JourneyAdmin(SelectRelatedMixin, IdSearchAdmin, CountedDeletionAdmin):
+    list_display = ("id", "route", "train", "departure_time", "arrival_time")
+    list_select_related = (
+        "route__source",
+        "route__destination",
+        "train__train_type",
+    )
+    list_filter = ("departure_time",)
+    ordering = ("-departure_time",)
+    id_search_fields = ("id", "route_id", "train_id")
+    search_help_text = "Exact journey, route or train id"
+    autocomplete_fields = ("route", "train", "crews")
+    raw_id_fields = ("timetable_rule",)
+
+    def get_cascade(self, queryset):
+        return _journey_cascade(queryset)
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, Journey.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        invalidate_calendars(queryset)
+        delete_journeys(queryset)
+
+
+class TicketInline(admin.TabularInline):
+    model = Ticket
+    extra = 0
+    raw_id_fields = ("journey",)
+
+
+@admin.register(Order)
+class OrderAdmin(IdSearchAdmin):
+    list_display = ("id", "user", "created_at")
+    list_select_related = ("user",)
+    list_filter = ("created_at",)
+    id_search_fields = ("id", "user_id")
+    search_help_text = "Exact order or user id"
+    raw_id_fields = ("user",)
+    inlines = (TicketInline,)
+
+    def save_formset(self, request, form, formset, change):
+        # Edited forms already carry the new values, so the seats they
+        # release are read back from the database.
+        previous = Ticket.objects.in_bulk(
+            [
+                ticket_form.instance.pk
+                for ticket_form in formset.initial_forms
+                if ticket_form.has_changed()
+            ]
+        )
+        super().save_formset(request, form, formset, change)
+        changed = [ticket for ticket, _ in formset.changed_objects]
+        send_seats_changed(
+            taken=formset.new_objects + changed,
+            released=formset.deleted_objects
+            + [previous[ticket.pk] for ticket in changed],
+        )
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, Order.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        tickets = list(Ticket.objects.filter(order__in=queryset))
+        super().delete_queryset(request, queryset)
+        send_seats_changed(released=tickets)
+
+
+@admin.register(Ticket)
+class TicketAdmin(SelectRelatedMixin, IdSearchAdmin):
+    list_display = ("id", "journey", "cargo", "seat", "order_id")
+    list_select_related = (
+        "journey__route__source",
+        "journey__route__destination",
+    )
+    id_search_fields = ("id", "journey_id", "order_id")
+    search_help_text = "Exact ticket, journey or order id"
+    raw_id_fields = ("journey", "order")
+
+    def save_model(self, request, obj, form, change):
+        previous = Ticket.objects.filter(pk=obj.pk).first() if change else None
+        super().save_model(request, obj, form, change)
+        send_seats_changed(
+            taken=[obj], released=[previous] if previous else []
+        )
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        send_seats_changed(released=[obj])
+
+    def delete_queryset(self, request, queryset):
+        tickets = list(queryset)
+        super().delete_queryset(request, queryset)
+        send_seats_changed(released=tickets)
+
+
+@admin.register(ArchivedJourney)
+class ArchivedJourneyAdmin(IdSearchAdmin):
+    list_display = (
+        "id",
+        "source",
+        "destination",
+        "train",
+        "departure_time",
+        "archived_at",
+    )
+    list_filter = ("departure_time",)
+    ordering = ("-departure_time",)
+    id_search_fields = ("id", "route_id", "train_id")
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(IdSearchAdmin):
+    list_display = ("id", "user", "created_at")
+    list_select_related = ("user",)
+    id_search_fields = ("id", "user_id")
+    raw_id_fields = ("user",)
+
+
+@admin.register(ArchivedTicket)
+class ArchivedTicketAdmin(IdSearchAdmin):
+    list_display = ("id", "journey", "cargo", "seat", "order_id")
+    list_select_related = ("journey",)
+    id_search_fields = ("id", "journey_id", "order_id")
+    raw_id_fields = ("journey", "order")
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(IdSearchAdmin):
+    list_display = ("key", "user", "status_code", "created_at")
+    list_select_related = ("user",)
+    id_search_fields = ("id", "user_id")
+    raw_id_fields = ("user",)
+
+
+@admin.register(OrderJob)
+class OrderJobAdmin(IdSearchAdmin):
+    list_display = ("id", "user", "status", "order", "created_at")
+    list_select_related = ("user", "order")
+    list_filter = ("status",)
+    id_search_fields = ("id", "user_id", "order_id")
+    raw_id_fields = ("user", "order")
+
+
+@admin.register(RollupHighWaterMark)
+class RollupHighWaterMarkAdmin(admin.ModelAdmin):
+    list_display = ("name", "value")
+
+
+@admin.register(RouteDailySales)
+class RouteDailySalesAdmin(LargeTableAdmin):
+    list_display = ("route", "date", "seats_sold")
+    list_select_related = ("route__source", "route__destination")
+    list_filter = ("date",)
+    raw_id_fields = ("route",)
+
+
+@admin.register(TrainTypeDailyLoad)
+class TrainTypeDailyLoadAdmin(LargeTableAdmin):
+    list_display = ("train_type", "date", "seats_sold", "capacity")
+    list_select_related = ("train_type",)
+    list_filter = ("date", "train_type")
+
+
+@admin.register(HourlyOrders)
+class HourlyOrdersAdmin(LargeTableAdmin):
+    list_display = ("hour", "orders", "tickets")
+    list_filter = ("hour",)
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(LargeTableAdmin):
+    list_display = ("model", "object_id", "deleted_at")
+    list_filter = ("deleted_at",)
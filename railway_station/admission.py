@@ -0,0 +1,215 @@
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import cache
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async
+)
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+@dataclass
+class RouteClass:
+    name: str
+    limit: int
+    queue: int
+    timeout: float
+    priority: int
+    retry_after: int = 1
+    in_flight: int = 0
+    waiting: int = 0
+    admitted: int = 0
+    shed: int = 0
+    queue_seconds: float = 0.0
+    max_queue_seconds: float = 0.0
+    condition: threading.Condition = field(default=None, repr=False)
+
+
+class AdmissionController:
+    """Per-process concurrency limits with bounded, prioritised queues.
+
+    Every route class admits up to ``limit`` concurrent requests; the next
+    ``queue`` requests wait up to ``timeout`` seconds for a slot and the
+    rest are shed. While a class with a higher priority (lower number) has
+    requests waiting, lower priority classes shed instead of queueing, and
+    their queued requests give up, so capacity goes to the important routes
+    first.
+    """
+
+    def __init__(self, classes: dict[str, dict]):
+        self._lock = threading.Lock()
+        self.classes = {
+            name: RouteClass(
+                name, condition=threading.Condition(self._lock), **options
+            )
+            for name, options in classes.items()
+        }
+
+    def _pressured(self, route_class: RouteClass) -> bool:
+        return any(
+            other.waiting
+            for other in self.classes.values()
+            if other.priority < route_class.priority
+        )
+
+    def _admit(self, route_class: RouteClass, start: float) -> float:
+        queued = time.monotonic() - start
+        route_class.in_flight += 1
+        route_class.admitted += 1
+        route_class.queue_seconds += queued
+        route_class.max_queue_seconds = max(
+            route_class.max_queue_seconds, queued
+        )
+        return queued
+
+    def acquire(self, name: str, wait: bool = True) -> float | None:
+        """Take a slot of class `name`.
+
+        Returns the seconds spent queueing, or None if the request is shed.
+        With `wait` false a request that would have to queue returns None
+        without being counted as shed.
+        """
+        route_class = self.classes[name]
+        start = time.monotonic()
+        with self._lock:
+            if route_class.in_flight < route_class.limit:
+                return self._admit(route_class, start)
+            if not wait:
+                return None
+            if route_class.waiting >= route_class.queue or self._pressured(
+                route_class
+            ):
+                route_class.shed += 1
+                return None
+            route_class.waiting += 1
+            for other in self.classes.values():
+                if other.priority > route_class.priority:
+                    other.condition.notify_all()
+            deadline = start + route_class.timeout
+            try:
+                while route_class.in_flight >= route_class.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self._pressured(route_class):
+                        route_class.shed += 1
+                        return None
+                    route_class.condition.wait(remaining)
+                return self._admit(route_class, start)
+            finally:
+                route_class.waiting -= 1
+
+    def release(self, name: str) -> None:
+        route_class = self.classes[name]
+        with self._lock:
+            route_class.in_flight -= 1
+            route_class.condition.notify()
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                name: {
+                    "in_flight": route_class.in_flight,
+                    "waiting": route_class.waiting,
+                    "admitted": route_class.admitted,
+                    "shed": route_class.shed,
+                    "avg_queue_seconds": (
+                        route_class.queue_seconds / route_class.admitted
+                        if route_class.admitted
+                        else 0.0
+                    ),
+                    "max_queue_seconds": route_class.max_queue_seconds,
+                }
+                for name, route_class in self.classes.items()
+            }
+
+
+@cache
+def get_controller() -> AdmissionController:
+    return AdmissionController(settings.ADMISSION_CLASSES)
+
+
+@cache
+def _routes() -> list[tuple[re.Pattern, str | None]]:
+    return [
+        (re.compile(pattern), name)
+        for pattern, name in settings.ADMISSION_ROUTES
+    ]
+
+
+def route_class_name(path: str) -> str | None:
+    """Class of the first ADMISSION_ROUTES pattern matching `path`."""
+    for pattern, name in _routes():
+        if pattern.match(path):
+            return name
+    return None
+
+
+class AdmissionControlMiddleware:
+    """Admit, queue or shed requests according to their route class.
+
+    Shed requests get 503 with ``Retry-After`` before any other middleware
+    or view runs. Paths without a class are never limited.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _shed(self, name: str) -> JsonResponse:
+        response = JsonResponse(
+            {"detail": "Service is overloaded, retry later."}, status=503
+        )
+        response["Retry-After"] = str(
+            get_controller().classes[name].retry_after
+        )
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        name = route_class_name(request.path_info)
+        if name is None:
+            return self.get_response(request)
+        controller = get_controller()
+        if controller.acquire(name) is None:
+            return self._shed(name)
+        try:
+            return self.get_response(request)
+        finally:
+            controller.release(name)
+
+    async def __acall__(self, request):
+        name = route_class_name(request.path_info)
+        if name is None:
+            return await self.get_response(request)
+        controller = get_controller()
+        # Only requests that have to queue block a worker thread.
+        if controller.acquire(name, wait=False) is None:
+            acquire = sync_to_async(controller.acquire, thread_sensitive=False)
+            if await acquire(name) is None:
+                return self._shed(name)
+        try:
+            return await self.get_response(request)
+        finally:
+            controller.release(name)
+
+
+class AdmissionStatsView(APIView):
+    """In-flight, queued and shed requests of every route class."""
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(get_controller().stats())
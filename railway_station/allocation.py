@@ -0,0 +1,77 @@
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from railway_station.metrics import (
+    record_order_created,
+    record_seat_rejection
+)
+from railway_station.models import Journey, Order, Ticket, Train
+from railway_station.seat_map import free_ranges, taken_places
+from railway_station.signals import send_seats_changed
+
+
+def _best_fit(
+    taken: dict[int, set[int]], train: Train, count: int, cargos
+) -> tuple[int, int] | None:
+    best = None
+    for number in cargos:
+        for first, last in free_ranges(taken[number], train.places_in_cargo):
+            size = last - first + 1
+            if size >= count and (best is None or size < best[0]):
+                best = (size, number, first)
+    return best and best[1:]
+
+
+def find_block(
+    taken: dict[int, set[int]],
+    train: Train,
+    count: int,
+    cargo: int | None = None,
+) -> tuple[int, int] | None:
+    """Return (cargo, first seat) of the best block of `count` free seats.
+
+    The smallest free range that fits wins, so large ranges stay available
+    for larger groups; ties go to the lowest cargo and seat. A preferred
+    `cargo` is tried first, then the others by their distance from it.
+    """
+    cargos = range(1, train.cargo_num + 1)
+    if not cargo:
+        return _best_fit(taken, train, count, cargos)
+    for number in sorted(cargos, key=lambda number: abs(number - cargo)):
+        block = _best_fit(taken, train, count, [number])
+        if block:
+            return block
+    return None
+
+
+def allocate_seats(
+    user, journey: Journey, count: int, cargo: int | None = None
+) -> Order:
+    """Create an order with `count` adjacent seats of one cargo.
+
+    The journey row is locked while the block is chosen and the tickets are
+    inserted, so concurrent allocations never pick the same seats.
+    """
+    with transaction.atomic():
+        journey = (
+            Journey.objects.select_for_update()
+            .select_related("train")
+            .get(pk=journey.pk)
+        )
+        block = find_block(
+            taken_places(journey.id), journey.train, count, cargo
+        )
+        if block is None:
+            record_seat_rejection("no_block")
+            raise ValidationError(
+                f"No {count} adjacent free seats in any cargo"
+            )
+        block_cargo, first_seat = block
+        order = Order.objects.create(user=user)
+        tickets = Ticket.objects.bulk_create(
+            Ticket(journey=journey, order=order, cargo=block_cargo, seat=seat)
+            for seat in range(first_seat, first_seat + count)
+        )
+        send_seats_changed(taken=tickets)
+        record_order_created()
+    return order
@@ -0,0 +1,155 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from railway_station.models import (
+    HourlyOrders,
+    Journey,
+    Order,
+    RollupHighWaterMark,
+    RouteDailySales,
+    Ticket,
+    TrainTypeDailyLoad
+)
+
+ORDERS_MARK = "orders"
+EPOCH = timezone.make_aware(datetime(1970, 1, 1))
+
+
+def _accumulate(
+    model: type[models.Model],
+    rows: list[dict],
+    key_fields: tuple,
+    value_fields: tuple,
+    **existing_filter,
+) -> dict:
+    """Add `rows` to the rollup `model` and return the touched rows by key.
+
+    Rows whose key already exists are incremented, the rest are created.
+    """
+    existing = {
+        tuple(getattr(obj, field) for field in key_fields): obj
+        for obj in model.objects.filter(**existing_filter)
+    }
+    touched = {}
+    for row in rows:
+        key = tuple(row[field] for field in key_fields)
+        obj = existing.get(key)
+        if obj is None:
+            obj = model(**row)
+        else:
+            for field in value_fields:
+                setattr(obj, field, getattr(obj, field) + row[field])
+        touched[key] = obj
+    return touched
+
+
+def _save(model: type[models.Model], touched: dict, fields: list) -> None:
+    model.objects.bulk_create(obj for obj in touched.values() if not obj.pk)
+    model.objects.bulk_update(
+        [obj for obj in touched.values() if obj.pk], fields
+    )
+
+
+def update_rollups(until: datetime | None = None) -> dict:
+    """Fold orders created since the high-water mark into the rollups.
+
+    Orders in (mark, until] are aggregated with three grouped queries and
+    added to the rollup rows; the mark then moves to `until`. The mark row
+    is locked for the whole run, so concurrent runs never count an order
+    twice.
+    """
+    if until is None:
+        until = timezone.now() - settings.ANALYTICS_ROLLUP_LAG
+    with transaction.atomic():
+        marks = RollupHighWaterMark.objects.select_for_update()
+        mark, _ = marks.get_or_create(
+            name=ORDERS_MARK, defaults={"value": EPOCH}
+        )
+        if until <= mark.value:
+            return {"orders": 0, "tickets": 0}
+        orders = Order.objects.filter(
+            created_at__gt=mark.value, created_at__lte=until
+        )
+        tickets = Ticket.objects.filter(order__in=orders)
+        day = TruncDate("journey__departure_time")
+
+        route_rows = list(
+            tickets.values(route_id=F("journey__route"), date=day)
+            .annotate(seats_sold=Count("pk"))
+            .order_by()
+        )
+        route_sales = _accumulate(
+            RouteDailySales,
+            route_rows,
+            ("route_id", "date"),
+            ("seats_sold",),
+            date__in={row["date"] for row in route_rows},
+        )
+
+        load_rows = list(
+            tickets.values(
+                train_type_id=F("journey__train__train_type"), date=day
+            )
+            .annotate(seats_sold=Count("pk"))
+            .order_by()
+        )
+        dates = {row["date"] for row in load_rows}
+        loads = _accumulate(
+            TrainTypeDailyLoad,
+            load_rows,
+            ("train_type_id", "date"),
+            ("seats_sold",),
+            date__in=dates,
+        )
+        capacities = (
+            Journey.objects.filter(
+                departure_time__date__in=dates,
+                train__train_type__in={
+                    row["train_type_id"] for row in load_rows
+                },
+            )
+            .values(
+                train_type_id=F("train__train_type"),
+                date=TruncDate("departure_time"),
+            )
+            .annotate(
+                capacity=Sum(
+                    F("train__cargo_num") * F("train__places_in_cargo")
+                )
+            )
+            .order_by()
+        )
+        for row in capacities:
+            load = loads.get((row["train_type_id"], row["date"]))
+            if load is not None:
+                load.capacity = row["capacity"]
+
+        hour_rows = list(
+            orders.values(hour=TruncHour("created_at"))
+            .annotate(
+                orders=Count("pk", distinct=True), tickets=Count("tickets")
+            )
+            .order_by()
+        )
+        hours = _accumulate(
+            HourlyOrders,
+            hour_rows,
+            ("hour",),
+            ("orders", "tickets"),
+            hour__in={row["hour"] for row in hour_rows},
+        )
+
+        _save(RouteDailySales, route_sales, ["seats_sold"])
+        _save(TrainTypeDailyLoad, loads, ["seats_sold", "capacity"])
+        _save(HourlyOrders, hours, ["orders", "tickets"])
+        mark.value = until
+        mark.save(update_fields=["value"])
+    return {
+        "orders": sum(row["orders"] for row in hour_rows),
+        "tickets": sum(row["tickets"] for row in hour_rows),
+    }
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class RailwayStationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "railway_station"
+
+    def ready(self):
+        import railway_station.distances  # noqa
+        import railway_station.events  # noqa
+        import railway_station.journey_calendar  # noqa
+        import railway_station.metrics  # noqa
+        import railway_station.search  # noqa
+        import railway_station.seat_map  # noqa
+        import railway_station.sync  # noqa
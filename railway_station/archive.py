@@ -0,0 +1,93 @@
+from datetime import datetime
+
+from django.db import transaction
+
+from railway_station.deletion import delete_journeys
+from railway_station.models import (
+    ArchivedJourney,
+    ArchivedOrder,
+    ArchivedTicket,
+    Journey,
+    Order,
+    Ticket
+)
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def _archive_batch(ids: list[int]) -> dict[str, int]:
+    journeys = (
+        Journey.objects.filter(pk__in=ids)
+        .select_related("route__source", "route__destination", "train")
+        .prefetch_related("crews")
+    )
+    ArchivedJourney.objects.bulk_create(
+        ArchivedJourney(
+            id=journey.id,
+            route_id=journey.route_id,
+            train_id=journey.train_id,
+            source=journey.route.source.name,
+            destination=journey.route.destination.name,
+            train=journey.train.name,
+            cargo_num=journey.train.cargo_num,
+            places_in_cargo=journey.train.places_in_cargo,
+            departure_time=journey.departure_time,
+            arrival_time=journey.arrival_time,
+            crews=[crew.full_name for crew in journey.crews.all()],
+        )
+        for journey in journeys
+    )
+    tickets = list(
+        Ticket.objects.filter(journey_id__in=ids).values(
+            "id", "cargo", "seat", "journey_id", "order_id"
+        )
+    )
+    order_ids = {ticket["order_id"] for ticket in tickets}
+    # Archived tickets reference their archived order, so it is created by
+    # the first batch archiving any of its tickets; later batches keep it.
+    ArchivedOrder.objects.bulk_create(
+        (
+            ArchivedOrder(**order)
+            for order in Order.objects.filter(pk__in=order_ids).values(
+                "id", "created_at", "user_id"
+            )
+        ),
+        ignore_conflicts=True,
+    )
+    ArchivedTicket.objects.bulk_create(
+        ArchivedTicket(**ticket) for ticket in tickets
+    )
+
+    deleted = delete_journeys(Journey.objects.filter(pk__in=ids))
+
+    _, finished = Order.objects.filter(
+        pk__in=order_ids, tickets__isnull=True
+    ).delete()
+    return {
+        "journeys": deleted["journeys"],
+        "tickets": deleted["tickets"],
+        "orders": finished.get(Order._meta.label, 0),
+    }
+
+
+def archive_journeys(
+    before: datetime,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress=None,
+) -> dict[str, int]:
+    """Move journeys that arrived before `before` into the archive tables.
+
+    Each batch of journeys is copied and removed in its own transaction
+    together with its tickets and every order left without live tickets.
+    """
+    journeys = Journey.objects.filter(arrival_time__lt=before).order_by("pk")
+    archived = {"journeys": 0, "tickets": 0, "orders": 0}
+    while True:
+        ids = list(journeys.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return archived
+        with transaction.atomic():
+            for label, count in _archive_batch(ids).items():
+                archived[label] += count
+        if progress:
+            progress(archived)
@@ -0,0 +1,166 @@
+import json
+import logging
+from io import BytesIO
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.urls import Resolver404, resolve
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers, status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# Parent request headers every sub-request inherits.
+SHARED_HEADERS = ("HTTP_HOST", "HTTP_AUTHORIZATION", "HTTP_ACCEPT_LANGUAGE")
+
+logger = logging.getLogger(__name__)
+
+
+class SubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(
+        choices=["GET", "POST", "PUT", "PATCH", "DELETE"]
+    )
+    path = serializers.RegexField(r"^/")
+    body = serializers.JSONField(required=False)
+    headers = serializers.DictField(
+        child=serializers.CharField(), required=False
+    )
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+    atomic = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f"At most {settings.BATCH_MAX_REQUESTS} requests are allowed"
+            )
+        return value
+
+
+def _sub_request(request, entry: dict) -> WSGIRequest:
+    path, _, query = entry["path"].partition("?")
+    body = b""
+    if "body" in entry:
+        body = json.dumps(entry["body"]).encode()
+    environ = {
+        key: value
+        for key, value in request.META.items()
+        if not key.startswith(("HTTP_", "wsgi.", "CONTENT_"))
+        or key in SHARED_HEADERS
+    }
+    environ.update(
+        {
+            f"HTTP_{name.upper().replace('-', '_')}": value
+            for name, value in entry.get("headers", {}).items()
+        }
+    )
+    environ.update(
+        {
+            "REQUEST_METHOD": entry["method"],
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": BytesIO(body),
+            "wsgi.url_scheme": request.META.get("wsgi.url_scheme", "http"),
+        }
+    )
+    sub_request = WSGIRequest(environ)
+    # Reuse the user DRF already authenticated for the batch request.
+    if request.user.is_authenticated:
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+    return sub_request
+
+
+def _error(status_code: int, detail: str) -> dict:
+    return {"status": status_code, "body": {"detail": detail}}
+
+
+def dispatch(request, entry: dict) -> dict:
+    """Run one sub-request through its view and return the result.
+
+    Only synchronous API views are dispatched. Errors raised by the view
+    become a 500 result for this entry alone; the view runs in a savepoint
+    so a failed query does not break an atomic batch's transaction.
+    """
+    try:
+        match = resolve(entry["path"].partition("?")[0])
+    except Resolver404:
+        return _error(status.HTTP_404_NOT_FOUND, "Not found.")
+    view_class = getattr(match.func, "cls", None)
+    if view_class is BatchView:
+        return _error(
+            status.HTTP_400_BAD_REQUEST, "Batch requests cannot be nested."
+        )
+    if not (
+        isinstance(view_class, type)
+        and issubclass(view_class, APIView)
+        and not iscoroutinefunction(match.func)
+    ):
+        return _error(
+            status.HTTP_400_BAD_REQUEST, "Only API endpoints can be batched."
+        )
+    try:
+        with transaction.atomic():
+            response = match.func(
+                _sub_request(request, entry), *match.args, **match.kwargs
+            )
+    except Exception:
+        logger.exception("Batched request to %s failed", entry["path"])
+        return _error(
+            status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error."
+        )
+    if response.streaming:
+        return _error(
+            status.HTTP_400_BAD_REQUEST,
+            "Streaming responses cannot be batched.",
+        )
+    result = {"status": response.status_code}
+    if "Location" in response:
+        result["headers"] = {"Location": response["Location"]}
+    if hasattr(response, "data"):
+        result["body"] = response.data
+    elif response.content:
+        result["body"] = response.content.decode()
+    return result
+
+
+class BatchView(APIView):
+    """Run a list of API requests in order within a single HTTP call.
+
+    Sub-requests go straight to the matching views, skipping middleware and
+    reusing the user authenticated for the batch. With ``atomic`` every
+    sub-request runs in one transaction that is rolled back, and the
+    remaining requests skipped, as soon as one of them fails.
+    """
+
+    permission_classes = (AllowAny,)
+
+    @extend_schema(request=BatchRequestSerializer)
+    def post(self, request):
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        entries = serializer.validated_data["requests"]
+        if not serializer.validated_data["atomic"]:
+            return Response(
+                {"responses": [dispatch(request, entry) for entry in entries]}
+            )
+        responses = []
+        with transaction.atomic():
+            for entry in entries:
+                responses.append(dispatch(request, entry))
+                if responses[-1]["status"] >= 400:
+                    transaction.set_rollback(True)
+                    break
+        return Response(
+            {
+                "responses": responses,
+                "committed": responses[-1]["status"] < 400,
+            }
+        )
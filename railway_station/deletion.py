@@ -0,0 +1,121 @@
+from typing import Callable
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+
+from railway_station.models import Journey, Route, Station, Ticket, Train
+from railway_station.seat_map import invalidate_seat_maps
+from railway_station.signals import send_seats_changed
+from railway_station.sync import record_deletions
+
+DEFAULT_BATCH_SIZE = 100
+
+Progress = Callable[[str, int], None]
+
+
+def _noop_progress(label: str, deleted: int) -> None:
+    pass
+
+
+def delete_journeys(
+    journeys: QuerySet,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Progress = _noop_progress,
+    max_batches: int | None = None,
+) -> dict[str, int]:
+    """Delete journeys with their tickets and crew rows.
+
+    Journeys are processed `batch_size` at a time; tickets and crew rows of
+    each batch are removed with one set-based DELETE each, so every
+    transaction stays short. Only the seats of the tickets are read, to
+    announce them as released. With `max_batches` it stops after that many
+    batches; each one is committed, so a later call picks up the rest.
+    """
+    deleted = {"tickets": 0, "crews": 0, "journeys": 0}
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(journeys.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            break
+        batches += 1
+        with transaction.atomic():
+            tickets = Ticket.objects.filter(journey_id__in=ids)
+            send_seats_changed(
+                released=tickets.values_list(
+                    "journey_id", "cargo", "seat", named=True
+                )
+            )
+            for label, queryset in (
+                ("tickets", tickets),
+                (
+                    "crews",
+                    Journey.crews.through.objects.filter(journey_id__in=ids),
+                ),
+                ("journeys", Journey.objects.filter(pk__in=ids)),
+            ):
+                count, _ = queryset.delete()
+                deleted[label] += count
+            record_deletions(Journey, ids)
+        invalidate_seat_maps(ids)
+        progress("tickets", deleted["tickets"])
+        progress("journeys", deleted["journeys"])
+    return deleted
+
+
+def _journeys_left(journeys: QuerySet, max_batches: int | None) -> bool:
+    return max_batches is not None and journeys.exists()
+
+
+def delete_route(
+    route: Route,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Progress = _noop_progress,
+    max_batches: int | None = None,
+) -> dict[str, int]:
+    journeys = Journey.objects.filter(route=route)
+    deleted = delete_journeys(journeys, batch_size, progress, max_batches)
+    if _journeys_left(journeys, max_batches):
+        return deleted
+    route.delete()
+    deleted["routes"] = 1
+    return deleted
+
+
+def delete_train(
+    train: Train,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Progress = _noop_progress,
+    max_batches: int | None = None,
+) -> dict[str, int]:
+    journeys = Journey.objects.filter(train=train)
+    deleted = delete_journeys(journeys, batch_size, progress, max_batches)
+    if _journeys_left(journeys, max_batches):
+        return deleted
+    train.delete()
+    deleted["trains"] = 1
+    return deleted
+
+
+def delete_station(
+    station: Station,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Progress = _noop_progress,
+    max_batches: int | None = None,
+) -> dict[str, int]:
+    """Delete `station` with its routes and their journeys.
+
+    Like the route and train variants, the station is kept when
+    `max_batches` ran out before all journeys were deleted.
+    """
+    routes = Route.objects.filter(
+        Q(source=station) | Q(destination=station)
+    )
+    journeys = Journey.objects.filter(route__in=routes.values("pk"))
+    deleted = delete_journeys(journeys, batch_size, progress, max_batches)
+    if _journeys_left(journeys, max_batches):
+        return deleted
+    with transaction.atomic():
+        deleted["routes"], _ = routes.delete()
+        station.delete()
+    deleted["stations"] = 1
+    return deleted
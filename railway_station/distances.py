@@ -0,0 +1,285 @@
+import fcntl
+import os
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_save
+)
+from django.dispatch import receiver
+
+from railway_station.models import Route, Station
+
+VERSION_CACHE_KEY = "railway_station:distance_matrix_version"
+ROUTE_FIELDS = ("source_id", "destination_id", "distance")
+UNREACHABLE = np.float32(np.inf)
+
+
+def floyd_warshall(distances: np.ndarray) -> np.ndarray:
+    """All-pairs shortest distances, relaxing one whole row per step."""
+    for k in range(len(distances)):
+        np.minimum(
+            distances,
+            distances[:, k, None] + distances[k, None, :],
+            out=distances,
+        )
+    return distances
+
+
+@dataclass
+class DistanceMatrix:
+    """Shortest network distances between stations, in route kilometres.
+
+    ``distances[i, j]`` is the distance from ``station_ids[i]`` to
+    ``station_ids[j]`` along directed routes, ``inf`` when unreachable.
+    """
+
+    station_ids: np.ndarray
+    distances: np.ndarray
+    version: str = field(default_factory=lambda: uuid.uuid4().hex)
+    index: dict[int, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.index = {
+            int(pk): position for position, pk in enumerate(self.station_ids)
+        }
+
+    @classmethod
+    def build(cls, station_ids, edges) -> "DistanceMatrix":
+        station_ids = np.array(sorted(station_ids), dtype=np.int64)
+        position = {int(pk): n for n, pk in enumerate(station_ids)}
+        distances = np.full(
+            (len(station_ids), len(station_ids)), UNREACHABLE, np.float32
+        )
+        np.fill_diagonal(distances, 0)
+        for source, destination, distance in edges:
+            i, j = position[source], position[destination]
+            distances[i, j] = min(distances[i, j], distance)
+        return cls(station_ids, floyd_warshall(distances))
+
+    @classmethod
+    def from_database(cls) -> "DistanceMatrix":
+        return cls.build(
+            Station.objects.values_list("pk", flat=True),
+            Route.objects.values_list(
+                "source_id", "destination_id", "distance"
+            ),
+        )
+
+    def distance(self, source: int, destination: int) -> float | None:
+        i, j = self.index.get(source), self.index.get(destination)
+        if i is None or j is None or self.distances[i, j] == UNREACHABLE:
+            return None
+        return float(self.distances[i, j])
+
+    def is_tight(self, source: int, destination: int, distance) -> bool:
+        """Whether a route of `distance` may lie on some shortest path.
+
+        Dropping or lengthening a route that is not tight changes nothing.
+        """
+        current = self.distance(source, destination)
+        return current is not None and current >= distance
+
+    def _position(self, pk: int) -> int:
+        if pk not in self.index:
+            size = len(self.station_ids)
+            self.distances = np.pad(
+                self.distances, ((0, 1), (0, 1)), constant_values=UNREACHABLE
+            )
+            self.distances[size, size] = 0
+            self.station_ids = np.append(self.station_ids, pk)
+            self.index[pk] = size
+        return self.index[pk]
+
+    def add_route(self, source: int, destination: int, distance) -> None:
+        """Account for a new or shortened route in O(n^2)."""
+        i, j = self._position(source), self._position(destination)
+        np.minimum(
+            self.distances,
+            self.distances[:, i, None] + distance + self.distances[j, None, :],
+            out=self.distances,
+        )
+
+    def save(self, path: Path) -> None:
+        """Write atomically, so other processes never load a partial file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=path.parent, suffix=".npz")
+        with os.fdopen(fd, "wb") as file:
+            np.savez(
+                file,
+                station_ids=self.station_ids,
+                distances=self.distances,
+                version=np.array(self.version),
+            )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "DistanceMatrix | None":
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            return cls(
+                data["station_ids"], data["distances"], str(data["version"])
+            )
+
+
+_lock = threading.Lock()
+_state = {"version": None, "matrix": None}
+_pending = threading.local()
+
+
+def _matrix_file() -> Path:
+    return Path(settings.DISTANCE_MATRIX_FILE)
+
+
+@contextmanager
+def _file_lock():
+    """Serialize matrix updates of every process sharing the file.
+
+    Updates start from the last published file, so concurrent workers
+    never overwrite each other's changes.
+    """
+    path = _matrix_file().with_suffix(".lock")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        yield
+
+
+def _publish(matrix: DistanceMatrix) -> DistanceMatrix:
+    matrix.save(_matrix_file())
+    cache.set(VERSION_CACHE_KEY, matrix.version, timeout=None)
+    with _lock:
+        _state.update(version=matrix.version, matrix=matrix)
+    return matrix
+
+
+def rebuild_distance_matrix() -> DistanceMatrix:
+    with _file_lock():
+        return _publish(DistanceMatrix.from_database())
+
+
+def get_distance_matrix() -> DistanceMatrix:
+    """Return the process-wide matrix, reloaded when a new one is published.
+
+    A missing file is computed from the database once and written out, so
+    restarts only pay for loading the array.
+    """
+    version = cache.get(VERSION_CACHE_KEY)
+    with _lock:
+        matrix = _state["matrix"]
+        if matrix is not None and version in (None, _state["version"]):
+            return matrix
+    matrix = DistanceMatrix.load(_matrix_file())
+    if matrix is None:
+        with _file_lock():
+            matrix = DistanceMatrix.load(_matrix_file())
+            if matrix is None:
+                return _publish(DistanceMatrix.from_database())
+    with _lock:
+        _state.update(version=matrix.version, matrix=matrix)
+    return matrix
+
+
+def apply_route_changes(changes) -> None:
+    """Fold committed route changes into the matrix.
+
+    `changes` are ``(old, pk)`` pairs: the route's previous endpoints and
+    distance (``None`` for new routes) and its primary key. New and
+    shortened routes are relaxed in; removing or lengthening a route that
+    may carry a shortest path triggers a full rebuild.
+    """
+    current = {
+        pk: (source, destination, distance)
+        for pk, source, destination, distance in Route.objects.filter(
+            pk__in=[pk for _, pk in changes]
+        ).values_list("pk", *ROUTE_FIELDS)
+    }
+    with _file_lock():
+        matrix = DistanceMatrix.load(_matrix_file())
+        if matrix is None:
+            _publish(DistanceMatrix.from_database())
+            return
+        for old, pk in changes:
+            new = current.get(pk)
+            if old is None or not matrix.is_tight(*old):
+                continue
+            if new is None or new[:2] != old[:2] or new[2] > old[2]:
+                _publish(DistanceMatrix.from_database())
+                return
+        for route in current.values():
+            matrix.add_route(*route)
+        matrix.version = uuid.uuid4().hex
+        _publish(matrix)
+
+
+def _flush() -> None:
+    changes, _pending.changes = _pending.changes, []
+    if changes:
+        apply_route_changes(changes)
+
+
+def _record(old, pk) -> None:
+    # Changes are collected per thread and folded in by the first commit
+    # callback; rolled back ones are recognized by their database state.
+    if not hasattr(_pending, "changes"):
+        _pending.changes = []
+    _pending.changes.append((old, pk))
+    transaction.on_commit(_flush)
+
+
+def _loaded_state(instance: Route) -> tuple | None:
+    # Read from __dict__ so deferred fields are not fetched one by one.
+    values = instance.__dict__
+    if not all(name in values for name in ROUTE_FIELDS):
+        return None
+    return tuple(values[name] for name in ROUTE_FIELDS)
+
+
+@receiver(post_init, sender=Route)
+def snapshot_route(sender, instance, **kwargs):
+    if instance.pk is not None:
+        instance._distance_matrix_old = _loaded_state(instance)
+
+
+@receiver(pre_save, sender=Route)
+def remember_route(sender, instance, **kwargs):
+    # Routes loaded from the database keep the values they were read with;
+    # only unsaved instances given a primary key and routes loaded with
+    # deferred fields are read back.
+    if instance.pk is None:
+        instance._distance_matrix_old = None
+    elif (
+        instance._state.adding
+        or getattr(instance, "_distance_matrix_old", None) is None
+    ):
+        instance._distance_matrix_old = (
+            Route.objects.filter(pk=instance.pk)
+            .values_list(*ROUTE_FIELDS)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Route)
+def route_saved(sender, instance, **kwargs):
+    _record(getattr(instance, "_distance_matrix_old", None), instance.pk)
+    instance._distance_matrix_old = _loaded_state(instance)
+
+
+@receiver(post_delete, sender=Route)
+def route_deleted(sender, instance, **kwargs):
+    _record(
+        (instance.source_id, instance.destination_id, instance.distance),
+        instance.pk,
+    )
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+from collections import defaultdict
+from functools import cache
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from railway_station.signals import seats_changed
+
+
+class SeatEventBackend:
+    """Fan-out of seat events to the watchers of a journey.
+
+    Backends for multi-worker setups deliver events published by any
+    process to the local subscribers, e.g. through a message broker.
+    """
+
+    def publish(self, journey_id: int, event: dict) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, journey_id: int) -> asyncio.Queue:
+        raise NotImplementedError
+
+    def unsubscribe(self, journey_id: int, queue: asyncio.Queue) -> None:
+        raise NotImplementedError
+
+
+class LocalSeatEventBackend(SeatEventBackend):
+    """In-process pub/sub, only reaches watchers of the same process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(dict)
+
+    def publish(self, journey_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(journey_id, {}).items())
+        for queue, loop in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    def subscribe(self, journey_id):
+        queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers[journey_id][queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, journey_id, queue):
+        with self._lock:
+            subscribers = self._subscribers.get(journey_id, {})
+            subscribers.pop(queue, None)
+            if not subscribers:
+                self._subscribers.pop(journey_id, None)
+
+
+@cache
+def get_backend() -> SeatEventBackend:
+    return import_string(settings.SEAT_EVENTS_BACKEND)()
+
+
+@receiver(seats_changed)
+def publish_seats_changed(sender, journey_id, taken, released, **kwargs):
+    get_backend().publish(
+        journey_id,
+        {"journey": journey_id, "taken": taken, "released": released},
+    )
@@ -0,0 +1,40 @@
+from django.apps import apps
+from django.db import IntegrityError
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler as drf_exception_handler
+from rest_framework.views import set_rollback
+
+
+def _constraint_columns(model, constraint):
+    table = model._meta.db_table
+    return [
+        f"{table}.{model._meta.get_field(field).column}"
+        for field in getattr(constraint, "fields", ())
+    ]
+
+
+def constraint_violation_message(exc: IntegrityError) -> str | None:
+    """Return the message of the model constraint violated by `exc`."""
+    error = str(exc)
+    for model in apps.get_app_config("railway_station").get_models():
+        for constraint in model._meta.constraints:
+            columns = _constraint_columns(model, constraint)
+            if constraint.name in error or (
+                columns and all(column in error for column in columns)
+            ):
+                return constraint.get_violation_error_message()
+    return None
+
+
+def exception_handler(exc, context):
+    if isinstance(exc, IntegrityError):
+        message = constraint_violation_message(exc)
+        if message is not None:
+            set_rollback()
+            return Response(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+    return drf_exception_handler(exc, context)
@@ -0,0 +1,78 @@
+import hashlib
+import json
+
+from django.db import transaction
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from railway_station.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(request) -> str:
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(
+        f"{request.method} {request.path}\n{body}".encode()
+    ).hexdigest()
+
+
+class IdempotentCreateMixin:
+    """Replay the stored response of a create repeated with the same key.
+
+    The key row is inserted in the same transaction as the created objects,
+    so a concurrent duplicate blocks on the unique index until the first
+    request finishes and then reads its stored response. Failed requests
+    roll the key back and can be retried.
+    """
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                IDEMPOTENCY_HEADER,
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.HEADER,
+                description="Unique key to safely retry the request",
+            )
+        ]
+    )
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > IdempotencyKey._meta.get_field("key").max_length:
+            raise ValidationError({IDEMPOTENCY_HEADER: "Key is too long"})
+
+        fingerprint = request_fingerprint(request)
+        with transaction.atomic():
+            record, created = (
+                IdempotencyKey.objects.select_for_update().get_or_create(
+                    user=request.user,
+                    key=key,
+                    defaults={"fingerprint": fingerprint},
+                )
+            )
+            if record.fingerprint != fingerprint:
+                return Response(
+                    {
+                        "detail": f"{IDEMPOTENCY_HEADER} was already used "
+                        f"for a different request"
+                    },
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            if not created:
+                return Response(
+                    record.response,
+                    status=record.status_code,
+                    headers={REPLAYED_HEADER: "true"},
+                )
+
+            response = super().create(request, *args, **kwargs)
+            record.status_code = response.status_code
+            record.response = response.data
+            record.save(update_fields=["status_code", "response"])
+        return response
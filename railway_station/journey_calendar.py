@@ -0,0 +1,107 @@
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    Min,
+    OuterRef,
+    Subquery,
+    Value
+)
+from django.db.models.functions import Coalesce, TruncDate
+from django.dispatch import receiver
+from django.utils import timezone
+
+from railway_station.models import Journey, Ticket
+from railway_station.signals import seats_changed
+
+CACHE_KEY = "railway_station:journey_calendar:{}:{}:{:%Y-%m}"
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    """Aware datetimes of the first moments of `month` and the next one."""
+    first = month.replace(day=1)
+    following = (
+        first.replace(year=first.year + 1, month=1)
+        if first.month == 12
+        else first.replace(month=first.month + 1)
+    )
+    return tuple(
+        timezone.make_aware(datetime.combine(day, time.min))
+        for day in (first, following)
+    )
+
+
+def build_calendar(source: int, destination: int, month: date) -> list:
+    """Journey count and minimum free places per day, in one query."""
+    start, end = month_bounds(month)
+    sold = (
+        Ticket.objects.filter(journey=OuterRef("pk"))
+        .values("journey")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    days = (
+        Journey.objects.filter(
+            route__source=source,
+            route__destination=destination,
+            departure_time__gte=start,
+            departure_time__lt=end,
+        )
+        .annotate(
+            day=TruncDate("departure_time", tzinfo=start.tzinfo),
+            sold=Coalesce(
+                Subquery(sold, output_field=IntegerField()), Value(0)
+            ),
+        )
+        .values("day")
+        .annotate(
+            journeys=Count("pk"),
+            min_available=Min(
+                F("train__cargo_num") * F("train__places_in_cargo")
+                - F("sold")
+            ),
+        )
+        .order_by("day")
+    )
+    return [
+        {
+            "date": row["day"],
+            "journeys": row["journeys"],
+            "min_available": row["min_available"],
+        }
+        for row in days
+    ]
+
+
+def get_calendar(source: int, destination: int, month: date) -> list:
+    key = CACHE_KEY.format(source, destination, month)
+    days = cache.get(key)
+    if days is None:
+        days = build_calendar(source, destination, month)
+        cache.set(
+            key, days, timeout=settings.JOURNEY_CALENDAR_CACHE_TIMEOUT
+        )
+    return days
+
+
+def invalidate_calendars(journeys) -> None:
+    """Drop cached calendars of the route and month of every journey."""
+    cache.delete_many(
+        {
+            CACHE_KEY.format(
+                source, destination, timezone.localtime(departure)
+            )
+            for source, destination, departure in journeys.values_list(
+                "route__source", "route__destination", "departure_time"
+            )
+        }
+    )
+
+
+@receiver(seats_changed)
+def invalidate_journey_calendar(sender, journey_id, **kwargs):
+    invalidate_calendars(Journey.objects.filter(pk=journey_id))
@@ -0,0 +1,45 @@
+import json
+import logging
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Iterator
+
+
+def rotating_logger(
+    name: str, path, max_bytes: int, backups: int
+) -> logging.Logger:
+    """Logger `name` writing bare messages to `path`, one per line.
+
+    The file is rotated at `max_bytes`, keeping `backups` old copies.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backups
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers = [handler]
+    return logger
+
+
+def read_rotated(path, backups: int) -> Iterator[dict]:
+    """JSON lines of `path` and its rotated copies, oldest file first.
+
+    Lines that are not valid JSON, e.g. cut short by a crash, are skipped.
+    """
+    path = Path(path)
+    files = [
+        path.with_name(f"{path.name}.{n}") for n in range(backups, 0, -1)
+    ] + [path]
+    for file in files:
+        if not file.exists():
+            continue
+        with file.open() as lines:
+            for line in lines:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from railway_station.archive import DEFAULT_BATCH_SIZE, archive_journeys
+
+
+class Command(BaseCommand):
+    help = (  # noqa
+        "Move journeys completed before the given date, their tickets and "
+        "finished orders into the archive tables"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before", required=True, help="Date in YYYY-MM-DD format"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=DEFAULT_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        try:
+            before = timezone.make_aware(
+                datetime.strptime(options["before"], "%Y-%m-%d")
+            )
+        except ValueError:
+            raise CommandError("--before must be in YYYY-MM-DD format")
+
+        def progress(archived):
+            self.stdout.write(
+                ", ".join(f"{label}: {n}" for label, n in archived.items())
+            )
+
+        archived = archive_journeys(before, options["batch_size"], progress)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {archived['journeys']} journeys, "
+                f"{archived['tickets']} tickets and "
+                f"{archived['orders']} orders"
+            )
+        )
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from railway_station.distances import rebuild_distance_matrix
+
+
+class Command(BaseCommand):
+    help = "Recompute the station-to-station distance matrix from routes"  # noqa
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        matrix = rebuild_distance_matrix()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built distances between {len(matrix.station_ids)} stations "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+        )
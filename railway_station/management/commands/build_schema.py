@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from railway_station.schema import build_schema_artifacts
+
+
+class Command(BaseCommand):
+    help = "Pre-build the OpenAPI schema served at /api/v1/schema/"  # noqa
+
+    def handle(self, *args, **options):
+        directory = Path(settings.SCHEMA_ARTIFACT_DIR)
+        manifest = build_schema_artifacts(directory)
+        for schema_format, artifact in manifest.items():
+            self.stdout.write(
+                f"{schema_format}: {directory / artifact['file']}"
+            )
+        self.stdout.write(self.style.SUCCESS("Schema artifacts built"))
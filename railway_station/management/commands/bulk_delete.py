@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from railway_station.deletion import (
+    DEFAULT_BATCH_SIZE,
+    delete_route,
+    delete_station,
+    delete_train
+)
+from railway_station.models import Route, Station, Train
+
+TARGETS = {
+    "station": (Station, delete_station),
+    "route": (Route, delete_route),
+    "train": (Train, delete_train),
+}
+
+
+class Command(BaseCommand):
+    help = (  # noqa
+        "Delete a station, route or train with all dependent journeys "
+        "and tickets using chunked set-based deletes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", choices=sorted(TARGETS))
+        parser.add_argument("id", type=int)
+        parser.add_argument(
+            "--batch-size", type=int, default=DEFAULT_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        model, delete = TARGETS[options["model"]]
+        try:
+            instance = model.objects.get(pk=options["id"])
+        except model.DoesNotExist:
+            raise CommandError(
+                f"{options['model']} {options['id']} does not exist"
+            )
+
+        def progress(label, deleted):
+            self.stdout.write(f"{label}: {deleted} deleted")
+
+        deleted = delete(instance, options["batch_size"], progress)
+        self.stdout.write(
+            self.style.SUCCESS(
+                ", ".join(f"{label}: {n}" for label, n in deleted.items())
+            )
+        )
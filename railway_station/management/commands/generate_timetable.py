@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from railway_station.models import TimetableRule
+from railway_station.timetable import generate_journeys
+
+
+class Command(BaseCommand):
+    help = "Generate journeys from timetable rules"  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rule",
+            type=int,
+            action="append",
+            dest="rules",
+            help="Timetable rule id, all rules by default",
+        )
+
+    def handle(self, *args, **options):
+        rules = TimetableRule.objects.all()
+        if options["rules"]:
+            rules = rules.filter(pk__in=options["rules"])
+
+        total = 0
+        for rule in rules:
+            result = generate_journeys(rule)
+            total += result["created"]
+            self.stdout.write(
+                f"{rule}: {result['created']} journeys created, "
+                f"{result['conflicts']} skipped because of conflicts"
+            )
+        self.stdout.write(self.style.SUCCESS(f"{total} journeys created"))
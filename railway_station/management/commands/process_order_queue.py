@@ -0,0 +1,57 @@
+from multiprocessing import Process
+from time import sleep
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from railway_station.order_queue import process_batch
+
+
+class Command(BaseCommand):
+    help = "Create queued orders"  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=0.5,
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty",
+        )
+
+    def work(self, batch_size, poll_interval, once):
+        while True:
+            processed = process_batch(batch_size)
+            if processed:
+                self.stdout.write(f"{processed} order jobs processed")
+            elif once:
+                return
+            else:
+                sleep(poll_interval)
+
+    def handle(self, *args, **options):
+        arguments = (
+            options["batch_size"],
+            options["poll_interval"],
+            options["once"],
+        )
+        if options["workers"] == 1:
+            self.work(*arguments)
+            return
+
+        # Each worker process must open its own database connection.
+        connections.close_all()
+        workers = [
+            Process(target=self.work, args=arguments)
+            for _ in range(options["workers"])
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
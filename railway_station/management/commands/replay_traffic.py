@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from railway_station.traffic import (
+    HttpSender,
+    compare,
+    obtain_token,
+    read_capture,
+    replay,
+    summarize
+)
+
+
+class Command(BaseCommand):
+    help = (  # noqa
+        "Replay captured traffic against a running instance and report "
+        "latency per endpoint, optionally compared with an earlier run"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=str(settings.TRAFFIC_CAPTURE_FILE),
+            help="Capture file; its rotated copies are read as well",
+        )
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--speedup", type=float, default=1.0)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--limit", type=int)
+        parser.add_argument(
+            "--user",
+            action="append",
+            default=[],
+            metavar="EMAIL:PASSWORD",
+            help="Account to replay authenticated requests with; repeat "
+            "to spread user buckets over several accounts",
+        )
+        parser.add_argument("--output", help="Write the run summary here")
+        parser.add_argument(
+            "--baseline", help="Summary of an earlier run to compare with"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Latency growth counted as a regression, as a fraction",
+        )
+
+    def handle(self, *args, **options):
+        if options["speedup"] <= 0 or options["concurrency"] < 1:
+            raise CommandError("speedup and concurrency must be positive")
+        records = read_capture(Path(options["file"]))
+        if options["limit"]:
+            records = records[: options["limit"]]
+        if not records:
+            raise CommandError(f"no captured requests in {options['file']}")
+        tokens = []
+        for user in options["user"]:
+            email, _, password = user.partition(":")
+            tokens.append(obtain_token(options["base_url"], email, password))
+
+        summary = summarize(
+            replay(
+                records,
+                HttpSender(options["base_url"], tokens),
+                options["speedup"],
+                options["concurrency"],
+            )
+        )
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(summary, indent=2))
+        for endpoint, row in summary.items():
+            self.stdout.write(
+                f"{endpoint}  {row['requests']} requests, "
+                f"{row['errors']} errors, p50 {row['p50_ms']} ms, "
+                f"p99 {row['p99_ms']} ms"
+            )
+        if not options["baseline"]:
+            return
+
+        baseline = json.loads(Path(options["baseline"]).read_text())
+        rows = compare(baseline, summary, options["threshold"])
+        for row in rows:
+            style = (
+                self.style.ERROR if row["regressed"] else self.style.SUCCESS
+            )
+            self.stdout.write(
+                style(
+                    f"{row['endpoint']}  p50 {row['p50_change']:+.0%}, "
+                    f"p99 {row['p99_change']:+.0%}"
+                )
+            )
+        regressed = sum(row["regressed"] for row in rows)
+        if regressed:
+            raise CommandError(f"{regressed} endpoints regressed")
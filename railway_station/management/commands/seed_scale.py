@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from railway_station.seeding import SEED_PASSWORD, seed
+
+VOLUMES = {
+    "stations": 500,
+    "routes": 3000,
+    "trains": 300,
+    "journeys": 50_000,
+    "users": 10_000,
+    "orders": 100_000,
+}
+
+
+class Command(BaseCommand):
+    help = (  # noqa
+        "Bulk-generate synthetic stations, routes, trains, journeys, users, "
+        "orders and tickets with skewed popularity for load testing"
+    )
+
+    def add_arguments(self, parser):
+        for name, default in VOLUMES.items():
+            parser.add_argument(f"--{name}", type=int, default=default)
+        parser.add_argument("--max-tickets", type=int, default=4)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if any(options[name] < 1 for name in VOLUMES):
+            raise CommandError("all volumes must be positive")
+        if options["stations"] < 2:
+            raise CommandError("routes need at least two stations")
+
+        def progress(label, created):
+            self.stdout.write(f"{label}: {created} created")
+
+        created = seed(
+            **{name: options[name] for name in VOLUMES},
+            max_tickets=options["max_tickets"],
+            rng_seed=options["seed"],
+            progress=progress,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                ", ".join(f"{label}: {n}" for label, n in created.items())
+                + f" (user password: {SEED_PASSWORD!r})"
+            )
+        )
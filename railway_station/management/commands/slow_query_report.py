@@ -0,0 +1,79 @@
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from railway_station.jsonl import read_rotated
+
+
+class Command(BaseCommand):
+    help = "Summarize the slow-query log by fingerprint, worst first"  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=str(settings.SLOW_QUERY_LOG_FILE),
+            help="Log file; its rotated copies are read as well",
+        )
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument(
+            "--sort", choices=["total", "count", "max"], default="total"
+        )
+        parser.add_argument("--json", action="store_true")
+
+    def handle(self, *args, **options):
+        queries = defaultdict(
+            lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        entries = read_rotated(
+            options["file"], settings.SLOW_QUERY_LOG_BACKUPS
+        )
+        for entry in entries:
+            query = queries[entry["fingerprint"]]
+            query["count"] += 1
+            query["total_ms"] += entry["duration_ms"]
+            query["max_ms"] = max(query["max_ms"], entry["duration_ms"])
+            query.setdefault("origins", set()).add(entry["origin"])
+            # Keep the plan of the slowest occurrence.
+            if query["max_ms"] == entry["duration_ms"]:
+                query["sql"] = entry["sql"]
+                query["plan"] = entry["plan"]
+
+        key = {"total": "total_ms", "count": "count", "max": "max_ms"}
+        top = sorted(
+            queries.items(),
+            key=lambda item: item[1][key[options["sort"]]],
+            reverse=True,
+        )[: options["top"]]
+        summary = [
+            {
+                "fingerprint": fingerprint,
+                "count": query["count"],
+                "total_ms": round(query["total_ms"], 3),
+                "mean_ms": round(query["total_ms"] / query["count"], 3),
+                "max_ms": query["max_ms"],
+                "origins": sorted(query["origins"]),
+                "sql": query["sql"],
+                "plan": query["plan"],
+            }
+            for fingerprint, query in top
+        ]
+        if options["json"]:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+        if not summary:
+            self.stdout.write(self.style.SUCCESS("No slow queries logged"))
+        for query in summary:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{query['fingerprint']}  {query['count']} calls, "
+                    f"total {query['total_ms']} ms, "
+                    f"mean {query['mean_ms']} ms, max {query['max_ms']} ms"
+                )
+            )
+            self.stdout.write(f"  {query['sql']}")
+            for origin in query["origins"]:
+                self.stdout.write(f"  from {origin}")
+            for line in query["plan"] or ():
+                self.stdout.write(f"    {line}")
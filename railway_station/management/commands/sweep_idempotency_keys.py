@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from railway_station.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency keys older than IDEMPOTENCY_KEY_TTL"  # noqa
+
+    def handle(self, *args, **options):
+        deleted, _ = IdempotencyKey.objects.filter(
+            created_at__lt=timezone.now() - settings.IDEMPOTENCY_KEY_TTL
+        ).delete()
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} idempotency keys deleted")
+        )
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from railway_station.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Delete sync tombstones older than SYNC_TOMBSTONE_TTL"  # noqa
+
+    def handle(self, *args, **options):
+        deleted, _ = Tombstone.objects.filter(
+            deleted_at__lt=timezone.now() - settings.SYNC_TOMBSTONE_TTL
+        ).delete()
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} tombstones deleted")
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from railway_station.analytics import update_rollups
+
+
+class Command(BaseCommand):
+    help = "Add orders created since the last run to the analytics rollups"  # noqa
+
+    def handle(self, *args, **options):
+        added = update_rollups()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rolled up {added['orders']} orders and "
+                f"{added['tickets']} tickets"
+            )
+        )
@@ -0,0 +1,184 @@
+import os
+import resource
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connection, transaction
+from django.dispatch import receiver
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+from railway_station.signals import seats_changed
+
+# Memory is sampled at most this often per process.
+MEMORY_INTERVAL = 10
+
+REQUEST_LATENCY = Histogram(
+    "railway_request_duration_seconds",
+    "Time spent handling a request.",
+    ["view", "action", "method", "status"],
+)
+DB_QUERIES = Histogram(
+    "railway_request_db_queries",
+    "Database queries made by a request.",
+    ["view", "action"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+DB_TIME = Histogram(
+    "railway_request_db_seconds",
+    "Time a request spent in database queries.",
+    ["view", "action"],
+)
+PAGINATION_OFFSET = Histogram(
+    "railway_pagination_offset",
+    "Offset requested from paginated list endpoints.",
+    ["view"],
+    buckets=(0, 10, 50, 100, 500, 1000, 5000, 10000, 50000),
+)
+ORDERS_CREATED = Counter(
+    "railway_orders_created", "Orders committed to the database."
+)
+TICKETS_CREATED = Counter(
+    "railway_tickets_created", "Tickets committed to the database."
+)
+SEAT_REJECTIONS = Counter(
+    "railway_seat_rejections",
+    "Tickets rejected because the seat was taken or does not exist.",
+    ["reason"],
+)
+PROCESS_MEMORY = Gauge(
+    "railway_process_resident_memory_bytes",
+    "Resident memory of the worker process.",
+    multiprocess_mode="all",
+)
+
+_memory_sampled_at = 0.0
+
+
+def record_order_created() -> None:
+    transaction.on_commit(ORDERS_CREATED.inc)
+
+
+def record_seat_rejection(reason: str) -> None:
+    SEAT_REJECTIONS.labels(reason).inc()
+
+
+@receiver(seats_changed)
+def count_tickets(sender, taken, **kwargs):
+    TICKETS_CREATED.inc(len(taken))
+
+
+def resident_memory() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak rather than current usage, in KiB on Linux.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def sample_memory() -> None:
+    global _memory_sampled_at
+    now = time.monotonic()
+    if now - _memory_sampled_at >= MEMORY_INTERVAL:
+        _memory_sampled_at = now
+        PROCESS_MEMORY.set(resident_memory())
+
+
+def view_labels(request) -> tuple[str, str]:
+    """(view, action) of the resolved view, bounded to known values."""
+    match = request.resolver_match
+    if match is None:
+        return "unresolved", ""
+    view = getattr(match.func, "cls", None)
+    if view is None:
+        return match.view_name or "unknown", request.method.lower()
+    actions = getattr(match.func, "actions", None) or {}
+    return view.__name__, actions.get(
+        request.method.lower(), request.method.lower()
+    )
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+class MetricsMiddleware:
+    """Observe latency, DB usage and pagination depth of every request.
+
+    Query statistics are only collected for synchronous views, whose
+    queries run on the thread handling the request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _observe(self, request, response, elapsed, queries=None):
+        view, action = view_labels(request)
+        REQUEST_LATENCY.labels(
+            view, action, request.method, f"{response.status_code // 100}xx"
+        ).observe(elapsed)
+        if queries is not None:
+            DB_QUERIES.labels(view, action).observe(queries.count)
+            DB_TIME.labels(view, action).observe(queries.seconds)
+        if action == "list":
+            offset = request.GET.get("offset", "0")
+            if offset.isdigit():
+                PAGINATION_OFFSET.labels(view).observe(int(offset))
+        sample_memory()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        queries = QueryStats()
+        start = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start, queries)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start)
+        return response
+
+
+def metrics_view(request):
+    """Metrics in the Prometheus text format.
+
+    With ``PROMETHEUS_MULTIPROC_DIR`` set the values of every worker
+    process sharing that directory are aggregated.
+    """
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return HttpResponse(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST
+    )
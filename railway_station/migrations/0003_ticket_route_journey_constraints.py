@@ -0,0 +1,49 @@
+# Generated by Django 5.1.4 on 2026-10-19 06:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway_station", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="journey",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("departure_time__lt", models.F("arrival_time"))
+                ),
+                name="journey_departure_before_arrival",
+                violation_error_message="departure time must be earlier than arrival time",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="route",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("source", models.F("destination")), _negated=True
+                ),
+                name="route_source_not_destination",
+                violation_error_message="source and destination routes cannot be the same",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="route",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("distance__gt", 0)),
+                name="route_distance_positive",
+                violation_error_message="distance must be greater than zero",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.UniqueConstraint(
+                fields=("journey", "cargo", "seat"),
+                name="unique_ticket_journey_cargo_seat",
+                violation_error_message="This place already taken",
+            ),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.1.4 on 2026-10-19 06:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway_station", "0003_ticket_route_journey_constraints"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedJourney",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("route_id", models.BigIntegerField(null=True)),
+                ("train_id", models.BigIntegerField(null=True)),
+                ("source", models.CharField(max_length=100)),
+                ("destination", models.CharField(max_length=100)),
+                ("train", models.CharField(max_length=100)),
+                ("cargo_num", models.IntegerField()),
+                ("places_in_cargo", models.IntegerField()),
+                ("departure_time", models.DateTimeField(db_index=True)),
+                ("arrival_time", models.DateTimeField()),
+                ("crews", models.JSONField(default=list)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("created_at", models.DateTimeField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_orders",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchivedTicket",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("cargo", models.IntegerField()),
+                ("seat", models.IntegerField()),
+                (
+                    "journey",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tickets",
+                        to="railway_station.archivedjourney",
+                    ),
+                ),
+                (
+                    "order",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="tickets",
+                        to="railway_station.archivedorder",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 5.1.4 on 2026-10-19 06:37
+
+import datetime
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway_station", "0004_journey_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimetableRule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "days_of_week",
+                    models.CharField(
+                        help_text="ISO weekdays the journey runs on, ex. 12345",
+                        max_length=7,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                "^[1-7]{1,7}$",
+                                "days of week must be ISO weekday numbers, ex. 12345",
+                            )
+                        ],
+                    ),
+                ),
+                ("departure_time", models.TimeField()),
+                ("duration", models.DurationField()),
+                ("valid_from", models.DateField()),
+                ("valid_until", models.DateField()),
+                (
+                    "crews",
+                    models.ManyToManyField(
+                        blank=True,
+                        related_name="timetable_rules",
+                        to="railway_station.crew",
+                    ),
+                ),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timetable_rules",
+                        to="railway_station.route",
+                    ),
+                ),
+                (
+                    "train",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timetable_rules",
+                        to="railway_station.train",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="journey",
+            name="timetable_rule",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="journeys",
+                to="railway_station.timetablerule",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="journey",
+            constraint=models.UniqueConstraint(
+                fields=("timetable_rule", "departure_time"),
+                name="unique_journey_timetable_rule_departure",
+                violation_error_message="journey for this timetable rule already exists",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="timetablerule",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("duration__gt", datetime.timedelta(0))),
+                name="timetable_rule_duration_positive",
+                violation_error_message="duration must be greater than zero",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="timetablerule",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("valid_from__lte", models.F("valid_until"))
+                ),
+                name="timetable_rule_valid_range",
+                violation_error_message="valid_from must not be later than valid_until",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-19 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway_station", "0005_timetable_rule"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["train", "departure_time"],
+                name="journey_train_departure_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["departure_time", "arrival_time"],
+                name="journey_departure_arrival_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-19 08:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("railway_station", "0011_order_job_claim"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="archivedticket",
+            name="order",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tickets",
+                to="railway_station.archivedorder",
+            ),
+        ),
+    ]
@@ -1,8 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models import F, Q
 
 
 class TrainType(models.Model):
@@ -19,6 +22,7 @@ class Train(models.Model):
     train_type = models.ForeignKey(
         TrainType, on_delete=models.CASCADE, related_name="trains"
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.name} ({self.train_type})"
@@ -40,6 +44,7 @@ class Station(models.Model):
     name = models.CharField(max_length=100, unique=True)
     latitude = models.FloatField()
     longitude = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.name
@@ -53,10 +58,30 @@ class Route(models.Model):
         Station, on_delete=models.CASCADE, related_name="destination_routes"
     )
     distance = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=~Q(source=F("destination")),
+                name="route_source_not_destination",
+                violation_error_message=(
+                    "source and destination routes cannot be the same"
+                ),
+            ),
+            models.CheckConstraint(
+                condition=Q(distance__gt=0),
+                name="route_distance_positive",
+                violation_error_message="distance must be greater than zero",
+            ),
+        ]
 
     @staticmethod
     def validate(
-        source: str, destination: str, distance: int, exception: Exception()
+        source: Station,
+        destination: Station,
+        distance: int,
+        exception: Exception(),
     ) -> None:
         if source == destination:
             raise exception("source and destination routes cannot be the same")
@@ -66,8 +91,8 @@ class Route(models.Model):
     def clean(self):
         super().clean()
         self.validate(
-            self.source.name,
-            self.destination.name,
+            self.source_id,
+            self.destination_id,
             self.distance,
             ValidationError,
         )
@@ -79,13 +104,70 @@ class Route(models.Model):
         using=None,
         update_fields=None,
     ):
-        self.full_clean()
+        if settings.VALIDATE_MODELS_ON_SAVE:
+            self.full_clean()
         return super().save(force_insert, force_update, using, update_fields)
 
     def __str__(self):
         return f"{self.source.name} - {self.destination.name}"
 
 
+class TimetableRule(models.Model):
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="timetable_rules"
+    )
+    train = models.ForeignKey(
+        Train, on_delete=models.CASCADE, related_name="timetable_rules"
+    )
+    crews = models.ManyToManyField(
+        Crew, related_name="timetable_rules", blank=True
+    )
+    days_of_week = models.CharField(
+        max_length=7,
+        validators=[
+            RegexValidator(
+                r"^[1-7]{1,7}$",
+                "days of week must be ISO weekday numbers, ex. 12345",
+            )
+        ],
+        help_text="ISO weekdays the journey runs on, ex. 12345",
+    )
+    departure_time = models.TimeField()
+    duration = models.DurationField()
+    valid_from = models.DateField()
+    valid_until = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(duration__gt=timedelta(0)),
+                name="timetable_rule_duration_positive",
+                violation_error_message="duration must be greater than zero",
+            ),
+            models.CheckConstraint(
+                condition=Q(valid_from__lte=F("valid_until")),
+                name="timetable_rule_valid_range",
+                violation_error_message=(
+                    "valid_from must not be later than valid_until"
+                ),
+            ),
+        ]
+
+    @staticmethod
+    def validate(valid_from, valid_until, duration, exception) -> None:
+        if duration <= timedelta(0):
+            raise exception("duration must be greater than zero")
+        if valid_from > valid_until:
+            raise exception("valid_from must not be later than valid_until")
+
+    def __str__(self):
+        return (
+            f"{self.route} at {self.departure_time} "
+            f"on {self.days_of_week} "
+            f"({self.valid_from} - {self.valid_until})"
+        )
+
+
 class Journey(models.Model):
     route = models.ForeignKey(
         Route, on_delete=models.CASCADE, related_name="journeys"
@@ -96,6 +178,42 @@ class Journey(models.Model):
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     crews = models.ManyToManyField(Crew, related_name="journeys")
+    timetable_rule = models.ForeignKey(
+        TimetableRule,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="journeys",
+    )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(departure_time__lt=F("arrival_time")),
+                name="journey_departure_before_arrival",
+                violation_error_message=(
+                    "departure time must be earlier than arrival time"
+                ),
+            ),
+            models.UniqueConstraint(
+                fields=["timetable_rule", "departure_time"],
+                name="unique_journey_timetable_rule_departure",
+                violation_error_message=(
+                    "journey for this timetable rule already exists"
+                ),
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["train", "departure_time"],
+                name="journey_train_departure_idx",
+            ),
+            models.Index(
+                fields=["departure_time", "arrival_time"],
+                name="journey_departure_arrival_idx",
+            ),
+        ]
 
     @staticmethod
     def validate(
@@ -103,8 +221,10 @@ class Journey(models.Model):
         arrival_time: datetime,
         exception: Exception(),
     ) -> None:
-        if departure_time == arrival_time:
-            raise exception("departure and arrival time cannot be the same")
+        if departure_time >= arrival_time:
+            raise exception(
+                "departure time must be earlier than arrival time"
+            )
 
     def clean(self) -> None:
         self.validate(self.departure_time, self.arrival_time, ValidationError)
@@ -116,7 +236,8 @@ class Journey(models.Model):
         using=None,
         update_fields=None,
     ):
-        self.full_clean()
+        if settings.VALIDATE_MODELS_ON_SAVE:
+            self.full_clean()
         return super().save(force_insert, force_update, using, update_fields)
 
     def __str__(self):
@@ -129,7 +250,7 @@ class Journey(models.Model):
 
 
 class Order(models.Model):
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -150,13 +271,22 @@ class Ticket(models.Model):
         Order, on_delete=models.CASCADE, related_name="tickets"
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["journey", "cargo", "seat"],
+                name="unique_ticket_journey_cargo_seat",
+                violation_error_message="This place already taken",
+            ),
+        ]
+
     @staticmethod
-    def validate_ticket(cargo, seat, cinema_hall, error_to_raise):
+    def validate_ticket(cargo, seat, train, error_to_raise):
         for ticket_attr_value, ticket_attr_name, train_attr_name in [
             (cargo, "cargo", "cargo_num"),
             (seat, "seat", "places_in_cargo"),
         ]:
-            count_attrs = getattr(cinema_hall, train_attr_name)
+            count_attrs = getattr(train, train_attr_name)
             if not (1 <= ticket_attr_value <= count_attrs):
                 raise error_to_raise(
                     {
@@ -166,8 +296,6 @@ class Ticket(models.Model):
                         f"(1, {count_attrs})"
                     }
                 )
-            if Ticket.objects.filter(cargo=cargo, seat=seat).exists():
-                raise error_to_raise("This place already taken")
 
     def clean(self):
         Ticket.validate_ticket(
@@ -184,8 +312,201 @@ class Ticket(models.Model):
         using=None,
         update_fields=None,
     ):
-        self.full_clean()
+        if settings.VALIDATE_MODELS_ON_SAVE:
+            self.full_clean()
         return super().save(force_insert, force_update, using, update_fields)
 
     def __str__(self):
         return f"seat: {self.seat}, journey: {str(self.journey)}"
+
+
+class ArchivedJourney(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    route_id = models.BigIntegerField(null=True)
+    train_id = models.BigIntegerField(null=True)
+    source = models.CharField(max_length=100)
+    destination = models.CharField(max_length=100)
+    train = models.CharField(max_length=100)
+    cargo_num = models.IntegerField()
+    places_in_cargo = models.IntegerField()
+    departure_time = models.DateTimeField(db_index=True)
+    arrival_time = models.DateTimeField()
+    crews = models.JSONField(default=list)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return (
+            f"{self.source} - {self.destination} "
+            f"({self.departure_time} - {self.arrival_time})"
+        )
+
+
+class ArchivedOrder(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_orders",
+    )
+
+    def __str__(self):
+        return f"Archived order {self.id}"
+
+
+class ArchivedTicket(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    cargo = models.IntegerField()
+    seat = models.IntegerField()
+    journey = models.ForeignKey(
+        ArchivedJourney, on_delete=models.CASCADE, related_name="tickets"
+    )
+    # Tickets are archived together with their journey; their order is
+    # copied into the archive by the first batch archiving any of them.
+    order = models.ForeignKey(
+        ArchivedOrder, on_delete=models.CASCADE, related_name="tickets"
+    )
+
+    def __str__(self):
+        return f"seat: {self.seat}, journey: {str(self.journey)}"
+
+
+class IdempotencyKey(models.Model):
+    key = models.CharField(max_length=255)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+    )
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="unique_idempotency_key_per_user"
+            ),
+        ]
+
+    def __str__(self):
+        return self.key
+
+
+class OrderJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        PROCESSING = "processing"
+        DONE = "done"
+        FAILED = "failed"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="order_jobs",
+    )
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=10, choices=Status, default=Status.PENDING
+    )
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    errors = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"],
+                name="order_job_status_created_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Order job {self.id} ({self.status})"
+
+
+class RollupHighWaterMark(models.Model):
+    name = models.CharField(max_length=63, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class RouteDailySales(models.Model):
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="daily_sales"
+    )
+    date = models.DateField()
+    seats_sold = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["route", "date"], name="unique_route_daily_sales"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date"], name="route_daily_sales_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.route} {self.date}: {self.seats_sold}"
+
+
+class TrainTypeDailyLoad(models.Model):
+    train_type = models.ForeignKey(
+        TrainType, on_delete=models.CASCADE, related_name="daily_loads"
+    )
+    date = models.DateField()
+    seats_sold = models.PositiveIntegerField(default=0)
+    capacity = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["train_type", "date"],
+                name="unique_train_type_daily_load",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["date"], name="train_type_daily_load_date_idx"
+            ),
+        ]
+
+    @property
+    def load_factor(self) -> float | None:
+        if not self.capacity:
+            return None
+        return self.seats_sold / self.capacity
+
+    def __str__(self):
+        return f"{self.train_type} {self.date}: {self.load_factor}"
+
+
+class HourlyOrders(models.Model):
+    hour = models.DateTimeField(unique=True)
+    orders = models.PositiveIntegerField(default=0)
+    tickets = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.hour}: {self.orders}"
+
+
+class Tombstone(models.Model):
+    model = models.CharField(max_length=63)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.model} {self.object_id}"
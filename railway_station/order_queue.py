@@ -0,0 +1,159 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+
+from railway_station.models import Journey, OrderJob
+from railway_station.serializers import OrderSerializer
+
+THROUGHPUT_WINDOW = timedelta(minutes=1)
+
+logger = logging.getLogger(__name__)
+
+
+class QueuedTicketSerializer(serializers.Serializer):
+    cargo = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+    journey = serializers.IntegerField(min_value=1)
+
+
+class QueuedOrderSerializer(serializers.Serializer):
+    tickets = QueuedTicketSerializer(many=True)
+
+
+class OrderJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OrderJob
+        fields = ["id", "status", "order", "errors", "created_at"]
+        read_only_fields = fields
+
+
+class QueuedCreateMixin:
+    """Enqueue the order and answer 202 when ORDER_QUEUE_ENABLED is set.
+
+    Only the shape of the payload is checked here; seats and journeys are
+    validated by the worker that creates the order.
+    """
+
+    def create(self, request, *args, **kwargs):
+        if not settings.ORDER_QUEUE_ENABLED:
+            return super().create(request, *args, **kwargs)
+        serializer = QueuedOrderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = OrderJob.objects.create(
+            user=request.user, payload=serializer.validated_data
+        )
+        status_url = reverse(
+            "railway_station:orderjob-detail", args=[job.id], request=request
+        )
+        data = OrderJobSerializer(job).data
+        data["status_url"] = status_url
+        return Response(
+            data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": status_url},
+        )
+
+
+def process_job(job: OrderJob) -> None:
+    """Create the order of `job` and record the outcome on the job.
+
+    Every job runs in its own transaction, so journey locks are released as
+    soon as its order is created. A successful job is marked done in the
+    same transaction, so it can never be claimed again once its order
+    exists. Jobs failing for any reason are marked failed instead of being
+    retried forever.
+    """
+    update_fields = ["status", "errors", "order", "processed_at"]
+    journey_ids = sorted(
+        {ticket["journey"] for ticket in job.payload["tickets"]}
+    )
+    serializer = OrderSerializer(data=job.payload)
+    try:
+        with transaction.atomic():
+            # Serializes workers handling orders for the same journeys.
+            list(
+                Journey.objects.select_for_update()
+                .filter(pk__in=journey_ids)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            serializer.is_valid(raise_exception=True)
+            job.order = serializer.save(user=job.user)
+            job.status = OrderJob.Status.DONE
+            job.processed_at = timezone.now()
+            job.save(update_fields=update_fields)
+    except ValidationError as exc:
+        job.status = OrderJob.Status.FAILED
+        job.errors = exc.detail
+    except Exception as exc:
+        logger.exception("Order job %s failed", job.pk)
+        job.status = OrderJob.Status.FAILED
+        job.errors = {"non_field_errors": [type(exc).__name__]}
+    else:
+        return
+    job.order = None
+    job.processed_at = timezone.now()
+    job.save(update_fields=update_fields)
+
+
+def claim_batch(batch_size: int) -> list[OrderJob]:
+    """Mark up to `batch_size` jobs as processing and return them.
+
+    Jobs abandoned by a worker for longer than ORDER_QUEUE_CLAIM_TIMEOUT are
+    claimed again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            OrderJob.objects.select_for_update(skip_locked=True)
+            .select_related("user")
+            .filter(
+                Q(status=OrderJob.Status.PENDING)
+                | Q(
+                    status=OrderJob.Status.PROCESSING,
+                    claimed_at__lt=now - settings.ORDER_QUEUE_CLAIM_TIMEOUT,
+                )
+            )
+            .order_by("created_at")[:batch_size]
+        )
+        OrderJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=OrderJob.Status.PROCESSING, claimed_at=now
+        )
+    return jobs
+
+
+def process_batch(batch_size: int) -> int:
+    """Claim up to `batch_size` pending jobs and process them in order."""
+    jobs = claim_batch(batch_size)
+    for job in jobs:
+        process_job(job)
+    return len(jobs)
+
+
+def queue_stats() -> dict:
+    now = timezone.now()
+    stats = OrderJob.objects.aggregate(
+        pending=Count("id", filter=Q(status=OrderJob.Status.PENDING)),
+        processing=Count("id", filter=Q(status=OrderJob.Status.PROCESSING)),
+        failed=Count("id", filter=Q(status=OrderJob.Status.FAILED)),
+        done=Count("id", filter=Q(status=OrderJob.Status.DONE)),
+        processed_last_minute=Count(
+            "id", filter=Q(processed_at__gte=now - THROUGHPUT_WINDOW)
+        ),
+        oldest_pending=Min(
+            "created_at", filter=Q(status=OrderJob.Status.PENDING)
+        ),
+    )
+    oldest_pending = stats.pop("oldest_pending")
+    stats["oldest_pending_seconds"] = (
+        (now - oldest_pending).total_seconds() if oldest_pending else 0
+    )
+    return stats
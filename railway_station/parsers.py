@@ -0,0 +1,47 @@
+import cbor2
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from railway_station.renderers import STRING_REF
+
+
+class MessagePackParser(BaseParser):
+    """Parse a MessagePack body, optionally preceded by a string table.
+
+    Timestamp extensions are decoded to datetimes.
+    """
+
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        table = []
+
+        def ext_hook(code, data):
+            if code != STRING_REF:
+                return msgpack.ExtType(code, data)
+            return table[int.from_bytes(data, "big")]
+
+        unpacker = msgpack.Unpacker(
+            stream, ext_hook=ext_hook, timestamp=3, strict_map_key=False
+        )
+        try:
+            data = unpacker.unpack()
+            if isinstance(data, list):
+                table.extend(data)
+            try:
+                return unpacker.unpack()
+            except msgpack.OutOfData:
+                return data
+        except (ValueError, IndexError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
+
+
+class CBORParser(BaseParser):
+    media_type = "application/cbor"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return cbor2.load(stream)
+        except (ValueError, cbor2.CBORDecodeError) as exc:
+            raise ParseError(f"CBOR parse error - {exc}")
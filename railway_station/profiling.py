@@ -0,0 +1,153 @@
+import cProfile
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, Http404
+from django.utils import timezone
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_PARAM = "profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_ID_RE = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{12}$")
+# Only one profiler can be active per process, so a request arriving while
+# another one is profiled is served without profiling.
+_profiler_lock = threading.Lock()
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILING_DIR)
+
+
+def _staff_requested(request) -> bool:
+    if not (request.META.get(PROFILE_HEADER) or PROFILE_PARAM in request.GET):
+        return False
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        try:
+            user, _ = JWTAuthentication().authenticate(request) or (None, None)
+        except AuthenticationFailed:
+            return False
+    return bool(user and user.is_staff)
+
+
+def save_profile(profiler: cProfile.Profile, metadata: dict) -> str:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = f"{timezone.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:12]}"
+    profiler.dump_stats(directory / f"{profile_id}.prof")
+    (directory / f"{profile_id}.json").write_text(
+        json.dumps({"id": profile_id, **metadata})
+    )
+    # Ids start with the time, so the oldest sort first.
+    stale = sorted(directory.glob("*.json"))[: -settings.PROFILING_MAX_FILES]
+    for path in stale:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".prof").unlink(missing_ok=True)
+    return profile_id
+
+
+class ProfilingMiddleware:
+    """cProfile requests asked for by staff or picked by sampling.
+
+    Staff ask with an ``X-Profile`` header or a ``profile`` query parameter.
+    The whole request is profiled, including authentication, the view and
+    rendering, and the stored profile id is returned in ``X-Profile-Id``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.get_response(request)
+        sampled = random.random() < settings.PROFILING_SAMPLE_RATE
+        if not sampled and not _staff_requested(request):
+            return self.get_response(request)
+
+        if not _profiler_lock.acquire(blocking=False):
+            return self.get_response(request)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        finally:
+            _profiler_lock.release()
+        user = getattr(request, "user", None)
+        response[PROFILE_ID_HEADER] = save_profile(
+            profiler,
+            {
+                "method": request.method,
+                "path": request.get_full_path(),
+                "status": response.status_code,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "user": user.pk if user and user.is_authenticated else None,
+                "sampled": sampled,
+                "created_at": timezone.now().isoformat(),
+            },
+        )
+        return response
+
+
+class ProfileViewSet(viewsets.ViewSet):
+    """Stored request profiles; download them for ``pstats`` or snakeviz."""
+
+    permission_classes = (IsAdminUser,)
+    lookup_value_regex = PROFILE_ID_RE.pattern[1:-1]
+
+    def _metadata(self, path: Path) -> dict:
+        return json.loads(path.read_text())
+
+    def list(self, request):
+        directory = profile_dir()
+        if not directory.exists():
+            return Response([])
+        return Response(
+            [
+                self._metadata(path)
+                for path in sorted(directory.glob("*.json"), reverse=True)
+            ]
+        )
+
+    def _path(self, pk: str, suffix: str) -> Path:
+        path = profile_dir() / f"{pk}{suffix}"
+        if not PROFILE_ID_RE.match(pk) or not path.exists():
+            raise Http404
+        return path
+
+    def retrieve(self, request, pk=None):
+        return Response(self._metadata(self._path(pk, ".json")))
+
+    @action(detail=True)
+    def download(self, request, pk=None):
+        return FileResponse(
+            self._path(pk, ".prof").open("rb"),
+            as_attachment=True,
+            filename=f"{pk}.prof",
+            content_type="application/octet-stream",
+        )
@@ -0,0 +1,107 @@
+import re
+
+import cbor2
+import msgpack
+from django.utils.dateparse import parse_datetime
+from rest_framework.renderers import BaseRenderer
+
+# Ext type of a reference into the string table of a MessagePack response.
+STRING_REF = 1
+DATETIME_RE = re.compile(
+    r"^\d{4}-\d\d-\d\dT\d\d:\d\d(:\d\d(\.\d+)?)?(Z|[+-]\d\d:\d\d)$"
+)
+# A string reference costs 3-4 bytes, so shorter strings are left inline.
+MIN_REF_LENGTH = 4
+
+
+def _epoch(string: str):
+    if len(string) >= 16 and string[10] == "T" and DATETIME_RE.match(string):
+        return int(parse_datetime(string).timestamp())
+    return string
+
+
+def to_epoch(data):
+    """Copy of `data` with ISO 8601 datetime strings as epoch seconds."""
+    if isinstance(data, str):
+        return _epoch(data)
+    if isinstance(data, dict):
+        return {key: to_epoch(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [to_epoch(value) for value in data]
+    return data
+
+
+def dictionary_encode(data) -> tuple[list[str], object]:
+    """Epoch datetimes and move strings into a table, in a single pass.
+
+    Returns the string table and a copy of `data` where every string of
+    ``MIN_REF_LENGTH`` characters or more, dict keys included, is a
+    ``STRING_REF`` ext holding its big-endian index in the table.
+    """
+    table = []
+    refs = {}
+
+    def ref(string):
+        value = refs.get(string)
+        if value is None:
+            value = _epoch(string)
+            if value is string and len(string) >= MIN_REF_LENGTH:
+                index = len(table)
+                size = 1 if index < 256 else 2 if index < 65536 else 4
+                value = msgpack.ExtType(
+                    STRING_REF, index.to_bytes(size, "big")
+                )
+                table.append(string)
+            refs[string] = value
+        return value
+
+    def encode(value):
+        if isinstance(value, str):
+            return ref(value)
+        if isinstance(value, dict):
+            return {ref(key): encode(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [encode(item) for item in value]
+        return value
+
+    return table, encode(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack with epoch datetimes and a table of repeated strings.
+
+    The body is two consecutive MessagePack objects: the string table and
+    the data, where ext type 1 refers to an entry of the table.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        table, data = dictionary_encode(data)
+        packer = msgpack.Packer(default=str)
+        return packer.pack(table) + packer.pack(data)
+
+
+class CBORRenderer(BaseRenderer):
+    """CBOR with epoch datetimes and RFC 8746 stringref for repeats."""
+
+    media_type = "application/cbor"
+    format = "cbor"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return cbor2.dumps(
+            to_epoch(data), string_referencing=True, default=_cbor_default
+        )
+
+
+def _cbor_default(encoder, value):
+    encoder.encode(str(value))
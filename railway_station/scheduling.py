@@ -0,0 +1,151 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime
+from heapq import heappop, heappush
+from itertools import accumulate
+
+from django.db.models import Exists, OuterRef, QuerySet
+
+from railway_station.models import Crew, Journey, Train
+
+
+class IntervalIndex:
+    """Static index of half-open [start, end) intervals grouped by key.
+
+    Intervals of each key are sorted by start together with a running
+    maximum of their ends, so an overlap lookup is a binary search followed
+    by a scan that stops as soon as no earlier interval can reach `start`.
+    """
+
+    def __init__(self, intervals):
+        grouped = defaultdict(list)
+        for key, start, end, item in intervals:
+            grouped[key].append((start, end, item))
+        self._index = {}
+        for key, rows in grouped.items():
+            rows.sort(key=lambda row: row[0])
+            self._index[key] = (
+                [row[0] for row in rows],
+                list(accumulate((row[1] for row in rows), max)),
+                rows,
+            )
+
+    def overlapping(self, key, start: datetime, end: datetime) -> list:
+        if key not in self._index:
+            return []
+        starts, max_ends, rows = self._index[key]
+        found = []
+        position = bisect_left(starts, end) - 1
+        while position >= 0 and max_ends[position] > start:
+            row_start, row_end, item = rows[position]
+            if row_end > start:
+                found.append(item)
+            position -= 1
+        return found[::-1]
+
+    def conflicts(self):
+        """Yield (key, first, second) for every pair of overlapping items."""
+        for key, (_, _, rows) in self._index.items():
+            active = []
+            for start, end, item in rows:
+                while active and active[0][0] <= start:
+                    heappop(active)
+                for _, other in sorted(active, key=lambda row: row[1]):
+                    yield key, other, item
+                heappush(active, (end, item))
+
+
+def journey_intervals(journeys: QuerySet) -> IntervalIndex:
+    """Index `journeys` by ("train", id) and ("crew", id) in two queries."""
+    rows = journeys.values_list(
+        "id", "train_id", "departure_time", "arrival_time"
+    )
+    crew_rows = Journey.crews.through.objects.filter(
+        journey_id__in=journeys.values("pk")
+    ).values_list(
+        "journey_id",
+        "crew_id",
+        "journey__departure_time",
+        "journey__arrival_time",
+    )
+    return IntervalIndex(
+        [
+            (("train", train_id), departure, arrival, pk)
+            for pk, train_id, departure, arrival in rows
+        ]
+        + [
+            (("crew", crew_id), departure, arrival, journey_id)
+            for journey_id, crew_id, departure, arrival in crew_rows
+        ]
+    )
+
+
+def lock_resources(train: Train, crews) -> None:
+    """Lock the rows of `train` and `crews` until the transaction ends.
+
+    Taken before looking for overlapping journeys, so two requests booking
+    the same train or crew cannot both see it free.
+    """
+    list(
+        Train.objects.select_for_update()
+        .filter(pk=train.pk)
+        .values_list("pk", flat=True)
+    )
+    list(
+        Crew.objects.select_for_update()
+        .filter(pk__in=[crew.pk for crew in crews])
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def overlapping_journeys(
+    departure_time: datetime,
+    arrival_time: datetime,
+    train: Train,
+    crews,
+    exclude_pk: int | None = None,
+) -> dict[str, list]:
+    """Return ids of journeys sharing the train or a crew in the window.
+
+    Crew conflicts are returned as (crew, journey id) pairs.
+    """
+    journeys = (
+        Journey.objects.filter(
+            departure_time__lt=arrival_time,
+            arrival_time__gt=departure_time,
+        )
+        .exclude(pk=exclude_pk)
+        .order_by("departure_time", "pk")
+    )
+    crew_rows = (
+        Journey.crews.through.objects.filter(
+            crew__in=crews, journey__in=journeys
+        )
+        .order_by("journey__departure_time", "journey_id")
+        .values_list("crew_id", "journey_id")
+    )
+    busy_crews = defaultdict(list)
+    for crew_id, pk in crew_rows:
+        busy_crews[crew_id].append(pk)
+    return {
+        "train": list(
+            journeys.filter(train=train).values_list("pk", flat=True)
+        ),
+        "crews": [(crew, pk) for crew in crews for pk in busy_crews[crew.pk]],
+    }
+
+
+def free_resources(start: datetime, end: datetime) -> dict[str, QuerySet]:
+    """Trains and crews without any journey overlapping [start, end)."""
+    busy = Journey.objects.filter(
+        departure_time__lt=end, arrival_time__gt=start
+    )
+    return {
+        "trains": Train.objects.filter(
+            ~Exists(busy.filter(train=OuterRef("pk")))
+        ),
+        "crews": Crew.objects.filter(
+            ~Exists(busy.filter(crews=OuterRef("pk")))
+        ),
+    }
@@ -0,0 +1,86 @@
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.views import SpectacularAPIView
+
+MANIFEST_NAME = "manifest.json"
+RENDERERS = {"yaml": OpenApiYamlRenderer, "json": OpenApiJsonRenderer}
+
+
+def build_schema_artifacts(directory: Path) -> dict:
+    """Render the OpenAPI schema once per format into `directory`.
+
+    File names carry the content hash, which also serves as ETag. Each file
+    is written next to a gzip pre-compressed copy, and ``manifest.json``
+    points at the current files.
+    """
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for schema_format, renderer_class in RENDERERS.items():
+        content = renderer_class().render(schema, renderer_context={})
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        name = f"schema.{digest}.{schema_format}"
+        (directory / name).write_bytes(content)
+        (directory / f"{name}.gz").write_bytes(
+            gzip.compress(content, mtime=0)
+        )
+        manifest[schema_format] = {"file": name, "etag": f'"{digest}"'}
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+@lru_cache(maxsize=8)
+def _read(path: Path) -> bytes:
+    return path.read_bytes()
+
+
+def _load_manifest(directory: Path) -> dict | None:
+    try:
+        return json.loads((directory / MANIFEST_NAME).read_text())
+    except FileNotFoundError:
+        return None
+
+
+class StaticSchemaView(SpectacularAPIView):
+    """Serve the schema built by ``manage.py build_schema``.
+
+    Falls back to generating the schema on every request when no artifact
+    exists in SCHEMA_ARTIFACT_DIR.
+    """
+
+    def get(self, request, *args, **kwargs):
+        directory = Path(settings.SCHEMA_ARTIFACT_DIR)
+        manifest = _load_manifest(directory)
+        schema_format = request.accepted_renderer.format
+        if manifest is None or schema_format not in manifest:
+            return super().get(request, *args, **kwargs)
+
+        artifact = manifest[schema_format]
+        if request.headers.get("If-None-Match") == artifact["etag"]:
+            response = HttpResponseNotModified()
+        elif "gzip" in request.headers.get("Accept-Encoding", ""):
+            response = HttpResponse(
+                _read(directory / f"{artifact['file']}.gz"),
+                content_type=request.accepted_renderer.media_type,
+            )
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(
+                _read(directory / artifact["file"]),
+                content_type=request.accepted_renderer.media_type,
+            )
+        response["ETag"] = artifact["etag"]
+        response["Cache-Control"] = (
+            f"public, max-age={settings.SCHEMA_CACHE_MAX_AGE}"
+        )
+        patch_vary_headers(response, ["Accept", "Accept-Encoding"])
+        return response
@@ -0,0 +1,130 @@
+import math
+import threading
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from railway_station.models import Station
+
+VERSION_CACHE_KEY = "railway_station:station_index_version"
+SIMILARITY_THRESHOLD = 0.3
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrams of every word padded like PostgreSQL pg_trgm does."""
+    result = set()
+    for word in text.casefold().split():
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class StationIndex:
+    """In-memory prefix and trigram index over station names."""
+
+    def __init__(self, stations):
+        self.names = {}
+        self._ids_by_name = {}
+        self._sorted = []
+        self._trigrams = {}
+        self._postings = defaultdict(list)
+        for pk, name in stations:
+            key = name.casefold()
+            self.names[pk] = name
+            self._ids_by_name[key] = pk
+            self._sorted.append((key, pk))
+            self._trigrams[pk] = trigrams(name)
+            for trigram in self._trigrams[pk]:
+                self._postings[trigram].append(pk)
+        self._sorted.sort()
+        self._keys = [key for key, _ in self._sorted]
+
+    def resolve(self, name: str) -> int | None:
+        return self._ids_by_name.get(name.casefold())
+
+    def prefix(self, query: str, limit: int) -> list[int]:
+        query = query.casefold()
+        found = []
+        position = bisect_left(self._keys, query)
+        while len(found) < limit and position < len(self._keys):
+            key, pk = self._sorted[position]
+            if not key.startswith(query):
+                break
+            found.append(pk)
+            position += 1
+        return found
+
+    def fuzzy(self, query: str, limit: int) -> list[int]:
+        query_trigrams = trigrams(query)
+        size = len(query_trigrams)
+        if not size:
+            return []
+        # A name similar enough must share at least `min_common` trigrams,
+        # so it contains one of the rarest size - min_common + 1 of them.
+        min_common = math.ceil(SIMILARITY_THRESHOLD * size)
+        rarest = sorted(
+            query_trigrams,
+            key=lambda trigram: len(self._postings.get(trigram, ())),
+        )
+        candidates = set()
+        for trigram in rarest[: size - min_common + 1]:
+            candidates.update(self._postings.get(trigram, ()))
+
+        scored = []
+        for pk in candidates:
+            name_trigrams = self._trigrams[pk]
+            common = len(query_trigrams & name_trigrams)
+            similarity = common / (size + len(name_trigrams) - common)
+            if similarity >= SIMILARITY_THRESHOLD:
+                scored.append((-similarity, self.names[pk], pk))
+        scored.sort()
+        return [pk for _, _, pk in scored[:limit]]
+
+    def search(self, query: str, limit: int = 10) -> list[int]:
+        """Prefix matches first, then fuzzy matches by similarity."""
+        found = self.prefix(query, limit)
+        if len(found) >= limit:
+            return found
+        for pk in self.fuzzy(query, limit):
+            if len(found) >= limit:
+                break
+            if pk not in found:
+                found.append(pk)
+        return found
+
+
+_lock = threading.Lock()
+_state = {"version": None, "index": None}
+
+
+def get_station_index() -> StationIndex:
+    """Return the process-wide index, rebuilt after stations change.
+
+    The version counter lives in the default cache so every process sharing
+    the cache notices changes made elsewhere.
+    """
+    version = cache.get_or_set(
+        VERSION_CACHE_KEY, lambda: uuid.uuid4().hex, timeout=None
+    )
+    with _lock:
+        if _state["version"] != version:
+            _state["index"] = StationIndex(
+                Station.objects.values_list("id", "name")
+            )
+            _state["version"] = version
+        return _state["index"]
+
+
+def bump_station_index_version() -> None:
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+
+@receiver(post_save, sender=Station)
+@receiver(post_delete, sender=Station)
+def invalidate_station_index(sender, **kwargs):
+    transaction.on_commit(bump_station_index_version)
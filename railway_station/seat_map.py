@@ -0,0 +1,91 @@
+import base64
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.dispatch import receiver
+
+from railway_station.models import Journey, Ticket
+from railway_station.signals import seats_changed
+
+CACHE_KEY = "railway_station:seat_map:{}"
+
+
+def taken_places(journey_id: int) -> dict[int, set[int]]:
+    """Taken seats of a journey grouped by cargo, in one query."""
+    taken = defaultdict(set)
+    for cargo, seat in Ticket.objects.filter(
+        journey_id=journey_id
+    ).values_list("cargo", "seat"):
+        taken[cargo].add(seat)
+    return taken
+
+
+def free_ranges(taken: set[int], places: int) -> list[list[int]]:
+    """Inclusive [first, last] ranges of seats in 1..places not taken."""
+    ranges = []
+    start = None
+    for seat in range(1, places + 2):
+        if seat <= places and seat not in taken:
+            if start is None:
+                start = seat
+        elif start is not None:
+            ranges.append([start, seat - 1])
+            start = None
+    return ranges
+
+
+def occupancy_bitmap(taken: set[int], places: int) -> str:
+    """Base64 bitmap where bit n (LSB first) is set when seat n+1 is taken."""
+    bitmap = bytearray((places + 7) // 8)
+    for seat in taken:
+        if 1 <= seat <= places:
+            bitmap[(seat - 1) // 8] |= 1 << ((seat - 1) % 8)
+    return base64.b64encode(bytes(bitmap)).decode()
+
+
+def build_seat_map(journey: Journey) -> dict:
+    train = journey.train
+    taken = taken_places(journey.id)
+    return {
+        "journey": journey.id,
+        "cargo_num": train.cargo_num,
+        "places_in_cargo": train.places_in_cargo,
+        "cargos": [
+            {
+                "cargo": cargo,
+                "taken": len(taken[cargo]),
+                "free": free_ranges(taken[cargo], train.places_in_cargo),
+                "bitmap": occupancy_bitmap(
+                    taken[cargo], train.places_in_cargo
+                ),
+            }
+            for cargo in range(1, train.cargo_num + 1)
+        ],
+    }
+
+
+def get_seat_map(journey_id: int) -> dict | None:
+    """Cached seat map of a journey, None if the journey does not exist."""
+    key = CACHE_KEY.format(journey_id)
+    seat_map = cache.get(key)
+    if seat_map is None:
+        journey = (
+            Journey.objects.select_related("train")
+            .filter(pk=journey_id)
+            .first()
+        )
+        if journey is None:
+            return None
+        seat_map = build_seat_map(journey)
+        cache.set(key, seat_map, timeout=settings.SEAT_MAP_CACHE_TIMEOUT)
+    return seat_map
+
+
+def invalidate_seat_maps(journey_ids) -> None:
+    cache.delete_many([CACHE_KEY.format(pk) for pk in journey_ids])
+
+
+@receiver(seats_changed)
+def invalidate_seat_map(sender, journey_id, **kwargs):
+    invalidate_seat_maps([journey_id])
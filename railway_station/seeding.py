@@ -0,0 +1,266 @@
+import math
+import random
+import string
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from railway_station.distances import rebuild_distance_matrix
+from railway_station.models import (
+    Crew,
+    Journey,
+    Order,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType
+)
+from railway_station.search import bump_station_index_version
+
+BULK_BATCH_SIZE = 2000
+TRAIN_TYPES = ("Intercity", "Regional", "Night", "Express")
+# Average speed used to derive journey duration from route distance.
+KM_PER_HOUR = 80
+TURNAROUND = timedelta(minutes=45)
+SEED_PASSWORD = "seed-password"
+
+Progress = Callable[[str, int], None]
+
+
+def _noop_progress(label: str, created: int) -> None:
+    pass
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> list[float]:
+    """Cumulative weights where item n is picked about 1 / n^exponent."""
+    return list(
+        accumulate(1 / (rank**exponent) for rank in range(1, count + 1))
+    )
+
+
+def _name(rng: random.Random) -> str:
+    return " ".join(
+        rng.choice(string.ascii_uppercase)
+        + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for _ in range(rng.randint(1, 2))
+    )
+
+
+def _stations(rng, count):
+    taken = set(Station.objects.values_list("name", flat=True))
+    stations = []
+    while len(stations) < count:
+        name = _name(rng)
+        if name not in taken:
+            taken.add(name)
+            stations.append(
+                Station(
+                    name=name,
+                    latitude=round(rng.uniform(44.4, 52.3), 4),
+                    longitude=round(rng.uniform(22.1, 40.2), 4),
+                )
+            )
+    return Station.objects.bulk_create(stations, batch_size=BULK_BATCH_SIZE)
+
+
+def _distance(source: Station, destination: Station) -> int:
+    # Roughly kilometres, good enough for synthetic data.
+    return max(
+        1,
+        round(
+            math.hypot(
+                source.latitude - destination.latitude,
+                (source.longitude - destination.longitude) * 0.7,
+            )
+            * 111
+        ),
+    )
+
+
+def _routes(rng, stations, count):
+    # Hub stations take part in most routes.
+    weights = zipf_weights(len(stations))
+    pairs = set()
+    for _ in range(count * 20):
+        if len(pairs) == count:
+            break
+        source, destination = rng.choices(stations, cum_weights=weights, k=2)
+        if source is not destination:
+            pairs.add((source, destination))
+    return Route.objects.bulk_create(
+        (
+            Route(
+                source=source,
+                destination=destination,
+                distance=_distance(source, destination),
+            )
+            for source, destination in pairs
+        ),
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+
+def _trains(rng, count):
+    train_types = [
+        TrainType.objects.get_or_create(name=name)[0] for name in TRAIN_TYPES
+    ]
+    return Train.objects.bulk_create(
+        (
+            Train(
+                name=f"{_name(rng)} {number}",
+                cargo_num=rng.randint(4, 16),
+                places_in_cargo=rng.choice((36, 54, 64, 80)),
+                train_type=rng.choice(train_types),
+            )
+            for number in range(count)
+        ),
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+
+def _journeys(rng, routes, trains, count, start):
+    """Journeys of every train back to back, so none of them overlap."""
+    weights = zipf_weights(len(routes), exponent=0.8)
+    clocks = {
+        train.pk: start + timedelta(minutes=rng.randrange(24 * 60))
+        for train in trains
+    }
+    journeys = []
+    for index in range(count):
+        train = trains[index % len(trains)]
+        route = rng.choices(routes, cum_weights=weights)[0]
+        departure = clocks[train.pk]
+        arrival = departure + timedelta(
+            minutes=max(20, route.distance * 60 // KM_PER_HOUR)
+        )
+        clocks[train.pk] = arrival + TURNAROUND
+        journeys.append(
+            Journey(
+                route=route,
+                train=train,
+                departure_time=departure,
+                arrival_time=arrival,
+            )
+        )
+    return Journey.objects.bulk_create(journeys, batch_size=BULK_BATCH_SIZE)
+
+
+def _crews(rng, trains, journeys):
+    """Give each train a fixed crew of two that works all its journeys."""
+    crews = Crew.objects.bulk_create(
+        (
+            Crew(first_name=_name(rng).split()[0], last_name=_name(rng))
+            for _ in range(len(trains) * 2)
+        ),
+        batch_size=BULK_BATCH_SIZE,
+    )
+    team = {
+        train.pk: crews[index * 2 : index * 2 + 2]
+        for index, train in enumerate(trains)
+    }
+    Journey.crews.through.objects.bulk_create(
+        (
+            Journey.crews.through(journey_id=journey.pk, crew_id=crew.pk)
+            for journey in journeys
+            for crew in team[journey.train_id]
+        ),
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+
+def _users(count):
+    password = make_password(SEED_PASSWORD)
+    start = get_user_model().objects.count()
+    return get_user_model().objects.bulk_create(
+        (
+            get_user_model()(
+                email=f"seed{start + number}@example.com", password=password
+            )
+            for number in range(count)
+        ),
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+
+def _orders(rng, users, journeys, count, max_tickets):
+    """Orders of frequent travellers on popular journeys, seats in a row."""
+    user_weights = zipf_weights(len(users))
+    journey_weights = zipf_weights(len(journeys), exponent=0.6)
+    taken = defaultdict(set)
+    orders = Order.objects.bulk_create(
+        (
+            Order(user=user)
+            for user in rng.choices(users, cum_weights=user_weights, k=count)
+        ),
+        batch_size=BULK_BATCH_SIZE,
+    )
+    tickets = []
+    for order in orders:
+        journey = rng.choices(journeys, cum_weights=journey_weights)[0]
+        train = journey.train
+        cargo = rng.randint(1, train.cargo_num)
+        first = rng.randint(1, train.places_in_cargo)
+        for seat in range(first, first + rng.randint(1, max_tickets)):
+            if seat > train.places_in_cargo:
+                break
+            if (cargo, seat) in taken[journey.pk]:
+                continue
+            taken[journey.pk].add((cargo, seat))
+            tickets.append(
+                Ticket(journey=journey, order=order, cargo=cargo, seat=seat)
+            )
+    Ticket.objects.bulk_create(tickets, batch_size=BULK_BATCH_SIZE)
+    return orders, tickets
+
+
+def seed(
+    stations: int,
+    routes: int,
+    trains: int,
+    journeys: int,
+    users: int,
+    orders: int,
+    max_tickets: int = 4,
+    start: datetime | None = None,
+    rng_seed: int = 0,
+    progress: Progress = _noop_progress,
+) -> dict[str, int]:
+    """Bulk-create a synthetic network with skewed popularity.
+
+    A few hub stations get most routes, a few routes most journeys and a
+    few journeys and users most orders. Journeys of a train run back to
+    back from `start`, so neither trains nor crews are double booked.
+    """
+    rng = random.Random(rng_seed)
+    start = start or timezone.now()
+    created = {}
+
+    def done(label, rows):
+        created[label] = len(rows)
+        progress(label, len(rows))
+        return rows
+
+    with transaction.atomic():
+        station_rows = done("stations", _stations(rng, stations))
+        route_rows = done("routes", _routes(rng, station_rows, routes))
+        train_rows = done("trains", _trains(rng, trains))
+        journey_rows = _journeys(rng, route_rows, train_rows, journeys, start)
+        _crews(rng, train_rows, journey_rows)
+        done("journeys", journey_rows)
+        user_rows = done("users", _users(users))
+        order_rows, ticket_rows = _orders(
+            rng, user_rows, journey_rows, orders, max_tickets
+        )
+        done("orders", order_rows)
+        done("tickets", ticket_rows)
+    # Bulk inserts send no save signals, so refresh what they would have.
+    bump_station_index_version()
+    rebuild_distance_matrix()
+    return created
@@ -1,17 +1,32 @@
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 
+from railway_station.exceptions import constraint_violation_message
+from railway_station.metrics import (
+    record_order_created,
+    record_seat_rejection
+)
 from railway_station.models import (
+    ArchivedJourney,
+    ArchivedOrder,
+    ArchivedTicket,
     Crew,
+    HourlyOrders,
     Journey,
     Order,
     Route,
+    RouteDailySales,
     Station,
     Ticket,
+    TimetableRule,
     Train,
-    TrainType
+    TrainType,
+    TrainTypeDailyLoad
 )
+from railway_station.scheduling import lock_resources, overlapping_journeys
+from railway_station.signals import send_seats_changed
 
 
 class TrainTypeSerializer(serializers.ModelSerializer):
@@ -78,6 +93,32 @@ class RouteListSerializer(serializers.ModelSerializer):
         fields = ["id", "source", "destination", "distance"]
 
 
+class TimetableRuleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TimetableRule
+        fields = [
+            "id",
+            "route",
+            "train",
+            "crews",
+            "days_of_week",
+            "departure_time",
+            "duration",
+            "valid_from",
+            "valid_until",
+        ]
+
+    def validate(self, attrs):
+        TimetableRule.validate(
+            **{
+                field: attrs.get(field, getattr(self.instance, field, None))
+                for field in ("valid_from", "valid_until", "duration")
+            },
+            exception=ValidationError,
+        )
+        return attrs
+
+
 class TicketTakenSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
@@ -103,10 +144,41 @@ class JourneySerializer(serializers.ModelSerializer):
             "taken_places",
         ]
 
+    def _value(self, attrs, field):
+        if field in attrs:
+            return attrs[field]
+        return getattr(self.instance, field)
+
     def validate(self, attrs):
-        Journey.validate(
-            attrs["departure_time"], attrs["arrival_time"], ValidationError
+        departure_time = self._value(attrs, "departure_time")
+        arrival_time = self._value(attrs, "arrival_time")
+        Journey.validate(departure_time, arrival_time, ValidationError)
+
+        crews = attrs.get("crews")
+        if crews is None:
+            crews = list(self.instance.crews.all())
+        train = self._value(attrs, "train")
+        lock_resources(train, crews)
+        busy = overlapping_journeys(
+            departure_time,
+            arrival_time,
+            train,
+            crews,
+            exclude_pk=getattr(self.instance, "pk", None),
         )
+        errors = {}
+        if busy["train"]:
+            errors["train"] = (
+                "train is already assigned to overlapping journeys: "
+                f"{busy['train']}"
+            )
+        if busy["crews"]:
+            errors["crews"] = [
+                f"{crew} is already assigned to overlapping journey {pk}"
+                for crew, pk in busy["crews"]
+            ]
+        if errors:
+            raise ValidationError(errors)
         return attrs
 
 
@@ -123,19 +195,28 @@ class JourneyRetrieveSerializer(JourneySerializer):
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    journey = serializers.PrimaryKeyRelatedField(
+        queryset=Journey.objects.select_related("train")
+    )
 
     class Meta:
         model = Ticket
         fields = ["id", "cargo", "seat", "journey", "order"]
         read_only_fields = ("id", "order")
+        # Seat uniqueness is enforced by the database constraint on insert.
+        validators = []
 
     def validate(self, attrs):
-        Ticket.validate_ticket(
-            attrs["cargo"],
-            attrs["seat"],
-            attrs["journey"].train,
-            ValidationError,
-        )
+        try:
+            Ticket.validate_ticket(
+                attrs["cargo"],
+                attrs["seat"],
+                attrs["journey"].train,
+                ValidationError,
+            )
+        except ValidationError:
+            record_seat_rejection("out_of_range")
+            raise
         return attrs
 
 
@@ -155,10 +236,110 @@ class OrderSerializer(serializers.ModelSerializer):
         with transaction.atomic():
             tickets_data = validated_data.pop("tickets")
             order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+            tickets = []
+            for index, ticket_data in enumerate(tickets_data):
+                try:
+                    tickets.append(
+                        Ticket.objects.create(order=order, **ticket_data)
+                    )
+                except IntegrityError as exc:
+                    message = constraint_violation_message(exc)
+                    if message is None:
+                        raise
+                    record_seat_rejection("taken")
+                    errors = [{} for _ in tickets_data]
+                    errors[index] = {
+                        api_settings.NON_FIELD_ERRORS_KEY: [message]
+                    }
+                    raise ValidationError({"tickets": errors})
+            send_seats_changed(taken=tickets)
+            record_order_created()
             return order
 
 
 class OrderListSerializer(OrderSerializer):
     tickets = TicketListSerializer(many=True)
+
+
+class ArchivedJourneySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedJourney
+        fields = [
+            "id",
+            "source",
+            "destination",
+            "train",
+            "cargo_num",
+            "places_in_cargo",
+            "departure_time",
+            "arrival_time",
+            "crews",
+        ]
+
+
+class ArchivedTicketSerializer(serializers.ModelSerializer):
+    journey = serializers.StringRelatedField()
+
+    class Meta:
+        model = ArchivedTicket
+        fields = ["id", "cargo", "seat", "journey"]
+
+
+class ArchivedOrderSerializer(serializers.ModelSerializer):
+    tickets = ArchivedTicketSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ArchivedOrder
+        fields = ["id", "created_at", "tickets"]
+
+
+class SeatAllocationSerializer(serializers.Serializer):
+    journey = serializers.PrimaryKeyRelatedField(
+        queryset=Journey.objects.select_related("train")
+    )
+    count = serializers.IntegerField(min_value=1)
+    cargo = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        train = attrs["journey"].train
+        if attrs["count"] > train.places_in_cargo:
+            raise ValidationError(
+                {
+                    "count": "count must not exceed places_in_cargo: "
+                    f"{train.places_in_cargo}"
+                }
+            )
+        if attrs.get("cargo", 1) > train.cargo_num:
+            raise ValidationError(
+                {
+                    "cargo": "cargo number must be in available range: "
+                    f"(1, cargo_num): (1, {train.cargo_num})"
+                }
+            )
+        return attrs
+
+
+class RouteDailySalesSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RouteDailySales
+        fields = ("route", "date", "seats_sold")
+
+
+class TrainTypeDailyLoadSerializer(serializers.ModelSerializer):
+    load_factor = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = TrainTypeDailyLoad
+        fields = (
+            "train_type",
+            "date",
+            "seats_sold",
+            "capacity",
+            "load_factor",
+        )
+
+
+class HourlyOrdersSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HourlyOrders
+        fields = ("hour", "orders", "tickets")
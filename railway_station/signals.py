@@ -0,0 +1,27 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.dispatch import Signal
+
+# Sent after commit with ``journey_id``, ``taken`` and ``released`` lists of
+# (cargo, seat) pairs whenever tickets of a journey are created or removed.
+seats_changed = Signal()
+
+
+def send_seats_changed(taken=(), released=()) -> None:
+    """Send `seats_changed` per journey once the transaction commits."""
+    changes = defaultdict(lambda: {"taken": [], "released": []})
+    for key, tickets in (("taken", taken), ("released", released)):
+        for ticket in tickets:
+            changes[ticket.journey_id][key].append(
+                (ticket.cargo, ticket.seat)
+            )
+
+    def send():
+        for journey_id, change in changes.items():
+            seats_changed.send(
+                sender=send_seats_changed, journey_id=journey_id, **change
+            )
+
+    if changes:
+        transaction.on_commit(send)
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import logging
+import re
+import time
+from contextlib import contextmanager
+from functools import cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from railway_station.jsonl import rotating_logger
+from railway_station.metrics import view_labels
+
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(\.\d+)?\b")
+_LIST_RE = re.compile(r"\(\s*\?(\s*,\s*\?)*\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize(sql: str) -> str:
+    """SQL with literals and placeholders replaced by ``?``.
+
+    Lists of placeholders collapse to ``(?+)`` so ``IN`` lookups of any
+    length share a fingerprint.
+    """
+    sql = _STRING_RE.sub("?", sql.replace("%s", "?"))
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _LIST_RE.sub("(?+)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def params_shape(params, many: bool):
+    """Types of the parameters without their values."""
+    if many:
+        params = list(params or ())
+        return {"rows": len(params), "row": params_shape(params[:1], False)}
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    return [
+        (
+            f"{type(value).__name__}[{len(value)}]"
+            if isinstance(value, (list, tuple))
+            else type(value).__name__
+        )
+        for value in params or ()
+    ]
+
+
+@cache
+def get_logger() -> logging.Logger:
+    return rotating_logger(
+        "railway_station.slow_queries",
+        settings.SLOW_QUERY_LOG_FILE,
+        settings.SLOW_QUERY_LOG_MAX_BYTES,
+        settings.SLOW_QUERY_LOG_BACKUPS,
+    )
+
+
+class SlowQueryLogger:
+    """Execute wrapper writing queries slower than the threshold to JSONL.
+
+    `origin` is called lazily for the name of the code that ran the query.
+    """
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.explaining:
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed = time.perf_counter() - start
+        if elapsed >= settings.SLOW_QUERY_THRESHOLD:
+            self.log(sql, params, many, elapsed, context["connection"])
+        return result
+
+    def explain(self, sql, params, db) -> list[str] | None:
+        if not sql.lstrip().upper().startswith(EXPLAINABLE):
+            return None
+        self.explaining = True
+        try:
+            # A savepoint keeps a failing EXPLAIN from aborting the
+            # surrounding transaction.
+            with transaction.atomic(using=db.alias), db.cursor() as cursor:
+                cursor.execute(
+                    f"{db.ops.explain_query_prefix()} {sql}", params
+                )
+                return [
+                    " ".join(str(column) for column in row)
+                    for row in cursor.fetchall()
+                ]
+        except DatabaseError:
+            return None
+        finally:
+            self.explaining = False
+
+    def log(self, sql, params, many, elapsed, db) -> None:
+        normalized = normalize(sql)
+        get_logger().info(
+            json.dumps(
+                {
+                    "time": timezone.now().isoformat(),
+                    "duration_ms": round(elapsed * 1000, 3),
+                    "origin": self.origin(),
+                    "fingerprint": fingerprint(normalized),
+                    "sql": normalized,
+                    "params": params_shape(params, many),
+                    "plan": None if many else self.explain(sql, params, db),
+                }
+            )
+        )
+
+
+@contextmanager
+def log_slow_queries(origin: str):
+    """Log slow queries of the default database run inside the block."""
+    with connection.execute_wrapper(SlowQueryLogger(lambda: origin)):
+        yield
+
+
+class SlowQueryMiddleware:
+    """Install `SlowQueryLogger` for requests when SLOW_QUERY_LOG_ENABLED."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_LOG_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            # Queries of async views run on other threads.
+            return self.get_response(request)
+
+        def origin():
+            view, action = view_labels(request)
+            return f"{request.method} {request.path} {view}.{action}"
+
+        with connection.execute_wrapper(SlowQueryLogger(origin)):
+            return self.get_response(request)
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+
+from railway_station.events import get_backend
+from railway_station.models import Journey, Ticket
+
+KEEPALIVE_SECONDS = 15
+
+
+def _event(name: str, data: dict) -> str:
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+async def journey_seats_stream(request, pk):
+    """Server-Sent Events stream of seat changes of one journey.
+
+    Sends the taken places once as a ``snapshot`` event followed by
+    ``seats`` events with the places taken or released since then. The
+    stream holds no thread while idle, so it must be served over ASGI;
+    under WSGI it would tie up a worker for good and answers 501 instead.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(
+            "Seat streams are only served over ASGI.",
+            status=501,
+            content_type="text/plain",
+        )
+    journey = (
+        await Journey.objects.select_related("train").filter(pk=pk).afirst()
+    )
+    if journey is None:
+        raise Http404
+    backend = get_backend()
+
+    async def events():
+        # Subscribe once the response is iterated, but before reading the
+        # snapshot so no change is missed.
+        queue = backend.subscribe(pk)
+        try:
+            taken = [
+                place
+                async for place in Ticket.objects.filter(
+                    journey_id=pk
+                ).values_list("cargo", "seat")
+            ]
+            yield _event(
+                "snapshot",
+                {
+                    "journey": pk,
+                    "cargo_num": journey.train.cargo_num,
+                    "places_in_cargo": journey.train.places_in_cargo,
+                    "taken": taken,
+                },
+            )
+            while True:
+                try:
+                    change = await asyncio.wait_for(
+                        queue.get(), KEEPALIVE_SECONDS
+                    )
+                except TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _event("seats", change)
+        finally:
+            backend.unsubscribe(pk, queue)
+
+    response = StreamingHttpResponse(
+        events(), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
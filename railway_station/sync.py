@@ -0,0 +1,135 @@
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from railway_station.models import Journey, Route, Station, Tombstone, Train
+
+# Parents come before the rows referencing them.
+SYNC_MODELS = (Station, Train, Route, Journey)
+TOKEN_SALT = "railway_station.sync"
+CHUNK_SIZE = 2000
+
+
+def record_deletions(model: type[models.Model], ids) -> None:
+    Tombstone.objects.bulk_create(
+        Tombstone(model=model._meta.model_name, object_id=pk) for pk in ids
+    )
+
+
+# Deletions cascaded by the ORM, e.g. trains of a deleted train type, send
+# post_delete as well, so they leave tombstones too.
+@receiver(post_delete, sender=Station)
+@receiver(post_delete, sender=Train)
+@receiver(post_delete, sender=Route)
+def record_deletion(sender, instance, **kwargs):
+    record_deletions(sender, [instance.pk])
+
+
+# Journeys have no receiver of their own: it would make the ORM fetch and
+# signal every deleted row. delete_journeys() records them in bulk, and the
+# journeys a train or route takes with it are recorded before the cascade.
+@receiver(pre_delete, sender=Train)
+@receiver(pre_delete, sender=Route)
+def record_journey_deletions(sender, instance, **kwargs):
+    record_deletions(Journey, instance.journeys.values_list("pk", flat=True))
+
+
+def make_token(until: datetime) -> str:
+    return signing.dumps(until.isoformat(), salt=TOKEN_SALT)
+
+
+def read_token(token: str) -> datetime:
+    return datetime.fromisoformat(signing.loads(token, salt=TOKEN_SALT))
+
+
+def _window(field: str, since: datetime | None, until: datetime) -> Q:
+    window = Q(**{f"{field}__lte": until})
+    if since is not None:
+        window &= Q(**{f"{field}__gt": since})
+    return window
+
+
+def changes(since: datetime | None, until: datetime):
+    """Yield rows changed and ids deleted in (since, until].
+
+    Without `since` every row is yielded and tombstones are skipped. Rows
+    are read with server-side cursors, so memory does not grow with the
+    size of the change set.
+    """
+    for model in SYNC_MODELS:
+        rows = (
+            model.objects.filter(_window("updated_at", since, until))
+            .order_by("updated_at", "pk")
+            .values()
+        )
+        for row in rows.iterator(chunk_size=CHUNK_SIZE):
+            yield {"model": model._meta.model_name, "data": row}
+    if since is None:
+        return
+    tombstones = (
+        Tombstone.objects.filter(_window("deleted_at", since, until))
+        .order_by("deleted_at", "pk")
+        .values_list("model", "object_id")
+    )
+    for model, pk in tombstones.iterator(chunk_size=CHUNK_SIZE):
+        yield {"model": model, "deleted": pk}
+
+
+class SyncView(APIView):
+    """Stream catalog changes since a token as newline-delimited JSON.
+
+    Every line is a changed row or a deleted id; the last line holds the
+    token to pass as ``since`` on the next sync.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "since",
+                type=OpenApiTypes.STR,
+                description="Token returned by the previous sync; "
+                "omit for a full sync",
+            ),
+        ],
+        responses={(200, "application/x-ndjson"): OpenApiTypes.STR},
+    )
+    def get(self, request):
+        since = None
+        if token := request.query_params.get("since"):
+            try:
+                since = read_token(token)
+            except (signing.BadSignature, ValueError):
+                raise ValidationError({"since": "Invalid sync token"})
+            if since < timezone.now() - settings.SYNC_TOMBSTONE_TTL:
+                return Response(
+                    {"detail": "Sync token expired, start a full sync"},
+                    status=status.HTTP_410_GONE,
+                )
+        until = timezone.now() - settings.SYNC_LAG
+
+        def lines():
+            for change in changes(since, until):
+                yield json.dumps(change, cls=DjangoJSONEncoder) + "\n"
+            yield json.dumps({"next": make_token(until)}) + "\n"
+
+        return StreamingHttpResponse(
+            lines(), content_type="application/x-ndjson"
+        )
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from railway_station.models import Journey, Route, Station, Train, TrainType
+
+
+def create_station(name="Source", latitude=12.34, longitude=56.78):
+    return Station.objects.create(
+        name=name, latitude=latitude, longitude=longitude
+    )
+
+
+def create_route(source=None, destination=None, distance=100) -> Route:
+    return Route.objects.create(
+        source=source or create_station(),
+        destination=destination
+        or create_station("Destination", latitude=23.45, longitude=67.89),
+        distance=distance,
+    )
+
+
+def create_train(**fields) -> Train:
+    fields.setdefault("name", "Express")
+    fields.setdefault("cargo_num", 2)
+    fields.setdefault("places_in_cargo", 50)
+    if "train_type" not in fields:
+        fields["train_type"], _ = TrainType.objects.get_or_create(
+            name="Passenger"
+        )
+    return Train.objects.create(**fields)
+
+
+def create_journey(
+    route=None,
+    train=None,
+    departure_time=None,
+    duration=timedelta(hours=2),
+    **fields,
+) -> Journey:
+    """Two-hour journey leaving at 08:00 on 2024-12-24 by default."""
+    departure_time = departure_time or timezone.make_aware(
+        datetime(2024, 12, 24, 8)
+    )
+    return Journey.objects.create(
+        route=route or create_route(),
+        train=train or create_train(),
+        departure_time=departure_time,
+        arrival_time=departure_time + duration,
+        **fields,
+    )
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from railway_station.admin import EstimatedCountPaginator
+from railway_station.models import Journey, Order, Ticket, Tombstone
+from railway_station.seat_map import get_seat_map
+from railway_station.tests.factories import create_route, create_train
+
+
+class AdminChangelistTest(TestCase):
+    def setUp(self):
+        self.client.force_login(
+            get_user_model().objects.create_superuser(
+                email="admin@admin.com", password="admin"
+            )
+        )
+        self.route = create_route()
+        self.train = create_train()
+        self.order = Order.objects.create(
+            user=get_user_model().objects.create_user(
+                email="user@user.com", password="user"
+            )
+        )
+
+    def add_journeys(self, count):
+        start = timezone.make_aware(datetime(2024, 12, 24, 8))
+        for day in range(count):
+            journey = Journey.objects.create(
+                route=self.route,
+                train=self.train,
+                departure_time=start + timedelta(days=day),
+                arrival_time=start + timedelta(days=day, hours=2),
+            )
+            Ticket.objects.create(
+                journey=journey, order=self.order, cargo=1, seat=1
+            )
+
+    def changelist_queries(self, url) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_changelists_do_not_query_per_row(self):
+        for name in ("journey", "ticket", "route", "train", "order"):
+            url = reverse(f"admin:railway_station_{name}_changelist")
+            self.add_journeys(1)
+            few = self.changelist_queries(url)
+            self.add_journeys(5)
+            with self.subTest(name):
+                self.assertEqual(self.changelist_queries(url), few)
+
+    def test_search_by_id(self):
+        self.add_journeys(3)
+        journey = Journey.objects.first()
+        url = reverse("admin:railway_station_ticket_changelist")
+
+        response = self.client.get(url, {"q": str(journey.id)})
+        self.assertIn(
+            journey.tickets.get(), response.context["cl"].result_list
+        )
+        response = self.client.get(url, {"q": "Source"})
+        self.assertEqual(len(response.context["cl"].result_list), 0)
+
+    def test_paginator_counts_exactly_without_estimate(self):
+        self.add_journeys(3)
+
+        paginator = EstimatedCountPaginator(Journey.objects.order_by("pk"), 2)
+
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 2)
+
+    def test_delete_records_tombstones(self):
+        self.add_journeys(2)
+        url = reverse("admin:railway_station_journey_changelist")
+
+        self.client.post(
+            url,
+            {
+                "action": "delete_selected",
+                "_selected_action": list(
+                    Journey.objects.values_list("pk", flat=True)
+                ),
+                "post": "yes",
+            },
+        )
+
+        self.assertFalse(Journey.objects.exists())
+        self.assertFalse(Ticket.objects.exists())
+        self.assertEqual(Tombstone.objects.filter(model="journey").count(), 2)
+
+    def test_ticket_changes_invalidate_seat_maps(self):
+        self.addCleanup(cache.clear)
+        self.add_journeys(1)
+        ticket = Ticket.objects.get()
+        self.assertEqual(
+            get_seat_map(ticket.journey_id)["cargos"][0]["taken"], 1
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(
+                    "admin:railway_station_ticket_change", args=[ticket.pk]
+                ),
+                {
+                    "journey": ticket.journey_id,
+                    "order": self.order.pk,
+                    "cargo": 2,
+                    "seat": 5,
+                },
+            )
+
+        cargos = get_seat_map(ticket.journey_id)["cargos"]
+        self.assertEqual([cargo["taken"] for cargo in cargos], [0, 1])
+
+    def test_delete_confirmation_counts_related_rows(self):
+        self.add_journeys(1)
+        url = reverse(
+            "admin:railway_station_route_delete", args=[self.route.pk]
+        )
+        few = self.changelist_queries(url)
+        self.add_journeys(5)
+
+        self.assertEqual(self.changelist_queries(url), few)
+        response = self.client.get(url)
+        self.assertContains(response, "Journeys: 6")
+        self.assertContains(response, "Tickets: 6")
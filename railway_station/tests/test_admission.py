@@ -0,0 +1,105 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.admission import AdmissionController, get_controller
+
+CLASSES = {
+    "orders": {"limit": 1, "queue": 1, "timeout": 5.0, "priority": 0},
+    "search": {"limit": 1, "queue": 1, "timeout": 5.0, "priority": 1},
+}
+
+
+class AdmissionControllerTest(TestCase):
+    def setUp(self):
+        self.controller = AdmissionController(CLASSES)
+
+    def wait_in_thread(self, name):
+        result = {}
+        thread = threading.Thread(
+            target=lambda: result.update(queued=self.controller.acquire(name))
+        )
+        thread.start()
+        return thread, result
+
+    def wait_for_queue(self, name):
+        while not self.controller.stats()[name]["waiting"]:
+            time.sleep(0.001)
+
+    def test_queued_request_is_admitted_on_release(self):
+        self.assertIsNotNone(self.controller.acquire("orders"))
+        thread, result = self.wait_in_thread("orders")
+        self.wait_for_queue("orders")
+
+        self.assertIsNone(self.controller.acquire("orders"))
+        self.controller.release("orders")
+        thread.join()
+
+        self.assertGreater(result["queued"], 0)
+        stats = self.controller.stats()["orders"]
+        self.assertEqual((stats["in_flight"], stats["shed"]), (1, 1))
+
+    def test_queue_deadline(self):
+        controller = AdmissionController(
+            {"search": {**CLASSES["search"], "timeout": 0.01}}
+        )
+        controller.acquire("search")
+
+        self.assertIsNone(controller.acquire("search"))
+        self.assertEqual(controller.stats()["search"]["shed"], 1)
+
+    def test_lower_priority_is_shed_while_orders_queue(self):
+        self.controller.acquire("orders")
+        self.controller.acquire("search")
+        search_thread, search = self.wait_in_thread("search")
+        self.wait_for_queue("search")
+
+        orders_thread, orders = self.wait_in_thread("orders")
+        search_thread.join(timeout=1)
+
+        self.assertFalse(search_thread.is_alive())
+        self.assertIsNone(search["queued"])
+        self.assertIsNone(self.controller.acquire("search"))
+        self.controller.release("orders")
+        orders_thread.join()
+        self.assertIsNotNone(orders["queued"])
+
+
+class AdmissionMiddlewareTest(TestCase):
+    def setUp(self):
+        get_controller.cache_clear()
+        self.addCleanup(get_controller.cache_clear)
+
+    @override_settings(
+        ADMISSION_CLASSES={
+            **CLASSES,
+            "search": {**CLASSES["search"], "limit": 0, "queue": 0},
+        }
+    )
+    def test_overloaded_class_is_shed_with_retry_after(self):
+        response = self.client.get(reverse("railway_station:journey-list"))
+
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertEqual(response["Retry-After"], "1")
+
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@admin.com", password="admin"
+            )
+        )
+        self.assertEqual(
+            client.get(reverse("railway_station:order-list")).status_code,
+            status.HTTP_200_OK,
+        )
+        stats = client.get(reverse("admission-stats")).data
+        self.assertEqual(stats["search"]["shed"], 1)
+        self.assertEqual(stats["orders"]["admitted"], 1)
+        self.assertEqual(stats["orders"]["in_flight"], 0)
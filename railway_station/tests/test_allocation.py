@@ -0,0 +1,98 @@
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.allocation import find_block
+from railway_station.models import Order, Ticket, Train
+from railway_station.tests.factories import create_journey, create_train
+
+ALLOCATE_URL = reverse("railway_station:order-allocate")
+
+
+class SeatAllocationTest(TestCase):
+    def setUp(self):
+        self.train = create_train(places_in_cargo=6)
+        self.journey = create_journey(train=self.train)
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+        order = Order.objects.create(user=self.user)
+        # Cargo 1 has seats 3-4 free, cargo 2 is empty.
+        for seat in (1, 2, 5, 6):
+            Ticket.objects.create(
+                journey=self.journey, order=order, cargo=1, seat=seat
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_find_block_prefers_smallest_fitting_range(self):
+        taken = {1: {1, 2, 5, 6}, 2: set()}
+
+        self.assertEqual(find_block(taken, self.train, 2), (1, 3))
+        self.assertEqual(find_block(taken, self.train, 3), (2, 1))
+        self.assertEqual(find_block(taken, self.train, 7), None)
+
+    def test_find_block_falls_back_to_nearest_cargo(self):
+        train = Train(cargo_num=4, places_in_cargo=6)
+        taken = {1: set(), 2: {1, 2, 5, 6}, 3: {3}, 4: set()}
+
+        self.assertEqual(find_block(taken, train, 2, cargo=2), (2, 3))
+        self.assertEqual(find_block(taken, train, 3, cargo=2), (1, 1))
+        self.assertEqual(find_block(taken, train, 3, cargo=3), (3, 4))
+        self.assertEqual(find_block(taken, train, 4, cargo=3), (4, 1))
+
+    def test_allocate_contiguous_seats(self):
+        response = self.client.post(
+            ALLOCATE_URL,
+            {"journey": self.journey.id, "count": 3},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(t["cargo"], t["seat"]) for t in response.data["tickets"]],
+            [(2, 1), (2, 2), (2, 3)],
+        )
+
+    def test_allocate_falls_back_from_full_preferred_cargo(self):
+        response = self.client.post(
+            ALLOCATE_URL,
+            {"journey": self.journey.id, "count": 3, "cargo": 1},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(t["cargo"], t["seat"]) for t in response.data["tickets"]],
+            [(2, 1), (2, 2), (2, 3)],
+        )
+
+    def test_allocate_fails_without_block_in_any_cargo(self):
+        for seat in (3, 4):
+            Ticket.objects.create(
+                journey=self.journey,
+                order=Order.objects.get(),
+                cargo=2,
+                seat=seat,
+            )
+        response = self.client.post(
+            ALLOCATE_URL,
+            {"journey": self.journey.id, "count": 3, "cargo": 1},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_allocate_validates_count(self):
+        response = self.client.post(
+            ALLOCATE_URL,
+            {"journey": self.journey.id, "count": 7},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("count", response.data)
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.analytics import update_rollups
+from railway_station.models import (
+    HourlyOrders,
+    Order,
+    RouteDailySales,
+    Ticket,
+    TrainTypeDailyLoad
+)
+from railway_station.tests.factories import (
+    create_journey,
+    create_route,
+    create_train
+)
+
+
+class AnalyticsRollupTest(TestCase):
+    def setUp(self):
+        train = create_train(places_in_cargo=10)
+        self.train_type = train.train_type
+        self.route = create_route()
+        self.journeys = [
+            create_journey(
+                route=self.route,
+                train=train,
+                departure_time=timezone.make_aware(
+                    datetime(2024, 12, 24, hour)
+                ),
+            )
+            for hour in (8, 12)
+        ]
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+
+    def order(self, journey, seats):
+        order = Order.objects.create(user=self.user)
+        for seat in seats:
+            Ticket.objects.create(
+                journey=journey, order=order, cargo=1, seat=seat
+            )
+        return order
+
+    def test_rollups_are_incremental(self):
+        self.order(self.journeys[0], (1, 2, 3))
+        self.assertEqual(
+            update_rollups(timezone.now()), {"orders": 1, "tickets": 3}
+        )
+        self.order(self.journeys[1], (1,))
+        self.assertEqual(
+            update_rollups(timezone.now()), {"orders": 1, "tickets": 1}
+        )
+        self.assertEqual(
+            update_rollups(timezone.now()), {"orders": 0, "tickets": 0}
+        )
+
+        sales = RouteDailySales.objects.get()
+        self.assertEqual(
+            (sales.route, sales.date, sales.seats_sold),
+            (self.route, datetime(2024, 12, 24).date(), 4),
+        )
+        load = TrainTypeDailyLoad.objects.get()
+        self.assertEqual((load.seats_sold, load.capacity), (4, 40))
+        self.assertEqual(load.load_factor, 0.1)
+        self.assertEqual(
+            sum(HourlyOrders.objects.values_list("orders", flat=True)), 2
+        )
+
+    def test_orders_within_lag_are_left_for_the_next_run(self):
+        self.order(self.journeys[0], (1,))
+        update_rollups(timezone.now() - timedelta(minutes=1))
+
+        self.assertFalse(RouteDailySales.objects.exists())
+        self.assertEqual(update_rollups(timezone.now())["orders"], 1)
+
+    def test_analytics_endpoints_are_admin_only(self):
+        self.order(self.journeys[0], (1, 2))
+        with self.settings(ANALYTICS_ROLLUP_LAG=timedelta(0)):
+            call_command("update_analytics", stdout=StringIO())
+        client = APIClient()
+        url = reverse("railway_station:analytics-route-sales")
+
+        client.force_authenticate(self.user)
+        self.assertEqual(
+            client.get(url).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+        client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@admin.com", password="admin"
+            )
+        )
+        response = client.get(url, {"start": "2024-12-24"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["seats_sold"], 2)
+        self.assertEqual(client.get(url, {"end": "2024-12-23"}).data, [])
+        response = client.get(
+            reverse("railway_station:analytics-load-factor")
+        )
+        self.assertEqual(response.data[0]["load_factor"], 0.05)
@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from railway_station.models import (
+    ArchivedJourney,
+    ArchivedOrder,
+    ArchivedTicket,
+    Crew,
+    Journey,
+    Order,
+    Ticket
+)
+from railway_station.tests.factories import (
+    create_journey,
+    create_route,
+    create_train
+)
+
+ARCHIVED_JOURNEYS_URL = reverse("railway_station:archivedjourney-list")
+ARCHIVED_ORDERS_URL = reverse("railway_station:archivedorder-list")
+
+
+class ArchiveJourneysTest(TestCase):
+    def setUp(self):
+        route = create_route()
+        train = create_train()
+        crew = Crew.objects.create(first_name="John", last_name="Doe")
+        self.old_journey, self.new_journey = (
+            create_journey(
+                route=route,
+                train=train,
+                departure_time=datetime(year, 1, 1, 8, tzinfo=timezone.utc),
+            )
+            for year in (2023, 2025)
+        )
+        self.old_journey.crews.add(crew)
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+        self.old_order = Order.objects.create(user=self.user)
+        self.mixed_order = Order.objects.create(user=self.user)
+        Ticket.objects.create(
+            journey=self.old_journey, order=self.old_order, cargo=1, seat=1
+        )
+        Ticket.objects.create(
+            journey=self.old_journey, order=self.mixed_order, cargo=1, seat=2
+        )
+        Ticket.objects.create(
+            journey=self.new_journey, order=self.mixed_order, cargo=1, seat=2
+        )
+
+    def test_archive_moves_completed_journeys(self):
+        out = StringIO()
+        call_command("archive_journeys", before="2024-01-01", stdout=out)
+
+        self.assertIn(
+            "Archived 1 journeys, 2 tickets and 1 orders", out.getvalue()
+        )
+
+        self.assertEqual(
+            list(Journey.objects.values_list("pk", flat=True)),
+            [self.new_journey.pk],
+        )
+        archived = ArchivedJourney.objects.get()
+        self.assertEqual(archived.id, self.old_journey.id)
+        self.assertEqual(archived.source, "Source")
+        self.assertEqual(archived.crews, ["John Doe"])
+        self.assertEqual(ArchivedTicket.objects.count(), 2)
+        # The mixed order is archived with its first archived ticket.
+        self.assertCountEqual(
+            ArchivedOrder.objects.values_list("pk", flat=True),
+            [self.old_order.pk, self.mixed_order.pk],
+        )
+        self.assertFalse(
+            ArchivedTicket.objects.exclude(
+                order__in=ArchivedOrder.objects.all()
+            ).exists()
+        )
+        self.assertEqual(
+            list(Order.objects.values_list("pk", flat=True)),
+            [self.mixed_order.pk],
+        )
+
+    def test_archived_data_is_readable(self):
+        call_command(
+            "archive_journeys", before="2024-01-01", stdout=StringIO()
+        )
+        client = APIClient()
+
+        response = client.get(ARCHIVED_JOURNEYS_URL)
+        self.assertEqual(response.data["count"], 1)
+
+        client.force_authenticate(self.user)
+        response = client.get(ARCHIVED_ORDERS_URL)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            [len(order["tickets"]) for order in response.data["results"]],
+            [1, 1],
+        )
+
+        response = client.post(ARCHIVED_JOURNEYS_URL, {})
+        self.assertEqual(response.status_code, 403)
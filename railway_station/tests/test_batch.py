@@ -0,0 +1,192 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.models import Order
+from railway_station.tests.factories import create_journey, create_train
+from railway_station.views import JourneyViewSet
+
+BATCH_URL = reverse("batch")
+
+
+class BatchTest(TestCase):
+    def setUp(self):
+        self.journey = create_journey(
+            train=create_train(places_in_cargo=10)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="user@user.com", password="user"
+            )
+        )
+        self.order_request = {
+            "method": "POST",
+            "path": reverse("railway_station:order-list"),
+            "body": {
+                "tickets": [
+                    {"cargo": 1, "seat": 1, "journey": self.journey.id}
+                ]
+            },
+        }
+
+    def test_booking_flow_in_one_request(self):
+        response = self.client.post(
+            BATCH_URL,
+            {
+                "requests": [
+                    {
+                        "method": "GET",
+                        "path": reverse("railway_station:journey-list")
+                        + "?departure_time=2024-12-24",
+                    },
+                    {
+                        "method": "GET",
+                        "path": reverse(
+                            "railway_station:journey-detail",
+                            args=[self.journey.id],
+                        ),
+                    },
+                    self.order_request,
+                    {
+                        "method": "GET",
+                        "path": reverse("railway_station:ticket-list"),
+                    },
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        responses = response.data["responses"]
+        self.assertEqual(
+            [sub["status"] for sub in responses], [200, 200, 201, 200]
+        )
+        self.assertEqual(responses[0]["body"]["count"], 1)
+        self.assertEqual(responses[1]["body"]["id"], self.journey.id)
+        self.assertEqual(responses[3]["body"]["count"], 1)
+
+    def test_paginated_links_keep_the_scheme(self):
+        create_journey(route=self.journey.route, train=self.journey.train)
+        response = self.client.post(
+            BATCH_URL,
+            {
+                "requests": [
+                    {
+                        "method": "GET",
+                        "path": reverse("railway_station:journey-list")
+                        + "?limit=1",
+                    }
+                ]
+            },
+            format="json",
+            secure=True,
+        )
+
+        self.assertEqual(
+            response.data["responses"][0]["body"]["next"],
+            "https://testserver"
+            + reverse("railway_station:journey-list")
+            + "?limit=1&offset=1",
+        )
+
+    def test_atomic_batch_rolls_back_on_failure(self):
+        response = self.client.post(
+            BATCH_URL,
+            {
+                "atomic": True,
+                "requests": [
+                    self.order_request,
+                    self.order_request,
+                    {
+                        "method": "GET",
+                        "path": reverse("railway_station:ticket-list"),
+                    },
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            [sub["status"] for sub in response.data["responses"]], [201, 400]
+        )
+        self.assertFalse(response.data["committed"])
+        self.assertFalse(Order.objects.exists())
+
+    def test_sub_requests_keep_their_permissions(self):
+        response = APIClient().post(
+            BATCH_URL, {"requests": [self.order_request]}, format="json"
+        )
+
+        self.assertEqual(
+            response.data["responses"][0]["status"],
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+    def test_unknown_and_nested_paths(self):
+        response = self.client.post(
+            BATCH_URL,
+            {
+                "requests": [
+                    {"method": "GET", "path": "/missing/"},
+                    {"method": "POST", "path": BATCH_URL, "body": {}},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            [sub["status"] for sub in response.data["responses"]], [404, 400]
+        )
+
+    def test_only_api_views_are_dispatched(self):
+        response = self.client.post(
+            BATCH_URL,
+            {
+                "requests": [
+                    {
+                        "method": "GET",
+                        "path": reverse(
+                            "railway_station:journey-seats-stream",
+                            args=[self.journey.id],
+                        ),
+                    },
+                    {"method": "GET", "path": reverse("admin:index")},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            [sub["status"] for sub in response.data["responses"]], [400, 400]
+        )
+
+    def test_view_error_fails_only_its_entry(self):
+        with (
+            mock.patch.object(
+                JourneyViewSet, "list", side_effect=RuntimeError
+            ),
+            self.assertLogs("railway_station.batch", "ERROR"),
+        ):
+            response = self.client.post(
+                BATCH_URL,
+                {
+                    "requests": [
+                        {
+                            "method": "GET",
+                            "path": reverse("railway_station:journey-list"),
+                        },
+                        self.order_request,
+                    ]
+                },
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [sub["status"] for sub in response.data["responses"]], [500, 201]
+        )
@@ -0,0 +1,103 @@
+from datetime import datetime
+from io import BytesIO
+
+import cbor2
+import msgpack
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.models import Ticket
+from railway_station.parsers import MessagePackParser
+from railway_station.renderers import MessagePackRenderer
+from railway_station.tests.factories import (
+    create_journey,
+    create_route,
+    create_train
+)
+
+JOURNEY_URL = reverse("railway_station:journey-list")
+
+
+class BinaryFormatTest(TestCase):
+    def setUp(self):
+        route = create_route()
+        train = create_train(places_in_cargo=10)
+        self.departure = timezone.make_aware(datetime(2024, 12, 24, 8))
+        self.journeys = [
+            create_journey(
+                route=route,
+                train=train,
+                departure_time=self.departure.replace(day=day),
+            )
+            for day in (24, 25)
+        ]
+        self.client = APIClient()
+
+    def test_msgpack_round_trip(self):
+        data = {
+            "results": [
+                {"name": "Express", "departure_time": "2024-12-24T08:00:00Z"},
+                {"name": "Express", "departure_time": None},
+            ]
+        }
+
+        body = MessagePackRenderer().render(data)
+
+        self.assertEqual(
+            MessagePackParser().parse(BytesIO(body)),
+            {
+                "results": [
+                    {"name": "Express", "departure_time": 1735027200},
+                    {"name": "Express", "departure_time": None},
+                ]
+            },
+        )
+
+    def test_msgpack_response_uses_string_table(self):
+        response = self.client.get(
+            JOURNEY_URL, HTTP_ACCEPT="application/msgpack"
+        )
+
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        unpacker = msgpack.Unpacker(BytesIO(response.content))
+        table = unpacker.unpack()
+        self.assertIn("Express (Passenger)", table)
+        self.assertIn("departure_time", table)
+        data = MessagePackParser().parse(BytesIO(response.content))
+        self.assertEqual(
+            data["results"][0]["departure_time"],
+            int(self.departure.timestamp()),
+        )
+
+    def test_cbor_response(self):
+        response = self.client.get(JOURNEY_URL, HTTP_ACCEPT="application/cbor")
+
+        data = cbor2.loads(response.content)
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(data["results"][1]["train"], "Express (Passenger)")
+
+    def test_order_posted_as_msgpack(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="user@user.com", password="user"
+            )
+        )
+
+        response = self.client.post(
+            reverse("railway_station:order-list"),
+            msgpack.packb(
+                {
+                    "tickets": [
+                        {"cargo": 1, "seat": 1, "journey": self.journeys[0].id}
+                    ]
+                }
+            ),
+            content_type="application/msgpack",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Ticket.objects.exists())
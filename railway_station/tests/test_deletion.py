@@ -0,0 +1,110 @@
+from datetime import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.deletion import delete_station, delete_train
+from railway_station.models import Crew, Journey, Order, Route, Station, Ticket
+from railway_station.tests.factories import create_route, create_train
+from railway_station.views import RouteViewSet
+
+
+class BulkDeletionTest(TestCase):
+    def setUp(self):
+        self.route = create_route()
+        self.source, self.destination = (
+            self.route.source,
+            self.route.destination,
+        )
+        self.train = create_train()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+        order = Order.objects.create(user=self.user)
+        crew = Crew.objects.create(first_name="John", last_name="Doe")
+        for day in (24, 25, 26):
+            journey = Journey.objects.create(
+                route=self.route,
+                train=self.train,
+                departure_time=datetime(2024, 12, day, 8, 0),
+                arrival_time=datetime(2024, 12, day, 10, 0),
+            )
+            journey.crews.add(crew)
+            for seat in range(1, 4):
+                Ticket.objects.create(
+                    journey=journey, order=order, cargo=1, seat=seat
+                )
+
+    def test_delete_station_removes_dependents_in_batches(self):
+        progress = []
+        deleted = delete_station(
+            self.destination,
+            batch_size=2,
+            progress=lambda label, n: progress.append((label, n)),
+        )
+
+        self.assertEqual(
+            deleted,
+            {
+                "tickets": 9,
+                "crews": 3,
+                "journeys": 3,
+                "routes": 1,
+                "stations": 1,
+            },
+        )
+        self.assertIn(("journeys", 3), progress)
+        self.assertFalse(Ticket.objects.exists())
+        self.assertFalse(Journey.objects.exists())
+        self.assertFalse(Route.objects.exists())
+        self.assertTrue(Station.objects.filter(pk=self.source.pk).exists())
+        self.assertTrue(Order.objects.exists())
+
+    def test_delete_train_keeps_route(self):
+        delete_train(self.train)
+
+        self.assertFalse(Journey.objects.exists())
+        self.assertTrue(Route.objects.exists())
+
+    def test_destroy_station_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@admin.com", password="admin"
+            )
+        )
+        response = client.delete(
+            reverse(
+                "railway_station:station-detail", args=[self.source.id]
+            )
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Ticket.objects.exists())
+
+    @override_settings(DELETION_BATCHES_PER_REQUEST=1)
+    @mock.patch.object(RouteViewSet, "deletion_batch_size", 1)
+    def test_destroy_resumes_until_done(self):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@admin.com", password="admin"
+            )
+        )
+        url = reverse("railway_station:route-detail", args=[self.route.id])
+
+        for left in (2, 1):
+            response = client.delete(url)
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            self.assertEqual(response.data["journeys"], 1)
+            self.assertEqual(Journey.objects.count(), left)
+            self.assertTrue(Route.objects.exists())
+
+        response = client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Journey.objects.exists())
+        self.assertFalse(Route.objects.exists())
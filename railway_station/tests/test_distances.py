@@ -0,0 +1,154 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station import distances
+from railway_station.distances import (
+    VERSION_CACHE_KEY,
+    DistanceMatrix,
+    get_distance_matrix
+)
+from railway_station.models import Route
+from railway_station.tests.factories import create_route, create_station
+
+DISTANCE_URL = reverse("railway_station:station-distance")
+FARE_URL = reverse("railway_station:station-fare")
+
+
+class DistanceMatrixTest(TestCase):
+    def test_build_finds_shortest_paths(self):
+        matrix = DistanceMatrix.build(
+            [1, 2, 3, 4], [(1, 2, 10), (2, 3, 5), (1, 3, 20), (3, 1, 1)]
+        )
+
+        self.assertEqual(matrix.distance(1, 3), 15)
+        self.assertEqual(matrix.distance(3, 2), 11)
+        self.assertEqual(matrix.distance(2, 2), 0)
+        self.assertIsNone(matrix.distance(1, 4))
+        self.assertIsNone(matrix.distance(1, 5))
+
+    def test_add_route_matches_rebuild(self):
+        edges = [(1, 2, 10), (2, 3, 5), (3, 4, 7), (4, 1, 3)]
+        matrix = DistanceMatrix.build([1, 2, 3, 4], edges)
+
+        matrix.add_route(1, 3, 4)
+        matrix.add_route(4, 5, 2)
+
+        expected = DistanceMatrix.build(
+            [1, 2, 3, 4, 5], edges + [(1, 3, 4), (4, 5, 2)]
+        )
+        np.testing.assert_array_equal(matrix.distances, expected.distances)
+
+    def test_save_and_load(self):
+        matrix = DistanceMatrix.build([1, 2], [(1, 2, 10)])
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "matrix.npz"
+            matrix.save(path)
+            loaded = DistanceMatrix.load(path)
+
+        self.assertEqual(loaded.version, matrix.version)
+        self.assertEqual(loaded.distance(1, 2), 10)
+
+
+class DistanceEndpointTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            DISTANCE_MATRIX_FILE=Path(directory.name) / "matrix.npz"
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # Also drops the station index version, names are resolved with it.
+        cache.clear()
+        distances._state.update(version=None, matrix=None)
+
+        self.kyiv, self.lviv, self.odesa = (
+            create_station(name, latitude=50, longitude=30)
+            for name in ("Kyiv", "Lviv", "Odesa")
+        )
+        self.route = self.add_route(self.kyiv, self.lviv, 540)
+        self.add_route(self.lviv, self.odesa, 790)
+        self.client = APIClient()
+
+    def add_route(self, source, destination, distance):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_route(source, destination, distance)
+
+    def test_distance_and_fare(self):
+        response = self.client.get(
+            DISTANCE_URL, {"from": "Kyiv", "to": self.odesa.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["distance"], 1330)
+
+        response = self.client.get(FARE_URL, {"from": "Kyiv", "to": "Odesa"})
+        self.assertEqual(response.data["fare"], "68.50")
+
+    def test_unknown_station_and_unreachable_pair(self):
+        response = self.client.get(DISTANCE_URL, {"from": "Kyiv"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(
+            DISTANCE_URL, {"from": "Kyiv", "to": "Nowhere"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(
+            DISTANCE_URL, {"from": "Odesa", "to": "Kyiv"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_route_changes_update_matrix(self):
+        self.add_route(self.kyiv, self.odesa, 1000)
+        self.assertEqual(
+            get_distance_matrix().distance(self.kyiv.id, self.odesa.id), 1000
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.route.distance = 100
+            self.route.save()
+        self.assertEqual(
+            get_distance_matrix().distance(self.kyiv.id, self.odesa.id), 890
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.route.delete()
+        self.assertEqual(
+            get_distance_matrix().distance(self.kyiv.id, self.odesa.id), 1000
+        )
+
+    def test_matrix_is_reloaded_from_file(self):
+        version = get_distance_matrix().version
+        distances._state.update(version=None, matrix=None)
+
+        with self.assertNumQueries(0):
+            matrix = get_distance_matrix()
+
+        self.assertEqual(matrix.version, version)
+        self.assertEqual(matrix.distance(self.kyiv.id, self.odesa.id), 1330)
+
+    def test_updates_start_from_the_published_file(self):
+        # Another worker still holds the matrix without the new route and
+        # has not seen the version published for it.
+        stale = get_distance_matrix()
+        self.add_route(self.kyiv, self.odesa, 1000)
+        cache.delete(VERSION_CACHE_KEY)
+        distances._state.update(version=stale.version, matrix=stale)
+
+        self.add_route(self.odesa, self.kyiv, 1200)
+
+        matrix = DistanceMatrix.load(distances._matrix_file())
+        self.assertEqual(matrix.distance(self.kyiv.id, self.odesa.id), 1000)
+        self.assertEqual(matrix.distance(self.odesa.id, self.kyiv.id), 1200)
+
+    def test_saving_a_loaded_route_does_not_read_it_back(self):
+        route = Route.objects.get(pk=self.route.pk)
+        route.distance = 600
+
+        with self.assertNumQueries(1):
+            route.save()
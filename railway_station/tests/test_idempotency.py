@@ -0,0 +1,81 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.models import IdempotencyKey, Order
+from railway_station.tests.factories import create_journey
+
+ORDERS_URL = reverse("railway_station:order-list")
+
+
+class IdempotentOrderTest(TestCase):
+    def setUp(self):
+        self.journey = create_journey()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post_order(self, seat, key="retry-1"):
+        return self.client.post(
+            ORDERS_URL,
+            {
+                "tickets": [
+                    {"cargo": 1, "seat": seat, "journey": self.journey.id}
+                ]
+            },
+            format="json",
+            headers={"Idempotency-Key": key},
+        )
+
+    def test_retry_replays_stored_response(self):
+        first = self.post_order(seat=1)
+        second = self.post_order(seat=1)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_key_reused_for_other_request(self):
+        self.post_order(seat=1)
+
+        response = self.post_order(seat=2)
+
+        self.assertEqual(
+            response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failed_request_is_not_stored(self):
+        response = self.post_order(seat=100)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        response = self.post_order(seat=1)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_sweeper_deletes_expired_keys(self):
+        self.post_order(seat=1)
+        self.post_order(seat=2, key="retry-2")
+        IdempotencyKey.objects.filter(key="retry-1").update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+
+        out = StringIO()
+        call_command("sweep_idempotency_keys", stdout=out)
+
+        self.assertIn("1 idempotency keys deleted", out.getvalue())
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list("key", flat=True)),
+            ["retry-2"],
+        )
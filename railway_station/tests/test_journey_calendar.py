@@ -0,0 +1,103 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.models import Order, Ticket
+from railway_station.signals import send_seats_changed
+from railway_station.tests.factories import (
+    create_journey,
+    create_route,
+    create_train
+)
+
+CALENDAR_URL = reverse("railway_station:journey-calendar")
+
+
+class JourneyCalendarTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        train = create_train(places_in_cargo=5)
+        route = create_route()
+        self.source, self.destination = route.source, route.destination
+        self.journeys = [
+            create_journey(
+                route=route,
+                train=train,
+                departure_time=timezone.make_aware(datetime(*departure)),
+            )
+            for departure in (
+                (2024, 12, 24, 8),
+                (2024, 12, 24, 12),
+                (2024, 12, 31, 8),
+                (2025, 1, 1, 8),
+            )
+        ]
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+        self.order = Order.objects.create(user=self.user)
+        for seat in (1, 2, 3):
+            Ticket.objects.create(
+                journey=self.journeys[1], order=self.order, cargo=1, seat=seat
+            )
+        self.client = APIClient()
+        self.params = {
+            "source": self.source.id,
+            "destination": self.destination.id,
+            "month": "2024-12",
+        }
+
+    def test_calendar_groups_journeys_by_day(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(CALENDAR_URL, self.params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["days"],
+            [
+                {
+                    "date": datetime(2024, 12, 24).date(),
+                    "journeys": 2,
+                    "min_available": 7,
+                },
+                {
+                    "date": datetime(2024, 12, 31).date(),
+                    "journeys": 1,
+                    "min_available": 10,
+                },
+            ],
+        )
+
+    def test_calendar_is_cached_until_seats_change(self):
+        self.client.get(CALENDAR_URL, self.params)
+        with self.assertNumQueries(0):
+            self.client.get(CALENDAR_URL, self.params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = Ticket.objects.create(
+                journey=self.journeys[2], order=self.order, cargo=1, seat=1
+            )
+            send_seats_changed(taken=[ticket])
+        response = self.client.get(CALENDAR_URL, self.params)
+
+        self.assertEqual(response.data["days"][1]["min_available"], 9)
+
+    def test_calendar_accepts_station_names(self):
+        response = self.client.get(
+            CALENDAR_URL, {**self.params, "destination": "Destination"}
+        )
+
+        self.assertEqual(len(response.data["days"]), 2)
+
+    def test_calendar_requires_valid_month(self):
+        response = self.client.get(
+            CALENDAR_URL, {**self.params, "month": "2024-13"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
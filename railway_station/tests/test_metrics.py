@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.tests.factories import create_journey, create_train
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        self.journey = create_journey(
+            train=create_train(places_in_cargo=10)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="user@user.com", password="user"
+            )
+        )
+
+    def order(self, seat):
+        return self.client.post(
+            reverse("railway_station:order-list"),
+            {
+                "tickets": [
+                    {"cargo": 1, "seat": seat, "journey": self.journey.id}
+                ]
+            },
+            format="json",
+        )
+
+    def test_request_metrics_per_view_and_action(self):
+        labels = {"view": "JourneyViewSet", "action": "list"}
+        requests = sample(
+            "railway_request_duration_seconds_count",
+            method="GET",
+            status="2xx",
+            **labels,
+        )
+        deep_pages = sample(
+            "railway_pagination_offset_bucket",
+            view="JourneyViewSet",
+            le="100.0",
+        )
+
+        self.client.get(
+            reverse("railway_station:journey-list"), {"offset": 500}
+        )
+
+        self.assertEqual(
+            sample(
+                "railway_request_duration_seconds_count",
+                method="GET",
+                status="2xx",
+                **labels,
+            ),
+            requests + 1,
+        )
+        self.assertGreater(
+            sample("railway_request_db_queries_sum", **labels), 0
+        )
+        self.assertEqual(
+            sample(
+                "railway_pagination_offset_bucket",
+                view="JourneyViewSet",
+                le="100.0",
+            ),
+            deep_pages,
+        )
+
+    def test_order_and_rejection_counters(self):
+        orders = sample("railway_orders_created_total")
+        tickets = sample("railway_tickets_created_total")
+        rejections = sample("railway_seat_rejections_total", reason="taken")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.order(1).status_code, 201)
+        self.assertEqual(self.order(1).status_code, 400)
+        self.assertEqual(self.order(11).status_code, 400)
+
+        self.assertEqual(sample("railway_orders_created_total"), orders + 1)
+        self.assertEqual(sample("railway_tickets_created_total"), tickets + 1)
+        self.assertEqual(
+            sample("railway_seat_rejections_total", reason="taken"),
+            rejections + 1,
+        )
+        self.assertGreaterEqual(
+            sample("railway_seat_rejections_total", reason="out_of_range"), 1
+        )
+
+    def test_metrics_endpoint(self):
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            b"# TYPE railway_request_duration_seconds histogram",
+            response.content,
+        )
+        self.assertIn(
+            b"railway_process_resident_memory_bytes", response.content
+        )
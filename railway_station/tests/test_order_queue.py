@@ -0,0 +1,136 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.models import Order, OrderJob
+from railway_station.order_queue import process_batch
+from railway_station.serializers import OrderSerializer
+from railway_station.tests.factories import create_journey
+
+ORDERS_URL = reverse("railway_station:order-list")
+ORDER_JOB_STATS_URL = reverse("railway_station:orderjob-stats")
+
+
+@override_settings(ORDER_QUEUE_ENABLED=True)
+class OrderQueueTest(TestCase):
+    def setUp(self):
+        self.journey = create_journey()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post_order(self, seat):
+        return self.client.post(
+            ORDERS_URL,
+            {
+                "tickets": [
+                    {"cargo": 1, "seat": seat, "journey": self.journey.id}
+                ]
+            },
+            format="json",
+        )
+
+    def test_order_is_queued_and_processed(self):
+        response = self.post_order(seat=1)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], OrderJob.Status.PENDING)
+        self.assertFalse(Order.objects.exists())
+
+        out = StringIO()
+        call_command("process_order_queue", "--once", stdout=out)
+
+        self.assertIn("1 order jobs processed", out.getvalue())
+        job = self.client.get(response.data["status_url"])
+        self.assertEqual(job.data["status"], OrderJob.Status.DONE)
+        self.assertEqual(
+            job.data["order"], Order.objects.get(user=self.user).id
+        )
+
+    def test_invalid_shape_is_rejected_immediately(self):
+        response = self.client.post(
+            ORDERS_URL, {"tickets": [{"cargo": "a"}]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(OrderJob.objects.exists())
+
+    def test_taken_place_fails_job(self):
+        self.post_order(seat=1)
+        self.post_order(seat=1)
+
+        out = StringIO()
+        call_command("process_order_queue", "--once", stdout=out)
+
+        self.assertIn("2 order jobs processed", out.getvalue())
+        self.assertEqual(Order.objects.count(), 1)
+        failed = OrderJob.objects.get(status=OrderJob.Status.FAILED)
+        self.assertEqual(
+            failed.errors,
+            {"tickets": [{"non_field_errors": ["This place already taken"]}]},
+        )
+
+    def test_unexpected_error_fails_only_its_job(self):
+        self.post_order(seat=1)
+        self.post_order(seat=2)
+        save = OrderSerializer.save
+        calls = []
+
+        def flaky_save(serializer, **kwargs):
+            calls.append(serializer)
+            if len(calls) == 1:
+                raise OperationalError("deadlock detected")
+            return save(serializer, **kwargs)
+
+        with (
+            mock.patch.object(OrderSerializer, "save", flaky_save),
+            self.assertLogs("railway_station.order_queue", "ERROR"),
+        ):
+            self.assertEqual(process_batch(10), 2)
+
+        self.assertEqual(process_batch(10), 0)
+        failed, done = OrderJob.objects.order_by("created_at", "pk")
+        self.assertEqual(failed.status, OrderJob.Status.FAILED)
+        self.assertEqual(
+            failed.errors, {"non_field_errors": ["OperationalError"]}
+        )
+        self.assertEqual(done.status, OrderJob.Status.DONE)
+
+    def test_abandoned_claims_are_reclaimed(self):
+        self.post_order(seat=1)
+        self.post_order(seat=2)
+        OrderJob.objects.update(
+            status=OrderJob.Status.PROCESSING, claimed_at=timezone.now()
+        )
+        self.assertEqual(process_batch(10), 0)
+
+        OrderJob.objects.filter(pk=OrderJob.objects.first().pk).update(
+            claimed_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(process_batch(10), 1)
+
+    def test_stats_for_admin(self):
+        self.post_order(seat=1)
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@admin.com", password="admin"
+            )
+        )
+
+        response = self.client.get(ORDER_JOB_STATS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["pending"], 1)
+        self.assertEqual(response.data["processed_last_minute"], 0)
@@ -0,0 +1,85 @@
+import pstats
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from railway_station import profiling
+
+JOURNEY_URL = reverse("railway_station:journey-list")
+PROFILE_URL = reverse("railway_station:profile-list")
+
+
+class ProfilingTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            PROFILING_ENABLED=True, PROFILING_DIR=directory.name
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@admin.com", password="admin"
+        )
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+
+    def get_journeys(self, user, **extra):
+        return self.client.get(
+            JOURNEY_URL,
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+            **extra,
+        )
+
+    def test_staff_request_is_profiled_and_downloadable(self):
+        response = self.get_journeys(self.admin, HTTP_X_PROFILE="1")
+        profile_id = response["X-Profile-Id"]
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        listed = client.get(PROFILE_URL).data
+        self.assertEqual(listed[0]["id"], profile_id)
+        self.assertEqual(listed[0]["path"], JOURNEY_URL)
+        self.assertFalse(listed[0]["sampled"])
+
+        download = client.get(
+            reverse("railway_station:profile-download", args=[profile_id])
+        )
+        self.assertEqual(download.status_code, status.HTTP_200_OK)
+        with tempfile.NamedTemporaryFile() as file:
+            file.write(b"".join(download.streaming_content))
+            file.flush()
+            stats = pstats.Stats(file.name)
+        self.assertTrue(stats.total_calls)
+
+    def test_non_staff_and_unrequested_are_not_profiled(self):
+        self.assertNotIn(
+            "X-Profile-Id",
+            self.get_journeys(self.user, QUERY_STRING="profile=1"),
+        )
+        self.assertNotIn("X-Profile-Id", self.get_journeys(self.admin))
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0)
+    def test_sampled_requests_are_profiled(self):
+        self.assertIn("X-Profile-Id", self.client.get(JOURNEY_URL))
+
+    def test_requests_are_not_profiled_while_another_one_is(self):
+        with profiling._profiler_lock:
+            response = self.get_journeys(self.admin, HTTP_X_PROFILE="1")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Profile-Id", response)
+
+    def test_profiles_are_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        self.assertEqual(
+            client.get(PROFILE_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
@@ -172,6 +173,16 @@ class RouteViewSetTest(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_route_constraints_enforced_by_database(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Route.objects.create(
+                source=self.source, destination=self.source, distance=1
+            )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Route.objects.create(
+                source=self.source, destination=self.destination, distance=0
+            )
+
 
 class OrderViewSetTest(APITestCase):
     def setUp(self):
@@ -240,6 +251,26 @@ class OrderViewSetTest(APITestCase):
 
         response = self.client.post(ORDERS_URL, payload, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["tickets"][0]["non_field_errors"],
+            ["This place already taken"],
+        )
+
+    def test_same_place_in_other_journey_is_free(self):
+        other_journey = Journey.objects.create(
+            route=self.route,
+            train=self.train,
+            departure_time=datetime(2024, 12, 25, 8, 0),
+            arrival_time=datetime(2024, 12, 25, 10, 0),
+        )
+        self.client.force_authenticate(self.normal_user)
+        for journey in (self.journey, other_journey):
+            response = self.client.post(
+                ORDERS_URL,
+                {"tickets": [{"cargo": 1, "seat": 1, "journey": journey.id}]},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
 
 class TicketViewSetTest(APITestCase):
@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.models import Crew, Journey
+from railway_station.scheduling import IntervalIndex
+from railway_station.tests.factories import (
+    create_journey,
+    create_route,
+    create_train
+)
+
+JOURNEYS_URL = reverse("railway_station:journey-list")
+CONFLICTS_URL = reverse("railway_station:journey-conflicts")
+FREE_RESOURCES_URL = reverse("railway_station:journey-free-resources")
+
+
+def at(hour):
+    return datetime(2024, 12, 24, hour, tzinfo=timezone.utc)
+
+
+class IntervalIndexTest(TestCase):
+    def test_overlapping_and_conflicts(self):
+        index = IntervalIndex(
+            [
+                ("a", 1, 5, "long"),
+                ("a", 2, 3, "short"),
+                ("a", 6, 8, "late"),
+                ("b", 1, 9, "other"),
+            ]
+        )
+
+        self.assertEqual(index.overlapping("a", 4, 7), ["long", "late"])
+        self.assertEqual(index.overlapping("a", 5, 6), [])
+        self.assertEqual(index.overlapping("c", 0, 10), [])
+        self.assertEqual(list(index.conflicts()), [("a", "long", "short")])
+
+
+class JourneyDoubleBookingTest(TestCase):
+    def setUp(self):
+        self.route = create_route()
+        self.train = create_train()
+        self.spare_train = create_train(name="Spare")
+        self.crew = Crew.objects.create(first_name="John", last_name="Doe")
+        self.spare_crew = Crew.objects.create(
+            first_name="Jane", last_name="Doe"
+        )
+        self.journey = create_journey(
+            route=self.route, train=self.train, departure_time=at(8)
+        )
+        self.journey.crews.add(self.crew)
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@admin.com", password="admin"
+            )
+        )
+
+    def payload(self, train, crews, departure=9, arrival=11):
+        return {
+            "route": self.route.id,
+            "train": train.id,
+            "crews": [crew.id for crew in crews],
+            "departure_time": at(departure).isoformat(),
+            "arrival_time": at(arrival).isoformat(),
+        }
+
+    def test_create_rejects_busy_train_and_crew(self):
+        response = self.client.post(
+            JOURNEYS_URL, self.payload(self.train, [self.crew]), format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("train", response.data)
+        self.assertIn("crews", response.data)
+
+    def test_create_allows_free_resources_and_adjacent_slots(self):
+        response = self.client.post(
+            JOURNEYS_URL,
+            self.payload(self.spare_train, [self.spare_crew]),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(
+            JOURNEYS_URL,
+            self.payload(self.train, [self.crew], departure=10, arrival=12),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_update_does_not_conflict_with_itself(self):
+        response = self.client.patch(
+            reverse("railway_station:journey-detail", args=[self.journey.id]),
+            {"arrival_time": at(11).isoformat()},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_conflicts_audit(self):
+        other = Journey.objects.create(
+            route=self.route,
+            train=self.spare_train,
+            departure_time=at(9),
+            arrival_time=at(11),
+        )
+        other.crews.add(self.crew)
+
+        response = self.client.get(CONFLICTS_URL)
+
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "resource": "crew",
+                    "id": self.crew.id,
+                    "journeys": [self.journey.id, other.id],
+                }
+            ],
+        )
+
+    def test_free_resources_in_window(self):
+        response = self.client.get(
+            FREE_RESOURCES_URL,
+            {"start": at(9).isoformat(), "end": at(12).isoformat()},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [train["id"] for train in response.data["trains"]],
+            [self.spare_train.id],
+        )
+        self.assertEqual(
+            [crew["id"] for crew in response.data["crews"]],
+            [self.spare_crew.id],
+        )
+        response = self.client.get(FREE_RESOURCES_URL)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,49 @@
+import gzip
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+SCHEMA_URL = reverse("schema")
+
+
+class StaticSchemaTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings_override = override_settings(
+            SCHEMA_ARTIFACT_DIR=self.directory
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_live_schema_without_artifact(self):
+        response = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+    def test_serves_prebuilt_artifact(self):
+        call_command("build_schema", stdout=StringIO())
+
+        response = self.client.get(SCHEMA_URL, {"format": "json"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("public, max-age=", response["Cache-Control"])
+        self.assertIn("/api/v1/station/journeys/", response.json()["paths"])
+
+        compressed = self.client.get(
+            SCHEMA_URL, {"format": "json"}, HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(compressed.content), response.content)
+
+        cached = self.client.get(
+            SCHEMA_URL,
+            {"format": "json"},
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(cached.status_code, 304)
@@ -0,0 +1,119 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from railway_station.deletion import delete_journeys
+from railway_station.models import Journey, Order, Ticket
+from railway_station.signals import seats_changed
+from railway_station.tests.factories import create_journey
+
+
+def parse_event(chunk):
+    name, data = chunk.decode().strip().split("\n")
+    return name.removeprefix("event: "), json.loads(data[len("data: "):])
+
+
+class SeatEventsTest(TestCase):
+    def setUp(self):
+        self.journey = create_journey()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+
+    def test_order_sends_seats_changed_after_commit(self):
+        received = []
+
+        def listener(sender, **kwargs):
+            received.append(kwargs)
+
+        seats_changed.connect(listener)
+        self.addCleanup(seats_changed.disconnect, listener)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post(
+                reverse("railway_station:order-list"),
+                {
+                    "tickets": [
+                        {"cargo": 1, "seat": 1, "journey": self.journey.id},
+                        {"cargo": 2, "seat": 5, "journey": self.journey.id},
+                    ]
+                },
+                format="json",
+            )
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0]["journey_id"], self.journey.id)
+        self.assertEqual(received[0]["taken"], [(1, 1), (2, 5)])
+
+    def test_journey_deletion_releases_seats_after_commit(self):
+        order = Order.objects.create(user=self.user)
+        for seat in (3, 4):
+            Ticket.objects.create(
+                journey=self.journey, order=order, cargo=2, seat=seat
+            )
+        received = []
+
+        def listener(sender, **kwargs):
+            received.append(kwargs)
+
+        seats_changed.connect(listener)
+        self.addCleanup(seats_changed.disconnect, listener)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            delete_journeys(Journey.objects.filter(pk=self.journey.pk))
+            self.assertEqual(received, [])
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0]["journey_id"], self.journey.id)
+        self.assertEqual(received[0]["taken"], [])
+        self.assertCountEqual(received[0]["released"], [(2, 3), (2, 4)])
+
+    async def test_stream_sends_snapshot_then_deltas(self):
+        response = await self.async_client.get(
+            reverse(
+                "railway_station:journey-seats-stream",
+                args=[self.journey.id],
+            )
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+
+        name, data = parse_event(await anext(stream))
+        self.assertEqual(name, "snapshot")
+        self.assertEqual(data["taken"], [])
+        self.assertEqual(data["places_in_cargo"], 50)
+
+        # Senders run in synchronous code after the ticket transaction.
+        await sync_to_async(seats_changed.send)(
+            sender=None,
+            journey_id=self.journey.id,
+            taken=[(1, 3)],
+            released=[],
+        )
+        name, data = parse_event(await anext(stream))
+        self.assertEqual(name, "seats")
+        self.assertEqual(data["taken"], [[1, 3]])
+        await stream.aclose()
+
+    async def test_stream_for_missing_journey(self):
+        response = await self.async_client.get(
+            reverse("railway_station:journey-seats-stream", args=[0])
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_stream_needs_asgi(self):
+        response = self.client.get(
+            reverse(
+                "railway_station:journey-seats-stream",
+                args=[self.journey.id],
+            )
+        )
+
+        self.assertEqual(response.status_code, 501)
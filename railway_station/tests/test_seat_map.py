@@ -0,0 +1,77 @@
+import base64
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from railway_station.models import Order, Ticket
+from railway_station.seat_map import free_ranges
+from railway_station.tests.factories import create_journey, create_train
+
+
+class FreeRangesTest(TestCase):
+    def test_free_ranges(self):
+        self.assertEqual(free_ranges(set(), 3), [[1, 3]])
+        self.assertEqual(free_ranges({1, 4, 5}, 6), [[2, 3], [6, 6]])
+        self.assertEqual(free_ranges({1, 2}, 2), [])
+
+
+class SeatMapEndpointTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.journey = create_journey(
+            train=create_train(places_in_cargo=10)
+        )
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+        order = Order.objects.create(user=self.user)
+        for seat in (1, 2, 9):
+            Ticket.objects.create(
+                journey=self.journey, order=order, cargo=1, seat=seat
+            )
+        self.url = reverse(
+            "railway_station:journey-seat-map", args=[self.journey.id]
+        )
+        self.client = APIClient()
+
+    def test_seat_map(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        first, second = response.data["cargos"]
+        self.assertEqual(first["taken"], 3)
+        self.assertEqual(first["free"], [[3, 8], [10, 10]])
+        self.assertEqual(
+            base64.b64decode(first["bitmap"]), bytes([0b00000011, 0b1])
+        )
+        self.assertEqual(second["free"], [[1, 10]])
+
+    def test_seat_map_of_invalid_journey_is_not_found(self):
+        response = self.client.get(
+            self.url.replace(str(self.journey.id), "abc")
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_seat_map_is_cached_and_invalidated_by_orders(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("railway_station:order-list"),
+                {
+                    "tickets": [
+                        {"cargo": 2, "seat": 1, "journey": self.journey.id}
+                    ]
+                },
+                format="json",
+            )
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["cargos"][1]["free"], [[2, 10]])
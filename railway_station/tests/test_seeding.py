@@ -0,0 +1,108 @@
+import tempfile
+from collections import Counter
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase, override_settings
+
+from railway_station import distances
+from railway_station.distances import get_distance_matrix
+from railway_station.models import Journey, Order, Route, Station, Ticket
+from railway_station.search import get_station_index
+from railway_station.seeding import seed
+
+
+class SeedTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            DISTANCE_MATRIX_FILE=Path(directory.name) / "matrix.npz"
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        cache.clear()
+        distances._state.update(version=None, matrix=None)
+
+    def test_seed_creates_consistent_data(self):
+        created = seed(
+            stations=20,
+            routes=40,
+            trains=5,
+            journeys=100,
+            users=30,
+            orders=300,
+        )
+
+        self.assertEqual(created["journeys"], Journey.objects.count())
+        self.assertEqual(created["tickets"], Ticket.objects.count())
+        self.assertFalse(
+            Ticket.objects.filter(
+                seat__gt=F("journey__train__places_in_cargo")
+            ).exists()
+        )
+        for train_id in {
+            journey.train_id for journey in Journey.objects.all()
+        }:
+            journeys = list(
+                Journey.objects.filter(train_id=train_id).order_by(
+                    "departure_time"
+                )
+            )
+            for previous, journey in zip(journeys, journeys[1:]):
+                self.assertLess(previous.arrival_time, journey.departure_time)
+
+    def test_seed_refreshes_station_index_and_distances(self):
+        get_station_index()
+        get_distance_matrix()
+
+        seed(
+            stations=5,
+            routes=5,
+            trains=2,
+            journeys=10,
+            users=3,
+            orders=10,
+        )
+
+        station = Station.objects.first()
+        self.assertEqual(get_station_index().resolve(station.name), station.id)
+        route = Route.objects.first()
+        self.assertIsNotNone(
+            get_distance_matrix().distance(
+                route.source_id, route.destination_id
+            )
+        )
+
+    def test_orders_are_skewed_towards_few_users(self):
+        seed(
+            stations=10,
+            routes=20,
+            trains=5,
+            journeys=50,
+            users=50,
+            orders=500,
+        )
+
+        per_user = Counter(Order.objects.values_list("user_id", flat=True))
+        self.assertGreater(per_user.most_common(1)[0][1], 500 / 50 * 5)
+
+    def test_command(self):
+        out = StringIO()
+
+        call_command(
+            "seed_scale",
+            stations=5,
+            routes=5,
+            trains=2,
+            journeys=10,
+            users=3,
+            orders=10,
+            stdout=out,
+        )
+
+        self.assertIn("journeys: 10", out.getvalue())
+        self.assertEqual(Order.objects.count(), 10)
@@ -0,0 +1,74 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from railway_station.models import Station
+from railway_station.slow_queries import (
+    get_logger,
+    log_slow_queries,
+    normalize,
+    params_shape
+)
+
+
+class SlowQueryLogTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.log_file = Path(directory.name) / "slow.jsonl"
+        settings = override_settings(
+            SLOW_QUERY_THRESHOLD=0, SLOW_QUERY_LOG_FILE=self.log_file
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        get_logger.cache_clear()
+        self.addCleanup(get_logger.cache_clear)
+
+    def entries(self):
+        for handler in get_logger().handlers:
+            handler.flush()
+        return [json.loads(line) for line in self.log_file.open()]
+
+    def test_normalize_and_params_shape(self):
+        self.assertEqual(
+            normalize(
+                "SELECT * FROM t WHERE id IN (%s, %s,  %s) AND name = 'x'"
+                " LIMIT 21"
+            ),
+            "SELECT * FROM t WHERE id IN (?+) AND name = ? LIMIT ?",
+        )
+        self.assertEqual(
+            params_shape([1, "a", [1, 2]], False), ["int", "str", "list[2]"]
+        )
+
+    def test_slow_queries_are_logged_with_plan(self):
+        with log_slow_queries("test"):
+            list(Station.objects.filter(name__in=["A", "B"]))
+
+        entry = self.entries()[-1]
+        self.assertEqual(entry["origin"], "test")
+        self.assertIn("IN (?+)", entry["sql"])
+        self.assertEqual(entry["params"], ["str", "str"])
+        self.assertTrue(entry["plan"])
+
+    def test_middleware_and_report(self):
+        with self.settings(SLOW_QUERY_LOG_ENABLED=True):
+            self.client.get(reverse("railway_station:journey-list"))
+        self.assertIn(
+            "GET /api/v1/station/journeys/ JourneyViewSet.list",
+            {entry["origin"] for entry in self.entries()},
+        )
+
+        out = StringIO()
+        call_command(
+            "slow_query_report", file=str(self.log_file), json=True, stdout=out
+        )
+        summary = json.loads(out.getvalue())
+        self.assertEqual(
+            sum(query["count"] for query in summary), len(self.entries())
+        )
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from railway_station.models import (
+    Journey,
+    Route,
+    Station,
+    Train,
+    TrainType
+)
+from railway_station.search import StationIndex
+
+STATION_SEARCH_URL = reverse("railway_station:station-search")
+JOURNEYS_URL = reverse("railway_station:journey-list")
+
+
+class StationIndexTest(TestCase):
+    def setUp(self):
+        self.index = StationIndex(
+            [
+                (1, "Kyiv"),
+                (2, "Kyiv-Pasazhyrskyi"),
+                (3, "Lviv"),
+                (4, "Kharkiv"),
+            ]
+        )
+
+    def test_prefix_is_case_insensitive(self):
+        self.assertEqual(self.index.prefix("KYI", 10), [1, 2])
+        self.assertEqual(self.index.prefix("kyi", 1), [1])
+
+    def test_fuzzy_matches_misspelling(self):
+        self.assertEqual(self.index.fuzzy("Lviw", 10), [3])
+        self.assertEqual(self.index.search("Kharkov"), [4])
+
+    def test_resolve_exact_name(self):
+        self.assertEqual(self.index.resolve("lviv"), 3)
+        self.assertIsNone(self.index.resolve("Odesa"))
+
+
+class StationSearchEndpointTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.source = Station.objects.create(
+            name="Kyiv", latitude=50.45, longitude=30.52
+        )
+        self.destination = Station.objects.create(
+            name="Lviv", latitude=49.84, longitude=24.03
+        )
+        self.journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=self.source, destination=self.destination, distance=540
+            ),
+            train=Train.objects.create(
+                name="Express",
+                cargo_num=2,
+                places_in_cargo=50,
+                train_type=TrainType.objects.create(name="Passenger"),
+            ),
+            departure_time=timezone.make_aware(datetime(2024, 12, 24, 8)),
+            arrival_time=timezone.make_aware(datetime(2024, 12, 24, 14)),
+        )
+        self.client = APIClient()
+
+    def test_search_is_public_and_sees_new_stations(self):
+        response = self.client.get(STATION_SEARCH_URL, {"q": "ky"})
+        self.assertEqual(
+            response.data, [{"id": self.source.id, "name": "Kyiv"}]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            station = Station.objects.create(
+                name="Kyiv-Volynskyi", latitude=50.44, longitude=30.45
+            )
+        response = self.client.get(STATION_SEARCH_URL, {"q": "ky"})
+        self.assertEqual(
+            [item["id"] for item in response.data],
+            [self.source.id, station.id],
+        )
+
+    def test_journeys_filter_by_station_name(self):
+        response = self.client.get(
+            JOURNEYS_URL, {"source": "kyiv", "destination": "Lviv"}
+        )
+        self.assertEqual(response.data["count"], 1)
+
+        response = self.client.get(JOURNEYS_URL, {"source": "Odesa"})
+        self.assertEqual(response.data["count"], 0)
@@ -0,0 +1,128 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, pre_delete
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.deletion import delete_journeys, delete_station
+from railway_station.models import Journey, TrainType
+from railway_station.sync import make_token
+from railway_station.tests.factories import (
+    create_journey,
+    create_route,
+    create_train
+)
+
+SYNC_URL = reverse("railway_station:sync")
+
+
+@override_settings(SYNC_LAG=timedelta(0))
+class SyncTest(TestCase):
+    def setUp(self):
+        self.route = create_route()
+        self.source, self.destination = (
+            self.route.source,
+            self.route.destination,
+        )
+        self.journey = create_journey(
+            route=self.route, train=create_train(places_in_cargo=10)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="user@user.com", password="user"
+            )
+        )
+
+    def sync(self, since=None):
+        response = self.client.get(
+            SYNC_URL, {"since": since} if since else {}
+        )
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        return lines[:-1], lines[-1]["next"]
+
+    def test_full_sync_returns_every_row_parents_first(self):
+        changes, _ = self.sync()
+
+        self.assertEqual(
+            [change["model"] for change in changes],
+            ["station", "station", "train", "route", "journey"],
+        )
+        self.assertEqual(changes[-1]["data"]["route_id"], self.route.id)
+
+    def test_delta_sync_returns_only_changes(self):
+        _, token = self.sync()
+        self.assertEqual(self.sync(token)[0], [])
+
+        self.source.name = "Renamed"
+        self.source.save()
+        delete_journeys(Journey.objects.all())
+        changes, token = self.sync(token)
+
+        self.assertEqual(
+            changes,
+            [
+                {
+                    "model": "station",
+                    "data": {
+                        **changes[0]["data"],
+                        "id": self.source.id,
+                        "name": "Renamed",
+                    },
+                },
+                {"model": "journey", "deleted": self.journey.id},
+            ],
+        )
+        self.assertEqual(self.sync(token)[0], [])
+
+    def test_station_deletion_leaves_tombstones(self):
+        _, token = self.sync()
+        station_id = self.destination.id
+        delete_station(self.destination)
+
+        changes, _ = self.sync(token)
+
+        self.assertEqual(
+            [(change["model"], change["deleted"]) for change in changes],
+            [
+                ("journey", self.journey.id),
+                ("route", self.route.id),
+                ("station", station_id),
+            ],
+        )
+
+    def test_cascaded_deletions_leave_tombstones(self):
+        _, token = self.sync()
+        train_id = self.journey.train_id
+        TrainType.objects.all().delete()
+
+        changes, _ = self.sync(token)
+
+        self.assertCountEqual(
+            [(change["model"], change["deleted"]) for change in changes],
+            [("journey", self.journey.id), ("train", train_id)],
+        )
+
+    def test_journeys_keep_the_fast_delete_path(self):
+        # Any delete listener makes the ORM fetch and signal every journey.
+        for signal in (pre_delete, post_delete):
+            self.assertFalse(signal.has_listeners(Journey))
+
+    def test_invalid_and_expired_tokens(self):
+        response = self.client.get(SYNC_URL, {"since": "garbage"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(
+            SYNC_URL,
+            {"since": make_token(timezone.now() - timedelta(days=31))},
+        )
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
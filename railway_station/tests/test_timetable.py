@@ -0,0 +1,108 @@
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from railway_station.models import Crew, Journey, TimetableRule
+from railway_station.tests.factories import create_route, create_train
+from railway_station.timetable import expand_rule, generate_journeys
+
+TIMETABLE_RULES_URL = reverse("railway_station:timetablerule-list")
+
+
+class TimetableRuleTest(TestCase):
+    def setUp(self):
+        self.route = create_route()
+        self.train = create_train()
+        self.crews = [
+            Crew.objects.create(first_name="John", last_name="Doe"),
+            Crew.objects.create(first_name="Jane", last_name="Doe"),
+        ]
+        self.rule = TimetableRule.objects.create(
+            route=self.route,
+            train=self.train,
+            days_of_week="1234567",
+            departure_time=time(8, 30),
+            duration=timedelta(hours=2),
+            valid_from=date(2025, 1, 1),
+            valid_until=date(2025, 12, 31),
+        )
+        self.rule.crews.set(self.crews)
+
+    def test_expand_rule_respects_weekdays(self):
+        self.rule.days_of_week = "67"
+        self.rule.valid_until = date(2025, 1, 31)
+
+        departures = expand_rule(self.rule)
+
+        self.assertEqual(len(departures), 8)
+        self.assertTrue(all(d.isoweekday() in (6, 7) for d in departures))
+
+    def test_generate_year_of_daily_journeys(self):
+        self.assertEqual(
+            generate_journeys(self.rule), {"created": 365, "conflicts": 0}
+        )
+
+        self.assertEqual(Journey.objects.count(), 365)
+        self.assertEqual(Journey.crews.through.objects.count(), 730)
+        journey = Journey.objects.order_by("departure_time").first()
+        self.assertEqual(
+            journey.arrival_time - journey.departure_time, timedelta(hours=2)
+        )
+
+    def test_generate_is_idempotent(self):
+        generate_journeys(self.rule)
+        self.rule.valid_until = date(2026, 1, 2)
+        self.rule.save()
+
+        self.assertEqual(generate_journeys(self.rule)["created"], 2)
+        self.assertEqual(Journey.objects.count(), 367)
+
+    def test_generated_services_do_not_overlap_each_other(self):
+        self.rule.duration = timedelta(hours=30)
+        self.rule.valid_until = date(2025, 1, 5)
+
+        self.assertEqual(
+            generate_journeys(self.rule), {"created": 3, "conflicts": 2}
+        )
+        self.assertEqual(
+            [
+                journey.departure_time.day
+                for journey in Journey.objects.order_by("departure_time")
+            ],
+            [1, 3, 5],
+        )
+
+    def test_generate_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@admin.com", password="admin"
+            )
+        )
+        url = reverse(
+            "railway_station:timetablerule-generate", args=[self.rule.id]
+        )
+
+        response = client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"created": 365, "conflicts": 0})
+
+        response = client.post(
+            TIMETABLE_RULES_URL,
+            {
+                "route": self.route.id,
+                "train": self.train.id,
+                "crews": [],
+                "days_of_week": "12345",
+                "departure_time": "10:00",
+                "duration": "00:00:00",
+                "valid_from": "2025-01-01",
+                "valid_until": "2025-01-31",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,193 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from railway_station.traffic import (
+    MASK,
+    anonymize,
+    compare,
+    get_logger,
+    replay,
+    summarize
+)
+
+
+class TrafficCaptureTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.capture_file = Path(directory.name) / "traffic.jsonl"
+        settings = override_settings(
+            TRAFFIC_CAPTURE_ENABLED=True,
+            TRAFFIC_CAPTURE_SAMPLE_RATE=1.0,
+            TRAFFIC_CAPTURE_FILE=self.capture_file,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        get_logger.cache_clear()
+        self.addCleanup(get_logger.cache_clear)
+
+    def entries(self):
+        for handler in get_logger().handlers:
+            handler.flush()
+        return [json.loads(line) for line in self.capture_file.open()]
+
+    def test_anonymize_keeps_shape_numbers_and_dates(self):
+        self.assertEqual(
+            anonymize(
+                {
+                    "email": "user@user.com",
+                    "tickets": [{"seat": 3, "day": "2024-12-24"}],
+                    "atomic": True,
+                }
+            ),
+            {
+                "email": MASK,
+                "tickets": [{"seat": 3, "day": "2024-12-24"}],
+                "atomic": True,
+            },
+        )
+
+    def test_anonymize_always_masks_credentials(self):
+        self.assertEqual(
+            anonymize(
+                {
+                    "email": "user@user.com",
+                    "password": "20241224",
+                    "new_password": 1234,
+                    "refresh": "2024-12-24",
+                }
+            ),
+            {
+                "email": MASK,
+                "password": MASK,
+                "new_password": MASK,
+                "refresh": MASK,
+            },
+        )
+
+    def test_requests_are_captured_anonymized(self):
+        user = get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        client.get(
+            reverse("railway_station:journey-list"),
+            {"source": "Kyiv", "departure_time": "2024-12-24"},
+        )
+        client.post(
+            reverse("railway_station:order-list"),
+            {"tickets": [{"journey": 1, "cargo": 1, "seat": 1}]},
+            format="json",
+        )
+
+        search, order = self.entries()
+        self.assertEqual(search["endpoint"], "JourneyViewSet.list")
+        self.assertEqual(
+            search["query"], {"source": MASK, "departure_time": "2024-12-24"}
+        )
+        self.assertEqual(order["endpoint"], "OrderViewSet.create")
+        self.assertEqual(
+            order["body"], {"tickets": [{"journey": 1, "cargo": 1, "seat": 1}]}
+        )
+        self.assertEqual(order["status"], 400)
+        self.assertIsInstance(order["user"], int)
+        self.assertNotIn("user@user.com", self.capture_file.read_text())
+
+
+class ReplayTest(TestCase):
+    def test_replay_keeps_spacing_and_summarizes(self):
+        records = [
+            {"time": 100.0 + n * 0.01, "method": "GET", "endpoint": "A.list"}
+            for n in range(10)
+        ]
+        statuses = iter([200] * 9 + [500])
+
+        results = replay(records, lambda record: next(statuses), 10, 1)
+        summary = summarize(results)
+
+        self.assertEqual(summary["GET A.list"]["requests"], 10)
+        self.assertEqual(summary["GET A.list"]["errors"], 1)
+
+    def test_compare_flags_regressions(self):
+        baseline = {
+            "GET A.list": {"p50_ms": 10, "p99_ms": 20},
+            "GET B.list": {"p50_ms": 10, "p99_ms": 20},
+        }
+        current = {
+            "GET A.list": {"p50_ms": 10, "p99_ms": 30},
+            "GET B.list": {"p50_ms": 9, "p99_ms": 21},
+        }
+
+        rows = compare(baseline, current, threshold=0.2)
+
+        self.assertEqual(
+            [(row["endpoint"], row["regressed"]) for row in rows],
+            [("GET A.list", True), ("GET B.list", False)],
+        )
+        self.assertEqual(rows[0]["p99_change"], 0.5)
+
+
+class ReplayCommandTest(LiveServerTestCase):
+    def test_replay_against_live_server(self):
+        get_user_model().objects.create_user(
+            email="user@user.com", password="user"
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        capture = Path(directory.name) / "traffic.jsonl"
+        record = {
+            "method": "GET",
+            "path": reverse("railway_station:order-list"),
+            "endpoint": "OrderViewSet.list",
+            "query": {},
+            "body": None,
+            "user": 5,
+        }
+        capture.write_text(
+            "\n".join(json.dumps({**record, "time": n}) for n in range(3))
+        )
+        output = Path(directory.name) / "run.json"
+        baseline = Path(directory.name) / "baseline.json"
+        baseline.write_text(
+            json.dumps({"GET OrderViewSet.list": {"p50_ms": 0, "p99_ms": 0}})
+        )
+
+        call_command(
+            "replay_traffic",
+            file=str(capture),
+            base_url=self.live_server_url,
+            speedup=100,
+            user=["user@user.com:user"],
+            output=str(output),
+            baseline=str(baseline),
+            stdout=StringIO(),
+        )
+
+        run = json.loads(output.read_text())
+        self.assertEqual(run["GET OrderViewSet.list"]["requests"], 3)
+        self.assertEqual(run["GET OrderViewSet.list"]["errors"], 0)
+
+        baseline.write_text(
+            json.dumps(
+                {"GET OrderViewSet.list": {"p50_ms": 0.001, "p99_ms": 0.001}}
+            )
+        )
+        with self.assertRaisesMessage(CommandError, "1 endpoints regressed"):
+            call_command(
+                "replay_traffic",
+                file=str(capture),
+                base_url=self.live_server_url,
+                user=["user@user.com:user"],
+                baseline=str(baseline),
+                speedup=100,
+                stdout=StringIO(),
+            )
@@ -0,0 +1,97 @@
+from datetime import date, datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from railway_station.models import Journey, TimetableRule
+from railway_station.scheduling import journey_intervals
+
+BULK_BATCH_SIZE = 2000
+
+
+def expand_rule(rule: TimetableRule) -> list[datetime]:
+    """Return aware departure datetimes of every service of `rule`."""
+    weekdays = {int(day) for day in rule.days_of_week}
+    departures = []
+    day: date = rule.valid_from
+    while day <= rule.valid_until:
+        if day.isoweekday() in weekdays:
+            departures.append(
+                timezone.make_aware(
+                    datetime.combine(day, rule.departure_time)
+                )
+            )
+        day += timedelta(days=1)
+    return departures
+
+
+def _is_busy(index, rule, crew_ids, departure) -> bool:
+    arrival = departure + rule.duration
+    keys = [("train", rule.train_id)] + [("crew", pk) for pk in crew_ids]
+    return any(index.overlapping(key, departure, arrival) for key in keys)
+
+
+def generate_journeys(rule: TimetableRule) -> dict[str, int]:
+    """Create the missing journeys of `rule` and assign the rule crews.
+
+    Journeys already generated for the rule are skipped, so running this
+    again after editing the validity range only adds the new services.
+    Services whose train or crews are busy at that time are not created
+    and are counted as conflicts.
+    """
+    departures = expand_rule(rule)
+    if not departures:
+        return {"created": 0, "conflicts": 0}
+    existing = set(
+        rule.journeys.filter(
+            departure_time__range=(departures[0], departures[-1])
+        ).values_list("departure_time", flat=True)
+    )
+    crew_ids = list(rule.crews.values_list("id", flat=True))
+    index = journey_intervals(
+        Journey.objects.filter(
+            Q(train_id=rule.train_id) | Q(crews__in=crew_ids),
+            departure_time__lt=departures[-1] + rule.duration,
+            arrival_time__gt=departures[0],
+        ).distinct()
+    )
+    departures = [
+        departure for departure in departures if departure not in existing
+    ]
+    free = []
+    for departure in departures:
+        # Accepted services share the train and crews and are as long as
+        # each other, so only the latest one can still be running.
+        if free and free[-1] + rule.duration > departure:
+            continue
+        if not _is_busy(index, rule, crew_ids, departure):
+            free.append(departure)
+    crews_through = Journey.crews.through
+
+    with transaction.atomic():
+        journeys = Journey.objects.bulk_create(
+            (
+                Journey(
+                    route_id=rule.route_id,
+                    train_id=rule.train_id,
+                    departure_time=departure,
+                    arrival_time=departure + rule.duration,
+                    timetable_rule=rule,
+                )
+                for departure in free
+            ),
+            batch_size=BULK_BATCH_SIZE,
+        )
+        crews_through.objects.bulk_create(
+            (
+                crews_through(journey_id=journey.id, crew_id=crew_id)
+                for journey in journeys
+                for crew_id in crew_ids
+            ),
+            batch_size=BULK_BATCH_SIZE,
+        )
+    return {
+        "created": len(journeys),
+        "conflicts": len(departures) - len(free),
+    }
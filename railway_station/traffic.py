@@ -0,0 +1,291 @@
+import hashlib
+import hmac
+import json
+import logging
+import random
+import re
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from pathlib import Path
+from typing import Callable, Iterable
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from railway_station.jsonl import read_rotated, rotating_logger
+from railway_station.metrics import view_labels
+
+MASK = "<str>"
+MAX_LIST_ITEMS = 100
+# Numbers, dates and times carry no personal data but drive the query mix.
+_KEEP_RE = re.compile(r"^[\d\-:.T+Z ]{1,32}$")
+# Credentials are masked whatever they look like, even a numeric password.
+SENSITIVE_KEYS = ("password", "token", "access", "refresh", "secret")
+
+
+def _is_sensitive(key) -> bool:
+    key = str(key).lower()
+    return any(sensitive in key for sensitive in SENSITIVE_KEYS)
+
+
+def anonymize(value):
+    """JSON value with free text replaced by a mask, keeping its shape."""
+    if isinstance(value, dict):
+        return {
+            key: MASK if _is_sensitive(key) else anonymize(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [anonymize(item) for item in value[:MAX_LIST_ITEMS]]
+    if isinstance(value, str) and not _KEEP_RE.match(value):
+        return MASK
+    return value
+
+
+def user_bucket(user) -> int | None:
+    """Stable bucket of an authenticated user that does not reveal its id."""
+    if user is None or not user.is_authenticated:
+        return None
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(), str(user.pk).encode(), hashlib.sha256
+    ).hexdigest()
+    return int(digest[:8], 16) % settings.TRAFFIC_CAPTURE_USER_BUCKETS
+
+
+def _body(request):
+    if request.content_type != "application/json" or not request.body:
+        return None
+    try:
+        return anonymize(json.loads(request.body))
+    except ValueError:
+        return MASK
+
+
+@cache
+def get_logger() -> logging.Logger:
+    return rotating_logger(
+        "railway_station.traffic",
+        settings.TRAFFIC_CAPTURE_FILE,
+        settings.TRAFFIC_CAPTURE_MAX_BYTES,
+        settings.TRAFFIC_CAPTURE_BACKUPS,
+    )
+
+
+class TrafficCaptureMiddleware:
+    """Write a TRAFFIC_CAPTURE_SAMPLE_RATE sample of requests to JSONL.
+
+    Lines keep the method, path, endpoint, query and JSON body shape, the
+    user's bucket, status and latency, enough for ``replay_traffic``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.TRAFFIC_CAPTURE_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _sampled(self) -> bool:
+        return random.random() < settings.TRAFFIC_CAPTURE_SAMPLE_RATE
+
+    def _capture(self, request, response, started, elapsed, body) -> None:
+        view, action = view_labels(request)
+        get_logger().info(
+            json.dumps(
+                {
+                    "time": round(started, 3),
+                    "method": request.method,
+                    "path": request.path,
+                    "endpoint": f"{view}.{action}",
+                    "query": anonymize(dict(request.GET.items())),
+                    "body": body,
+                    "user": user_bucket(getattr(request, "user", None)),
+                    "status": response.status_code,
+                    "latency_ms": round(elapsed * 1000, 3),
+                }
+            )
+        )
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+        # Read before the view consumes the stream.
+        body = _body(request)
+        started = time.time()
+        start = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+        self._capture(request, response, started, elapsed, body)
+        return response
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+        body = _body(request)
+        started = time.time()
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        elapsed = time.perf_counter() - start
+        self._capture(request, response, started, elapsed, body)
+        return response
+
+
+def read_capture(path: Path) -> list[dict]:
+    """Captured requests of `path` and its rotated copies, oldest first."""
+    records = list(read_rotated(path, settings.TRAFFIC_CAPTURE_BACKUPS))
+    records.sort(key=lambda record: record["time"])
+    return records
+
+
+class HttpSender:
+    """Send captured requests to a running instance.
+
+    Requests of a user bucket are made with the access token of
+    ``tokens[bucket % len(tokens)]``; anonymous ones without a token.
+    """
+
+    def __init__(self, base_url: str, tokens: list[str], timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.tokens = tokens
+        self.timeout = timeout
+
+    def __call__(self, record: dict) -> int:
+        url = self.base_url + record["path"]
+        if record["query"]:
+            url += "?" + urlencode(record["query"])
+        headers = {"Accept": "application/json"}
+        data = None
+        if record["body"] is not None:
+            data = json.dumps(record["body"]).encode()
+            headers["Content-Type"] = "application/json"
+        if record["user"] is not None and self.tokens:
+            token = self.tokens[record["user"] % len(self.tokens)]
+            headers["Authorization"] = f"Bearer {token}"
+        request = urllib.request.Request(
+            url, data=data, headers=headers, method=record["method"]
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as r:
+                r.read()
+                return r.status
+        except urllib.error.HTTPError as error:
+            return error.code
+
+
+def obtain_token(base_url: str, email: str, password: str) -> str:
+    request = urllib.request.Request(
+        base_url.rstrip("/") + "/api/v1/account/token/",
+        data=json.dumps({"email": email, "password": password}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)["access"]
+
+
+def replay(
+    records: Iterable[dict],
+    send: Callable[[dict], int],
+    speedup: float = 1.0,
+    concurrency: int = 8,
+) -> list[dict]:
+    """Re-issue `records` keeping their spacing divided by `speedup`.
+
+    Requests are sent by up to `concurrency` threads; when all of them are
+    busy, due requests wait, as they would in front of a loaded server.
+    """
+    results = []
+    lock = threading.Lock()
+
+    def run(record):
+        start = time.perf_counter()
+        try:
+            status = send(record)
+        except OSError:
+            status = 0
+        elapsed = time.perf_counter() - start
+        with lock:
+            results.append(
+                {
+                    "endpoint": f"{record['method']} {record['endpoint']}",
+                    "status": status,
+                    "latency_ms": elapsed * 1000,
+                }
+            )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        first = None
+        start = time.perf_counter()
+        for record in records:
+            first = record["time"] if first is None else first
+            delay = (record["time"] - first) / speedup - (
+                time.perf_counter() - start
+            )
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(run, record)
+    return results
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(results: Iterable[dict]) -> dict[str, dict]:
+    """Request count, errors and p50/p99 latency per endpoint."""
+    latencies, errors = {}, {}
+    for result in results:
+        endpoint = result["endpoint"]
+        latencies.setdefault(endpoint, []).append(result["latency_ms"])
+        errors[endpoint] = errors.get(endpoint, 0) + (
+            not 0 < result["status"] < 400
+        )
+    summary = {}
+    for endpoint, values in sorted(latencies.items()):
+        values.sort()
+        summary[endpoint] = {
+            "requests": len(values),
+            "errors": errors[endpoint],
+            "p50_ms": round(statistics.median(values), 3),
+            "p99_ms": round(_percentile(values, 0.99), 3),
+        }
+    return summary
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    """Endpoints of both runs with their latency change, worst first.
+
+    An endpoint regressed when its p50 or p99 grew by more than
+    `threshold` (a fraction of the baseline).
+    """
+    rows = []
+    for endpoint in baseline.keys() & current.keys():
+        row = {"endpoint": endpoint}
+        for metric in ("p50_ms", "p99_ms"):
+            before, after = (
+                baseline[endpoint][metric],
+                current[endpoint][metric],
+            )
+            row[metric] = [before, after]
+            row[metric.replace("_ms", "_change")] = round(
+                (after - before) / before if before else 0.0, 3
+            )
+        row["regressed"] = (
+            max(row["p50_change"], row["p99_change"]) > threshold
+        )
+        rows.append(row)
+    rows.sort(key=lambda row: row["p99_change"], reverse=True)
+    return rows
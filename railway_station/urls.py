@@ -1,12 +1,21 @@
+from django.urls import path
 from rest_framework import routers
 
+from railway_station.profiling import ProfileViewSet
+from railway_station.streams import journey_seats_stream
+from railway_station.sync import SyncView
 from railway_station.views import (
+    AnalyticsViewSet,
+    ArchivedJourneyViewSet,
+    ArchivedOrderViewSet,
     CrewViewSet,
     JourneyViewSet,
+    OrderJobViewSet,
     OrderViewSet,
     RouteViewSet,
     StationViewSet,
     TicketViewSet,
+    TimetableRuleViewSet,
     TrainTypeViewSet,
     TrainViewSet
 )
@@ -18,8 +27,21 @@ router.register("trains", TrainViewSet)
 router.register("crew", CrewViewSet)
 router.register("stations", StationViewSet)
 router.register("routes", RouteViewSet)
+router.register("timetable_rules", TimetableRuleViewSet)
 router.register("journeys", JourneyViewSet)
 router.register("orders", OrderViewSet)
+router.register("order_jobs", OrderJobViewSet)
 router.register("tickets", TicketViewSet)
+router.register("archive/journeys", ArchivedJourneyViewSet)
+router.register("archive/orders", ArchivedOrderViewSet)
+router.register("analytics", AnalyticsViewSet, basename="analytics")
+router.register("profiles", ProfileViewSet, basename="profile")
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path(
+        "journeys/<int:pk>/seats/stream/",
+        journey_seats_stream,
+        name="journey-seats-stream",
+    ),
+    path("sync/", SyncView.as_view(), name="sync"),
+]
@@ -1,38 +1,126 @@
 from datetime import datetime
+from decimal import Decimal
+from typing import Callable
 
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Count, F
+from django.http import Http404
+from django.utils.dateparse import parse_date, parse_datetime
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
-from rest_framework import mixins, viewsets
-from rest_framework.permissions import IsAdminUser, IsAuthenticated
-
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import (
+    AllowAny,
+    IsAdminUser,
+    IsAuthenticated
+)
+from rest_framework.response import Response
+
+from railway_station.allocation import allocate_seats
+from railway_station.deletion import (
+    DEFAULT_BATCH_SIZE,
+    delete_journeys,
+    delete_route,
+    delete_station,
+    delete_train
+)
+from railway_station.distances import get_distance_matrix
+from railway_station.idempotency import IdempotentCreateMixin
+from railway_station.journey_calendar import (
+    get_calendar,
+    invalidate_calendars
+)
 from railway_station.models import (
+    ArchivedJourney,
+    ArchivedOrder,
     Crew,
+    HourlyOrders,
     Journey,
     Order,
+    OrderJob,
     Route,
+    RouteDailySales,
     Station,
     Ticket,
+    TimetableRule,
     Train,
-    TrainType
+    TrainType,
+    TrainTypeDailyLoad
+)
+from railway_station.order_queue import (
+    OrderJobSerializer,
+    QueuedCreateMixin,
+    queue_stats
 )
 from railway_station.permissions import IsAdminOrReadOnly
+from railway_station.scheduling import free_resources, journey_intervals
+from railway_station.search import get_station_index
+from railway_station.seat_map import get_seat_map, invalidate_seat_maps
 from railway_station.serializers import (
+    ArchivedJourneySerializer,
+    ArchivedOrderSerializer,
     CrewSerializer,
+    HourlyOrdersSerializer,
     JourneyListSerializer,
     JourneyRetrieveSerializer,
     JourneySerializer,
     OrderListSerializer,
     OrderSerializer,
+    RouteDailySalesSerializer,
     RouteListSerializer,
     RouteSerializer,
+    SeatAllocationSerializer,
     StationSerializer,
     TicketListSerializer,
     TicketSerializer,
+    TimetableRuleSerializer,
     TrainListSerializer,
     TrainSerializer,
+    TrainTypeDailyLoadSerializer,
     TrainTypeSerializer
 )
+from railway_station.timetable import generate_journeys
+
+
+STATION_PAIR_PARAMETERS = [
+    OpenApiParameter(
+        param,
+        type=OpenApiTypes.STR,
+        required=True,
+        description=f"{label} station id or name (ex. ?{param}=Kyiv)",
+    )
+    for param, label in (("from", "Departure"), ("to", "Arrival"))
+]
+
+
+class ChunkedDestroyMixin:
+    """Destroy an object and its journeys over as many requests as needed.
+
+    A request deletes at most DELETION_BATCHES_PER_REQUEST batches of
+    journeys. While some are left the object is kept and 202 Accepted is
+    returned with the counts so far; since every batch is committed on its
+    own, repeating the DELETE continues the job and answers 204 once the
+    object is gone.
+    """
+
+    delete_with_dependents: Callable[..., dict[str, int]]
+    deletion_batch_size = DEFAULT_BATCH_SIZE
+
+    @extend_schema(responses={202: OpenApiTypes.OBJECT, 204: None})
+    def destroy(self, request, *args, **kwargs):
+        instance = self.get_object()
+        deleted = self.delete_with_dependents(
+            instance,
+            self.deletion_batch_size,
+            max_batches=settings.DELETION_BATCHES_PER_REQUEST,
+        )
+        # Model.delete() clears the primary key of the deleted instance.
+        if instance.pk is not None:
+            return Response(deleted, status=status.HTTP_202_ACCEPTED)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class TrainTypeViewSet(viewsets.ModelViewSet):
@@ -41,10 +129,11 @@ class TrainTypeViewSet(viewsets.ModelViewSet):
     serializer_class = TrainTypeSerializer
 
 
-class TrainViewSet(viewsets.ModelViewSet):
+class TrainViewSet(ChunkedDestroyMixin, viewsets.ModelViewSet):
     permission_classes = (IsAdminUser,)
     queryset = Train.objects.select_related("train_type")
     serializer_class = TrainSerializer
+    delete_with_dependents = staticmethod(delete_train)
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -58,16 +147,89 @@ class CrewViewSet(viewsets.ModelViewSet):
     serializer_class = CrewSerializer
 
 
-class StationViewSet(viewsets.ModelViewSet):
+class StationViewSet(ChunkedDestroyMixin, viewsets.ModelViewSet):
     permission_classes = (IsAdminUser,)
     queryset = Station.objects.all()
     serializer_class = StationSerializer
+    delete_with_dependents = staticmethod(delete_station)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "q",
+                type=OpenApiTypes.STR,
+                required=True,
+                description="Station name prefix or approximate name "
+                "(ex. ?q=kyi)",
+            ),
+            OpenApiParameter(
+                "limit",
+                type=OpenApiTypes.INT,
+                description="Maximum number of stations (ex. ?limit=5)",
+            ),
+        ]
+    )
+    @action(detail=False, permission_classes=(AllowAny,))
+    def search(self, request):
+        query = request.query_params.get("q", "").strip()
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 50)
+        except ValueError:
+            raise ValidationError({"limit": "A valid integer is required."})
+        if not query:
+            return Response([])
+        index = get_station_index()
+        return Response(
+            [
+                {"id": pk, "name": index.names[pk]}
+                for pk in index.search(query, limit)
+            ]
+        )
+
+    def _distance(self, request) -> tuple[int, int, float]:
+        index = get_station_index()
+        stations = []
+        for param in ("from", "to"):
+            value = request.query_params.get(param, "").strip()
+            if not value:
+                raise ValidationError({param: "This parameter is required."})
+            pk = int(value) if value.isdigit() else index.resolve(value)
+            if pk not in index.names:
+                raise NotFound(f"Station {value!r} does not exist.")
+            stations.append(pk)
+        distance = get_distance_matrix().distance(*stations)
+        if distance is None:
+            raise NotFound("No route connects these stations.")
+        return stations[0], stations[1], distance
+
+    @extend_schema(parameters=STATION_PAIR_PARAMETERS)
+    @action(detail=False, permission_classes=(AllowAny,))
+    def distance(self, request):
+        source, destination, distance = self._distance(request)
+        return Response(
+            {"from": source, "to": destination, "distance": distance}
+        )
 
+    @extend_schema(parameters=STATION_PAIR_PARAMETERS)
+    @action(detail=False, permission_classes=(AllowAny,))
+    def fare(self, request):
+        source, destination, distance = self._distance(request)
+        fare = settings.FARE_BASE + settings.FARE_PER_KM * Decimal(distance)
+        return Response(
+            {
+                "from": source,
+                "to": destination,
+                "distance": distance,
+                "fare": str(fare.quantize(Decimal("0.01"))),
+            }
+        )
 
-class RouteViewSet(viewsets.ModelViewSet):
+
+class RouteViewSet(ChunkedDestroyMixin, viewsets.ModelViewSet):
     permission_classes = (IsAdminUser,)
     queryset = Route.objects.select_related("source", "destination")
     serializer_class = RouteSerializer
+    delete_with_dependents = staticmethod(delete_route)
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -75,10 +237,21 @@ class RouteViewSet(viewsets.ModelViewSet):
         return RouteSerializer
 
 
+class TimetableRuleViewSet(viewsets.ModelViewSet):
+    permission_classes = (IsAdminUser,)
+    queryset = TimetableRule.objects.prefetch_related("crews")
+    serializer_class = TimetableRuleSerializer
+
+    @action(detail=True, methods=["post"])
+    def generate(self, request, pk=None):
+        return Response(generate_journeys(self.get_object()))
+
+
 class JourneyViewSet(viewsets.ModelViewSet):
     queryset = Journey.objects.all()
     permission_classes = (IsAdminOrReadOnly,)
     serializer_class = JourneySerializer
+    lookup_value_regex = r"\d+"
 
     def get_queryset(self):
         queryset = (
@@ -108,10 +281,14 @@ class JourneyViewSet(viewsets.ModelViewSet):
         arrival_time = self.request.query_params.get("arrival_time")
 
         if route_source:
-            queryset = queryset.filter(route__source=route_source)
+            queryset = queryset.filter(
+                route__source=self._station_id(route_source)
+            )
 
         if route_destination:
-            queryset = queryset.filter(route__destination=route_destination)
+            queryset = queryset.filter(
+                route__destination=self._station_id(route_destination)
+            )
 
         if departure_time:
             date = datetime.strptime(departure_time, "%Y-%m-%d").date()
@@ -131,6 +308,45 @@ class JourneyViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    # Validation locks the train and crews, so the overlap check and the
+    # save have to share one transaction.
+    @transaction.atomic
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        invalidate_calendars(Journey.objects.filter(pk=serializer.instance.pk))
+
+    def perform_update(self, serializer):
+        journey = Journey.objects.filter(pk=serializer.instance.pk)
+        invalidate_calendars(journey)
+        super().perform_update(serializer)
+        invalidate_calendars(journey)
+        invalidate_seat_maps([serializer.instance.pk])
+
+    def perform_destroy(self, instance):
+        journey = Journey.objects.filter(pk=instance.pk)
+        invalidate_calendars(journey)
+        delete_journeys(journey)
+
+    @action(detail=True)
+    def seat_map(self, request, pk=None):
+        seat_map = get_seat_map(int(pk))
+        if seat_map is None:
+            raise Http404
+        return Response(seat_map)
+
+    @staticmethod
+    def _station_id(value: str) -> int | None:
+        if value.isdigit():
+            return int(value)
+        return get_station_index().resolve(value)
+
     def get_serializer_class(self):
         if self.action == "list":
             return JourneyListSerializer
@@ -143,13 +359,14 @@ class JourneyViewSet(viewsets.ModelViewSet):
         parameters=[
             OpenApiParameter(
                 "source",
-                type=OpenApiTypes.INT,
-                description="Filter by source id (ex. ?source=2)",
+                type=OpenApiTypes.STR,
+                description="Filter by source id or name (ex. ?source=2)",
             ),
             OpenApiParameter(
                 "destination",
-                type=OpenApiTypes.INT,
-                description="Filter by destination id (ex. ?destination=2)",
+                type=OpenApiTypes.STR,
+                description="Filter by destination id or name "
+                "(ex. ?destination=Kyiv)",
             ),
             OpenApiParameter(
                 "departure_time",
@@ -164,8 +381,128 @@ class JourneyViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "source",
+                type=OpenApiTypes.STR,
+                required=True,
+                description="Source id or name (ex. ?source=2)",
+            ),
+            OpenApiParameter(
+                "destination",
+                type=OpenApiTypes.STR,
+                required=True,
+                description="Destination id or name (ex. ?destination=Kyiv)",
+            ),
+            OpenApiParameter(
+                "month",
+                type=OpenApiTypes.STR,
+                required=True,
+                description="Month of departures (ex. ?month=2024-12)",
+            ),
+        ]
+    )
+    @action(detail=False)
+    def calendar(self, request):
+        stations = {}
+        for param in ("source", "destination"):
+            value = request.query_params.get(param, "")
+            stations[param] = self._station_id(value) if value else None
+            if stations[param] is None:
+                raise ValidationError({param: "Unknown station"})
+        try:
+            month = datetime.strptime(
+                request.query_params.get("month", ""), "%Y-%m"
+            ).date()
+        except ValueError:
+            raise ValidationError({"month": "Month in YYYY-MM is required"})
+        return Response(
+            {
+                "month": f"{month:%Y-%m}",
+                "days": get_calendar(
+                    stations["source"], stations["destination"], month
+                ),
+            }
+        )
+
+    def _window(self) -> tuple:
+        window = []
+        for param in ("start", "end"):
+            value = self.request.query_params.get(param)
+            parsed = parse_datetime(value) if value else None
+            if parsed is None:
+                raise ValidationError(
+                    {param: "ISO 8601 datetime is required"}
+                )
+            window.append(parsed)
+        return tuple(window)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "start",
+                type=OpenApiTypes.DATETIME,
+                description="Only journeys arriving after "
+                "(ex. ?start=2024-12-24T00:00)",
+            ),
+            OpenApiParameter(
+                "end",
+                type=OpenApiTypes.DATETIME,
+                description="Only journeys departing before "
+                "(ex. ?end=2024-12-25T00:00)",
+            ),
+        ]
+    )
+    @action(detail=False, permission_classes=(IsAdminUser,))
+    def conflicts(self, request):
+        journeys = Journey.objects.all()
+        if "start" in request.query_params or "end" in request.query_params:
+            start, end = self._window()
+            journeys = journeys.filter(
+                departure_time__lt=end, arrival_time__gt=start
+            )
+        return Response(
+            [
+                {"resource": resource, "id": pk, "journeys": [first, second]}
+                for (resource, pk), first, second in journey_intervals(
+                    journeys
+                ).conflicts()
+            ]
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "start",
+                type=OpenApiTypes.DATETIME,
+                required=True,
+                description="Window start (ex. ?start=2024-12-24T08:00)",
+            ),
+            OpenApiParameter(
+                "end",
+                type=OpenApiTypes.DATETIME,
+                required=True,
+                description="Window end (ex. ?end=2024-12-24T10:00)",
+            ),
+        ]
+    )
+    @action(detail=False, permission_classes=(IsAdminUser,))
+    def free_resources(self, request):
+        free = free_resources(*self._window())
+        return Response(
+            {
+                "trains": TrainListSerializer(
+                    free["trains"].select_related("train_type"), many=True
+                ).data,
+                "crews": CrewSerializer(free["crews"], many=True).data,
+            }
+        )
+
 
 class OrderViewSet(
+    IdempotentCreateMixin,
+    QueuedCreateMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -186,6 +523,37 @@ class OrderViewSet(
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @extend_schema(
+        request=SeatAllocationSerializer, responses={201: OrderSerializer}
+    )
+    @action(detail=False, methods=["post"])
+    def allocate(self, request):
+        serializer = SeatAllocationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order = allocate_seats(request.user, **serializer.validated_data)
+        return Response(
+            OrderSerializer(order).data, status=status.HTTP_201_CREATED
+        )
+
+
+class OrderJobViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    permission_classes = (IsAuthenticated,)
+    queryset = OrderJob.objects.all()
+    serializer_class = OrderJobSerializer
+
+    def get_queryset(self):
+        return OrderJob.objects.filter(user=self.request.user).order_by(
+            "-created_at"
+        )
+
+    @action(detail=False, permission_classes=(IsAdminUser,))
+    def stats(self, request):
+        return Response(queue_stats())
+
 
 class TicketViewSet(
     mixins.ListModelMixin,
@@ -204,3 +572,90 @@ class TicketViewSet(
         if self.action == "list":
             return TicketListSerializer
         return TicketSerializer
+
+
+class ArchivedJourneyViewSet(viewsets.ReadOnlyModelViewSet):
+    permission_classes = (IsAdminOrReadOnly,)
+    queryset = ArchivedJourney.objects.order_by("-departure_time")
+    serializer_class = ArchivedJourneySerializer
+
+
+class ArchivedOrderViewSet(viewsets.ReadOnlyModelViewSet):
+    permission_classes = (IsAuthenticated,)
+    queryset = ArchivedOrder.objects.all()
+    serializer_class = ArchivedOrderSerializer
+
+    def get_queryset(self):
+        return (
+            ArchivedOrder.objects.filter(user=self.request.user)
+            .prefetch_related("tickets__journey")
+            .order_by("-created_at")
+        )
+
+
+ANALYTICS_PARAMETERS = [
+    OpenApiParameter(
+        "start",
+        type=OpenApiTypes.DATE,
+        description="First day included (ex. ?start=2024-12-01)",
+    ),
+    OpenApiParameter(
+        "end",
+        type=OpenApiTypes.DATE,
+        description="Last day included (ex. ?end=2024-12-31)",
+    ),
+]
+
+
+class AnalyticsViewSet(viewsets.GenericViewSet):
+    """Reports read from the rollups kept by ``manage.py update_analytics``."""
+
+    permission_classes = (IsAdminUser,)
+    pagination_class = None
+
+    def _report(self, queryset, serializer_class, date_field):
+        for param, lookup in (("start", "gte"), ("end", "lte")):
+            value = self.request.query_params.get(param)
+            if not value:
+                continue
+            day = parse_date(value)
+            if day is None:
+                raise ValidationError({param: "YYYY-MM-DD date is required"})
+            queryset = queryset.filter(**{f"{date_field}__{lookup}": day})
+        return Response(serializer_class(queryset, many=True).data)
+
+    @extend_schema(
+        parameters=ANALYTICS_PARAMETERS,
+        responses=RouteDailySalesSerializer(many=True),
+    )
+    @action(detail=False)
+    def route_sales(self, request):
+        return self._report(
+            RouteDailySales.objects.order_by("date", "route"),
+            RouteDailySalesSerializer,
+            "date",
+        )
+
+    @extend_schema(
+        parameters=ANALYTICS_PARAMETERS,
+        responses=TrainTypeDailyLoadSerializer(many=True),
+    )
+    @action(detail=False)
+    def load_factor(self, request):
+        return self._report(
+            TrainTypeDailyLoad.objects.order_by("date", "train_type"),
+            TrainTypeDailyLoadSerializer,
+            "date",
+        )
+
+    @extend_schema(
+        parameters=ANALYTICS_PARAMETERS,
+        responses=HourlyOrdersSerializer(many=True),
+    )
+    @action(detail=False)
+    def orders_per_hour(self, request):
+        return self._report(
+            HourlyOrders.objects.order_by("hour"),
+            HourlyOrdersSerializer,
+            "hour__date",
+        )